@@ -0,0 +1,29 @@
+import streamlit as st
+
+# ---------------------------------------------------------
+#   MATERIAL PROCESS LABORATORY – WEEKS 8, 9 AND 10
+#   One process serving all weeks as pages of a multipage app:
+#
+#       streamlit run app_mse207.py
+#
+#   Only streamlit is imported here.  Each week's script (and with it
+#   numpy, scipy and matplotlib) is loaded the first time one of its
+#   pages is visited, and all pages share the caches in mse207.curves and
+#   the figure pipeline in mse207.figures.
+#
+#   Session Stats describes the sessions of this process, so it is served
+#   here, but hidden from the navigation and behind the admin password
+#   (mse207.admin); instructors open it at /sessions.
+# ---------------------------------------------------------
+
+pages = [
+    st.Page("app_mse207_v8.py", title="Week 8 – Heat Transfer & Solidification",
+            url_path="week8", default=True),
+    st.Page("app_mse207_v9.py", title="Week 9 – Welding and Joining", url_path="week9"),
+    st.Page("app_mse207_v10_1.py", title="Week 10 – Diffusion in Solids", url_path="week10"),
+    st.Page("app_mse207_study.py", title="Parameter Studies", url_path="study"),
+    st.Page("app_mse207_furnace.py", title="Furnace Loads", url_path="furnace"),
+    st.Page("app_mse207_sessions.py", title="Session Stats", url_path="sessions", visibility="hidden"),
+]
+
+st.navigation(pages).run()
@@ -0,0 +1,21 @@
+import streamlit as st
+
+# ---------------------------------------------------------
+#   MATERIAL PROCESS LABORATORY – INSTRUCTOR PAGES
+#   Served separately from the student app, on a port that is not
+#   published to the class:
+#
+#       MSE207_ADMIN_PASSWORD=... streamlit run app_mse207_admin.py --server.port 8502
+#
+#   Every page also asks for the admin password (see mse207.admin).  Quiz
+#   answers are shared with the student app through the database file in
+#   mse207.quiz.  Session Stats is not listed here: the sessions live in
+#   the student app's process, which serves that page (hidden and behind
+#   the same password) at /sessions.
+# ---------------------------------------------------------
+
+pages = [
+    st.Page("app_mse207_quiz.py", title="Quiz Analytics", url_path="quiz", default=True),
+]
+
+st.navigation(pages).run()
@@ -0,0 +1,178 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from mse207 import figures, furnace, jobs, metrics
+
+# -------------------------------------------
+# PAGE CONFIG
+# -------------------------------------------
+st.set_page_config(
+    page_title="Furnace Loads (MSE207)",
+    layout="wide"
+)
+
+run = metrics.start_rerun("furnace")
+
+st.title("Furnace Loads")
+st.markdown("### Material Processing Laboratory – Heating, Carburizing and Cooling a Whole Load")
+
+# ============================================================
+# 1. THE LOAD
+# ============================================================
+run.section("load")
+st.header("1. The Load")
+
+st.markdown("""
+In production a furnace does not treat one part but a **load** of hundreds, stacked in a basket. They all see
+the same furnace temperature, yet a thick part at the centre of the basket heats far more slowly than a thin
+one at the edge, which faces the fan and the furnace walls. Each part below heats and cools by convection and
+radiation (Week 8) and, optionally, takes up carbon through its surface (Week 10). The whole load is advanced
+together, one time step at a time.
+""")
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    n_parts = st.slider("Number of parts", 50, 1000, 300, 50)
+    va_range = st.slider("Part V/A range (mm)", 1.0, 100.0, (2.0, 40.0), 1.0)
+with col2:
+    h_fan = st.slider("Convective coefficient h (W/m²K)", 5.0, 200.0, 30.0, 5.0)
+    emissivity = st.slider("Emissivity ε", 0.1, 1.0, 0.8, 0.05)
+with col3:
+    seed = st.number_input("Load layout (random seed)", 0, 9999, 0)
+
+spec = furnace.LoadSpec(n_parts, va_range[0], va_range[1], emissivity, h_fan, int(seed))
+
+# ============================================================
+# 2. THE PROGRAM
+# ============================================================
+run.section("program")
+st.header("2. The Furnace Program")
+
+st.markdown("""
+The furnace ramps to the soak temperature and holds it through a carburizing **boost** (high carbon
+potential) and a **diffuse** stage (lower potential), then cools. The stages can be timed from the moment the
+**furnace** reaches temperature, or from the moment the **slowest part** does, as a load thermocouple would.
+The cycle ends when every part is cool enough to unload.
+""")
+
+default = furnace.DEFAULT_PROGRAM
+col4, col5, col6 = st.columns(3)
+with col4:
+    soak_C = st.slider("Soak temperature (°C)", 850, 1000, int(default.soak_C), 5)
+    heat_rate = st.slider("Heating rate (°C/min)", 1.0, 30.0, default.heat_rate, 1.0)
+    cool_rate = st.slider("Cooling rate (°C/min)", 1.0, 30.0, default.cool_rate, 1.0)
+with col5:
+    boost_h = st.slider("Boost time (h)", 0.5, 10.0, default.boost_h, 0.5)
+    diffuse_h = st.slider("Diffuse time (h)", 0.0, 10.0, default.diffuse_h, 0.5)
+    unload_C = st.slider("Unload temperature (°C)", 50, 400, int(default.unload_C), 10)
+with col6:
+    carburize = st.toggle("Carburize", value=True)
+    boost_Cp = st.slider("Boost carbon potential (wt.%)", 0.6, 1.4, default.boost_Cp, 0.05, disabled=not carburize)
+    diffuse_Cp = st.slider("Diffuse carbon potential (wt.%)", 0.5, 1.2, default.diffuse_Cp, 0.05,
+                           disabled=not carburize)
+
+soak_from = st.radio("Time the soak from", ["load", "furnace"], horizontal=True,
+                     format_func=lambda k: {"load": "the slowest part reaching temperature",
+                                            "furnace": "the furnace reaching temperature"}[k])
+
+program = furnace.Program(float(soak_C), heat_rate, boost_h, diffuse_h, boost_Cp, diffuse_Cp, cool_rate,
+                          float(unload_C))
+
+# ============================================================
+# 3. RESULTS
+# ============================================================
+run.section("results")
+st.header("3. Results")
+
+load_job = jobs.submit("furnace", furnace.simulate, spec, program, carburize=carburize, soak_from=soak_from)
+
+
+def show_load(result):
+    p = result.parts
+    va_mm = p.L * 1000.0
+    t_h = result.t / 3600.0
+    reached = np.isfinite(result.at_temperature_s)
+
+    fig_t, ax_t = plt.subplots(figsize=(11, 4))
+    for i in np.linspace(0, va_mm.size - 1, min(40, va_mm.size)).astype(int):
+        ax_t.plot(t_h, result.T[i], color="gray", alpha=0.25, linewidth=0.8)
+    ax_t.plot(t_h, result.T_furnace, color="black", linewidth=2, label="Furnace")
+    if reached.any():
+        first = int(np.nanargmin(result.at_temperature_s))
+        ax_t.plot(t_h, result.T[first], color="C1", label=f"First part at temperature (V/A {va_mm[first]:.1f} mm)")
+    ax_t.plot(t_h, result.T[result.lagging], color="C3",
+              label=f"Lagging part (V/A {va_mm[result.lagging]:.1f} mm)")
+    for mark, name in ((result.soak_start_s, "soak"), (result.cool_start_s, "cool")):
+        if mark is not None:
+            ax_t.axvline(mark / 3600.0, color="C0", linestyle=":")
+            ax_t.text(mark / 3600.0, 30.0, f" {name}", color="C0")
+    ax_t.set_xlabel("Time (h)")
+    ax_t.set_ylabel("Temperature (°C)")
+    ax_t.set_title("Furnace and Part Temperatures")
+    ax_t.legend(loc="upper right", fontsize=8)
+    fig_t.tight_layout()
+    figures.show(fig_t, run)
+
+    heat_up = result.at_temperature_s / 3600.0
+    lagging = f"lagging part: V/A {va_mm[result.lagging]:.1f} mm, exposure {p.exposure[result.lagging]:.2f}"
+    if not reached.all():
+        st.warning(f"{np.count_nonzero(~reached):,} of {reached.size:,} parts did not reach {soak_C} °C "
+                   f"within the {t_h[-1]:.1f} h simulated ({lagging}). Raise the heating rate or spread "
+                   "out the load.")
+    if result.soak_start_s is None:
+        st.warning("The soak never started, so the load was not carburized or cooled.")
+
+    summary = []
+    if reached.any():
+        summary.append(f"- Parts at temperature after **{np.nanmin(heat_up):.2f} h** (first) to "
+                       f"**{np.nanmax(heat_up):.2f} h**" + (f" ({lagging})" if reached.all() else ""))
+    if result.soak_start_s is not None:
+        cooling = ("cooling never started" if result.cool_start_s is None
+                   else f"cooling from **{result.cool_start_s / 3600.0:.2f} h**")
+        summary.append(f"- Soak timed from **{result.soak_start_s / 3600.0:.2f} h**; {cooling}")
+    if np.isfinite(result.cycle_s):
+        summary.append(f"- Total cycle time (last part below {unload_C} °C): **{result.cycle_s / 3600.0:.2f} h**")
+    else:
+        summary.append(f"- Not every part was below {unload_C} °C by the end of the simulation")
+    st.markdown("\n".join(summary))
+
+    table = pd.DataFrame({
+        "V/A (mm)": va_mm,
+        "Exposure": p.exposure,
+        "At temperature (h)": heat_up,
+        "Below unload (h)": result.unload_s / 3600.0,
+    })
+
+    if result.case_depth_mm is not None and not np.isfinite(result.case_depth_mm).any():
+        st.warning("No part reached 0.4 wt.% C at the surface, so there is no case depth to show.")
+    elif result.case_depth_mm is not None:
+        depth = result.case_depth_mm
+        fig_c, (ax_s, ax_h) = plt.subplots(1, 2, figsize=(11, 4))
+        dots = ax_s.scatter(va_mm, depth, c=p.exposure, s=8, cmap="viridis")
+        ax_s.set_xscale("log")
+        ax_s.set_xlabel("Part V/A (mm)")
+        ax_s.set_ylabel("Case depth to 0.4 wt.% C (mm)")
+        ax_s.set_title("Case Depth across the Load")
+        fig_c.colorbar(dots, ax=ax_s, label="Exposure")
+        ax_h.hist(depth[np.isfinite(depth)], bins=40)
+        ax_h.set_xlabel("Case depth (mm)")
+        ax_h.set_ylabel("Parts")
+        fig_c.tight_layout()
+        figures.show(fig_c, run)
+
+        st.markdown(f"""
+- Case depth: **{np.nanmin(depth):.3f}–{np.nanmax(depth):.3f} mm** (median {np.nanmedian(depth):.3f} mm,
+  spread {np.nanmax(depth) - np.nanmin(depth):.3f} mm)
+""")
+        table["Case depth (mm)"] = depth
+
+    st.markdown("**The ten slowest parts to reach temperature**")
+    st.dataframe(table.sort_values("At temperature (h)", ascending=False).head(10).style.format("{:.2f}"),
+                 width="stretch")
+
+
+jobs.show(load_job, show_load, label="Simulating the furnace cycle")
+
+run.finish()
@@ -0,0 +1,91 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from mse207 import admin, figures, metrics, quiz
+
+# -------------------------------------------
+# PAGE CONFIG
+# -------------------------------------------
+st.set_page_config(
+    page_title="Quiz Analytics (MSE207)",
+    layout="wide"
+)
+
+admin.require()
+
+run = metrics.start_rerun("quiz_analytics")
+
+st.title("Quiz Analytics")
+st.markdown("### Material Processing Laboratory – How the Class Answered")
+
+APPS = {"week8": "Week 8 – Heat Transfer", "week9": "Week 9 – Welding", "week10": "Week 10 – Diffusion"}
+
+if not quiz.QUIZ_DB:
+    st.info("Quiz recording is disabled (MSE207_QUIZ_DB is empty).")
+    run.finish()
+    st.stop()
+
+col1, col2, col3 = st.columns([3, 1, 1])
+with col1:
+    app = st.selectbox("Lecture", list(APPS), format_func=APPS.get)
+with col2:
+    # Off by default so the answers are not on screen while the class is still answering.
+    reveal = st.toggle("Show correct answers", value=False)
+with col3:
+    st.button("Refresh", width="stretch")
+
+# ============================================================
+# 1. PER-QUESTION SUMMARY
+# ============================================================
+run.section("summary")
+st.header("1. Per Question")
+
+stats = quiz.question_stats(app)
+if not stats:
+    st.info("No answers recorded for this lecture yet.")
+    run.finish()
+    st.stop()
+
+st.markdown("""
+*Students* counts the sessions that answered. A student may change their answer; *first try* uses the
+first answer each student picked and *final* the last one.
+""")
+summary = pd.DataFrame({
+    "Question": [s.label for s in stats],
+    "Answers": [s.responses for s in stats],
+    "Students": [s.sessions for s in stats],
+    "Correct, first try (%)": [100.0 * s.first_correct for s in stats],
+    "Correct, final (%)": [100.0 * s.final_correct for s in stats],
+})
+if reveal:
+    summary.insert(1, "Correct answer", [s.answer for s in stats])
+st.dataframe(summary.style.format({"Correct, first try (%)": "{:.0f}", "Correct, final (%)": "{:.0f}"}),
+             width="stretch", hide_index=True)
+
+# ============================================================
+# 2. ANSWER DISTRIBUTIONS
+# ============================================================
+run.section("answers")
+st.header("2. Answer Distributions")
+
+counts = quiz.answer_counts(app)
+labels = {s.question: s.label for s in stats}
+questions = [s.question for s in stats]
+
+fig, axes = plt.subplots(1, len(questions), figsize=(5 * len(questions), 3.6), squeeze=False)
+for ax, question in zip(axes[0], questions):
+    rows = [c for c in counts if c.question == question]
+    y = np.arange(len(rows))
+    ax.barh(y, [c.responses for c in rows], color=[("C2" if c.correct else "C3") if reveal else "C0" for c in rows])
+    ax.set_yticks(y, [c.answer for c in rows], fontsize=8)
+    ax.invert_yaxis()
+    ax.set_xlabel("Answers")
+    ax.set_title(labels[question], fontsize=9, wrap=True)
+fig.tight_layout()
+figures.show(fig, run)
+if reveal:
+    st.caption("Green: correct answer. Red: distractors.")
+
+run.finish()
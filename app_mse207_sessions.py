@@ -0,0 +1,77 @@
+import streamlit as st
+import pandas as pd
+
+from mse207 import admin, metrics, sessions
+
+# -------------------------------------------
+# PAGE CONFIG
+# -------------------------------------------
+st.set_page_config(
+    page_title="Session Stats (MSE207)",
+    layout="wide"
+)
+
+admin.require()
+
+run = metrics.start_rerun("session_stats")
+
+st.title("Session Stats")
+st.markdown("### Material Processing Laboratory – Memory Held by Open Sessions")
+
+MB = 1024.0 ** 2
+
+# ============================================================
+# 1. TOTALS
+# ============================================================
+run.section("totals")
+st.header("1. Totals")
+
+idle = f"{sessions.IDLE_SECONDS / 60.0:.0f} min" if sessions.IDLE_SECONDS else "off"
+cap = f"{sessions.MAX_BYTES / MB:.0f} MB" if sessions.MAX_BYTES else "off"
+st.markdown(f"""
+Byte counts are estimates taken at the end of each session's latest rerun: widget *state*, and *results*
+(finished simulation jobs) that can be dropped and recomputed. Results are dropped after **{idle}** without a
+rerun, and from the least recently active sessions when all results together exceed **{cap}**.
+""")
+
+stats = sessions.snapshot()
+dropped = sessions.evictions()
+
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Sessions tracked", len(stats))
+col2.metric(f"Active ({metrics.SESSION_ACTIVE_SECONDS / 60.0:.0f} min)", metrics.active_sessions())
+col3.metric("Results held", f"{sum(s.results_bytes for s in stats) / MB:.1f} MB")
+col4.metric("Sessions evicted", sum(count for count, _ in dropped.values()))
+
+if dropped:
+    st.markdown("\n".join(
+        f"- **{reason}**: {count} sessions, {freed / MB:.1f} MB dropped" for reason, (count, freed) in dropped.items()
+    ))
+
+# ============================================================
+# 2. HEAVIEST SESSIONS
+# ============================================================
+run.section("heaviest")
+st.header("2. Heaviest Sessions")
+
+if not stats:
+    st.info("No sessions tracked yet.")
+else:
+    top = st.slider("Sessions shown", 5, 200, 20, 5)
+    table = pd.DataFrame({
+        "Session": [(s.session_id or "")[:8] for s in stats],
+        "Pages": [", ".join(s.apps) for s in stats],
+        "Idle (min)": [s.idle_s / 60.0 for s in stats],
+        "Reruns": [s.reruns for s in stats],
+        "State (MB)": [s.state_bytes / MB for s in stats],
+        "Results (MB)": [s.results_bytes / MB for s in stats],
+        "Total (MB)": [(s.state_bytes + s.results_bytes) / MB for s in stats],
+        "Evictions": [s.evictions for s in stats],
+        "Last eviction": [s.last_eviction or "" for s in stats],
+    }).head(top)
+    st.dataframe(
+        table.style.format({c: "{:.2f}" for c in ("Idle (min)", "State (MB)", "Results (MB)", "Total (MB)")}),
+        width="stretch", hide_index=True,
+    )
+
+run.finish()
@@ -0,0 +1,127 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from mse207 import figures, jobs, metrics, study
+
+# -------------------------------------------
+# PAGE CONFIG
+# -------------------------------------------
+st.set_page_config(
+    page_title="Parameter Studies (MSE207)",
+    layout="wide"
+)
+
+run = metrics.start_rerun("study")
+
+st.title("Parameter Studies")
+st.markdown("### Material Processing Laboratory – Many Variants of the Week 8 and Week 10 Models at Once")
+
+# ============================================================
+# 1. DESIGN
+# ============================================================
+run.section("design")
+st.header("1. Design of the Study")
+
+st.markdown(f"""
+Instead of moving one slider at a time, a **parameter study** evaluates a model at many points of the
+input space:
+
+- a **Cartesian** (full factorial) design takes the same number of levels of every input;
+- a **Latin hypercube** places one point in every slice of every input's range, which covers the space
+  evenly with far fewer points than a grid.
+
+The points are shared with **{study.WORKERS} worker process(es)**, which write their results straight
+into a shared table, and the plots below fill in as the results arrive.
+""")
+
+col1, col2 = st.columns(2)
+with col1:
+    model_name = st.selectbox("Model", list(study.MODELS), format_func=lambda name: study.MODELS[name].title)
+    model = study.MODELS[model_name]
+with col2:
+    kind = st.radio("Design", ["lhs", "cartesian"], horizontal=True,
+                    format_func=lambda k: {"lhs": "Latin hypercube", "cartesian": "Cartesian"}[k])
+    # The Crank–Nicolson model solves a 100×100 grid per point, about 0.25 ms on one core,
+    # so a million points would hold the workers for minutes
+    finite_difference = model_name == "week10_case_depth_fd"
+    options = [1_000, 10_000, 100_000] if finite_difference else [1_000, 10_000, 100_000, 1_000_000]
+    points = st.select_slider("Number of points", options=options, value=10_000,
+                              format_func=lambda n: f"{n:,}")
+    if finite_difference:
+        st.caption(f"Each point is a full finite-difference solve: roughly "
+                   f"{points * 0.25e-3 / study.WORKERS:.2g} s for {points:,} points on "
+                   f"{study.WORKERS} worker(s).")
+
+factors = []
+with st.expander("Input ranges", expanded=False):
+    for factor in model.factors:
+        fmt = "%.2e" if factor.log else "%.3g"
+        low_col, high_col = st.columns(2)
+        low = low_col.number_input(f"{factor.label} – low", value=factor.low, format=fmt,
+                                   key=f"{model_name}_{factor.name}_low")
+        high = high_col.number_input(f"{factor.label} – high", value=factor.high, format=fmt,
+                                     key=f"{model_name}_{factor.name}_high")
+        factors.append(factor._replace(low=low, high=high))
+factors = tuple(factors)
+
+if st.button("Run study", type="primary"):
+    st.session_state["study_request"] = (model_name, kind, points, factors)
+
+# ============================================================
+# 2. RESULTS
+# ============================================================
+run.section("results")
+st.header("2. Results")
+
+request = st.session_state.get("study_request")
+if request is None:
+    st.info("Choose a model and a design, then press **Run study**.")
+else:
+    study_job = jobs.submit("study", study.run, *request)
+    request_model = study.MODELS[request[0]]
+
+    def show_study(result):
+        names = [f.name for f in result.factors]
+        labels = {f.name: f.label for f in result.factors}
+        table = pd.DataFrame(result.design[result.done], columns=names)
+        for j, output in enumerate(request_model.outputs):
+            table[output] = result.values[result.done, j]
+
+        st.caption(f"{int(result.done.sum()):,} of {result.done.size:,} points evaluated "
+                   f"in {result.elapsed_s:.1f} s.")
+        out_col, x_col, c_col = st.columns(3)
+        output = out_col.selectbox("Output", request_model.outputs, key="study_output")
+        x_name = x_col.selectbox("Horizontal axis", names, format_func=labels.get, key="study_x")
+        c_name = c_col.selectbox("Colour", names, index=min(1, len(names) - 1), format_func=labels.get,
+                                 key="study_colour")
+
+        # Plot at most 20,000 points; the statistics use all of them
+        sample = table.sample(min(len(table), 20_000), random_state=0) if len(table) else table
+        fig_s, (ax_s, ax_h) = plt.subplots(1, 2, figsize=(11, 4))
+        dots = ax_s.scatter(sample[x_name], sample[output], c=sample[c_name], s=4, cmap="viridis")
+        if next(f for f in result.factors if f.name == x_name).log:
+            ax_s.set_xscale("log")
+        ax_s.set_xlabel(labels[x_name])
+        ax_s.set_ylabel(output)
+        fig_s.colorbar(dots, ax=ax_s, label=labels[c_name])
+        ax_h.hist(table[output].dropna(), bins=60)
+        ax_h.set_xlabel(output)
+        ax_h.set_ylabel("Points")
+        fig_s.tight_layout()
+        figures.show(fig_s, run)
+
+        # Rank correlation: how strongly each input drives each output
+        ranks = table.rank()
+        sensitivity = ranks[names].apply(lambda column: ranks[list(request_model.outputs)].corrwith(column))
+        st.markdown("**Spearman rank correlation of each output with each input**")
+        st.dataframe(sensitivity.rename(columns=labels).style.format("{:+.2f}"), width="stretch")
+
+        if result.done.all():
+            st.download_button("Download results (CSV)", table.to_csv(index=False).encode(),
+                               file_name=f"{request[0]}_{request[1]}_{len(table)}.csv", mime="text/csv")
+
+    jobs.show(study_job, show_study, label="Running study")
+
+run.finish()
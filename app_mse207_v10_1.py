@@ -1,7 +1,10 @@
 import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
-from math import erf
+from scipy.integrate import trapezoid
+from scipy.special import erf
+
+from mse207 import animation, curves, diffusion, doping, figures, jobs, metrics, models, quiz
 
 # -------------------------------------------
 # PAGE CONFIG
@@ -11,12 +14,15 @@ st.set_page_config(
     layout="wide"
 )
 
+run = metrics.start_rerun("week10")
+
 st.title("Week 10 – Diffusion in Solids")
 st.markdown("### Material Processing Laboratory – Fick's Laws, Arrhenius Law, and Applications")
 
 # ============================================================
 # 1. LEARNING OUTCOMES
 # ============================================================
+run.section("learning_outcomes")
 st.header("1. Learning Outcomes")
 
 st.markdown("""
@@ -32,6 +38,7 @@ After completing **Week 10**, students will be able to:
 # ============================================================
 # 2. THEORY – WITH LATEX
 # ============================================================
+run.section("theory")
 st.header("2. Theory of Diffusion in Solids")
 
 st.subheader("2.1 Fick's First Law – Steady-State Diffusion")
@@ -130,6 +137,7 @@ This means that **penetration depth increases with the square root of time**.
 # ============================================================
 # 3. SIMULATION 1 – ARRHENIUS DIFFUSION COEFFICIENT
 # ============================================================
+run.section("simulation_1")
 st.header("3. Simulation 1 – Arrhenius Law: D vs Temperature")
 
 st.markdown("""
@@ -146,20 +154,21 @@ with colA:
 with colB:
     T_min = st.slider("Minimum Temperature (°C)", 300, 900, 500)
     T_max = st.slider("Maximum Temperature (°C)", 600, 1400, 1000)
-    n_points = 200
-
-R = 8.314
-T_K = np.linspace(T_min + 273.15, T_max + 273.15, n_points)
 
 # Compute D(T)
-D_T = D0_input * np.exp(-Q_input / (R * T_K))
+T_K, D_T = curves.arrhenius_curve(D0_input, Q_input, T_min, T_max)
+
 
-fig1, ax1 = plt.subplots(figsize=(7, 4))
-ax1.semilogy(T_K, D_T)
-ax1.set_xlabel("Temperature (K)")
-ax1.set_ylabel("Diffusion Coefficient D (m²/s)")
-ax1.set_title("Arrhenius Diffusion Coefficient vs Temperature")
-st.pyplot(fig1)
+def arrhenius_figure():
+    fig1, ax1 = plt.subplots(figsize=(7, 4))
+    ax1.semilogy(T_K, D_T)
+    ax1.set_xlabel("Temperature (K)")
+    ax1.set_ylabel("Diffusion Coefficient D (m²/s)")
+    ax1.set_title("Arrhenius Diffusion Coefficient vs Temperature")
+    return fig1
+
+
+figures.show_cached("week10_arrhenius_figure", (D0_input, Q_input, T_min, T_max), arrhenius_figure, run)
 
 st.markdown("""
 You can see that diffusion coefficient increases **exponentially** with temperature.
@@ -169,6 +178,7 @@ Even a moderate increase in temperature can dramatically accelerate diffusion.
 # ============================================================
 # 4. SIMULATION 2 – NON-STEADY-STATE DIFFUSION PROFILE
 # ============================================================
+run.section("simulation_2")
 st.header("4. Simulation 2 – Non-Steady-State Diffusion Profile (Error Function Solution)")
 
 st.markdown("""
@@ -180,32 +190,99 @@ col1, col2 = st.columns(2)
 with col1:
     C0 = st.slider("Initial concentration C₀ (wt.%)", 0.0, 2.0, 0.2, 0.1)
     Cs = st.slider("Surface concentration Cₛ (wt.%)", 0.1, 2.0, 1.0, 0.1)
-    D_ns = st.number_input("Diffusion coefficient D (m²/s)", value=1e-11, format="%.1e")
+    D_ns = st.number_input("Diffusion coefficient D (m²/s)", value=1e-11, min_value=1e-16, format="%.1e")
 
 with col2:
     t_hours = st.slider("Diffusion time (hours)", 0.5, 10.0, 4.0, 0.5)
     t_ns = t_hours * 3600.0
     max_depth_mm = st.slider("Maximum depth (mm)", 0.2, 5.0, 2.0, 0.1)
 
-# Depth axis (m)
-x_m = np.linspace(0, max_depth_mm / 1000.0, 300)
+bc1, bc2 = st.columns(2)
+with bc1:
+    bc = st.selectbox("Boundary condition", ["dirichlet", "robin"],
+                      format_func=lambda k: {"dirichlet": "Fixed surface concentration (Cₛ)",
+                                             "robin": "Surface mass transfer (β)"}[k])
+with bc2:
+    beta = st.number_input("Mass-transfer coefficient β (m/s)", value=2e-8, min_value=1e-10, format="%.1e",
+                           disabled=bc != "robin")
+
+animate = st.toggle("Animate the profile from t = 0 to the diffusion time",
+                    help="All frames are computed at once and played back in the browser.")
 
 # Error function solution: C(x,t) = Cs - (Cs - C0)*erf(x / (2 sqrt(D t)))
-if D_ns > 0 and t_ns > 0:
-    denom = 2.0 * np.sqrt(D_ns * t_ns)
-    z = x_m / denom
-    erf_vec = np.vectorize(erf)
-    C_xt = Cs - (Cs - C0) * erf_vec(z)
+x_m, C_xt = curves.erf_profile(C0, Cs, D_ns, t_ns, max_depth_mm)
+if bc == "robin":
+    x_bc, C_bc = curves.robin_profile(C0, Cs, D_ns, t_ns, beta, max_depth_mm)
 else:
-    C_xt = np.full_like(x_m, C0)
-
-fig2, ax2 = plt.subplots(figsize=(7, 4))
-ax2.plot(x_m * 1000.0, C_xt)
-ax2.set_xlabel("Depth x (mm)")
-ax2.set_ylabel("Concentration C (wt.%)")
-ax2.set_title("Non-Steady-State Diffusion Profile")
-st.pyplot(fig2)
-
+    x_bc, C_bc = x_m, C_xt
+
+
+def profile_figure():
+    fig2, ax2 = plt.subplots(figsize=(7, 4))
+    if bc == "robin":
+        ax2.plot(x_m * 1000.0, C_xt, "--", color="grey", label="Fixed Cₛ (error function)")
+        ax2.plot(x_bc * 1000.0, C_bc, label=f"Mass transfer, β = {beta:.1e} m/s")
+        ax2.legend()
+    else:
+        ax2.plot(x_m * 1000.0, C_xt)
+    ax2.set_xlabel("Depth x (mm)")
+    ax2.set_ylabel("Concentration C (wt.%)")
+    ax2.set_title("Non-Steady-State Diffusion Profile")
+    return fig2
+
+
+profile_params = (C0, Cs, D_ns, t_ns, max_depth_mm) + ((beta,) if bc == "robin" else ())
+if animate:
+    frames = models.profile_frames(C0, Cs, D_ns, t_ns, max_depth_mm, beta if bc == "robin" else None)
+    st.iframe(animation.player_html(frames, "Depth x (mm)", "Concentration C (wt.%)", level=Cs,
+                                level_label="Cₛ"), height=410)
+else:
+    figures.show_cached("week10_profile_figure", profile_params, profile_figure, run)
+
+if bc == "robin":
+    st.markdown(r"""
+In gas carburizing the surface does not jump to the carbon potential of the atmosphere: carbon crosses the
+gas–steel interface at a rate proportional to the remaining difference,
+\(-D\,\partial C/\partial x = \beta\,(C_s - C)\) at \(x = 0\). With \(h = \beta / D\) and
+\(z = x / 2\sqrt{Dt}\) the closed-form solution is
+""")
+    st.latex(r"\frac{C - C_0}{C_s - C_0} = \operatorname{erfc}(z) - "
+             r"e^{hx + h^2 D t}\,\operatorname{erfc}\!\left(z + h\sqrt{Dt}\right)")
+    st.markdown(r"""
+The exponential overflows long before the erfc underflows, so the product is evaluated as
+\(e^{-z^2}\,\operatorname{erfcx}(z + h\sqrt{Dt})\) with the scaled complementary error function
+\(\operatorname{erfcx}(u) = e^{u^2}\operatorname{erfc}(u)\). For large \(\beta\) it approaches the
+fixed-surface (error function) profile.
+""")
+
+    # The whole depth × time field in one vectorised evaluation
+    t_grid = np.linspace(0.0, t_ns, 201)[1:]
+    x_grid = np.linspace(0.0, max_depth_mm / 1000.0, 201)
+    C_grid = curves.robin_concentration(x_grid[:, None], t_grid[None, :], C0, Cs, D_ns, beta)
+
+    def robin_history_figure():
+        fig_r, (ax_p, ax_s) = plt.subplots(1, 2, figsize=(11, 4))
+        for fraction in (0.125, 0.25, 0.5, 1.0):
+            j = int(round(fraction * t_grid.size)) - 1
+            ax_p.plot(x_grid * 1000.0, C_grid[:, j], label=f"t = {t_grid[j] / 3600.0:.2f} h")
+        ax_p.set_xlabel("Depth x (mm)")
+        ax_p.set_ylabel("Concentration C (wt.%)")
+        ax_p.set_title("Profiles during carburizing")
+        ax_p.legend()
+        ax_s.plot(t_grid / 3600.0, C_grid[0], label="Surface C(0, t)")
+        ax_s.axhline(Cs, color="grey", linestyle="--", label="Carbon potential Cₛ")
+        ax_s.set_xlabel("Time (h)")
+        ax_s.set_ylabel("Concentration C (wt.%)")
+        ax_s.set_title("Surface concentration")
+        ax_s.legend()
+        fig_r.tight_layout()
+        return fig_r
+
+    figures.show_cached("week10_robin_history_figure", profile_params, robin_history_figure, run)
+
+surface_note = (f"The surface exchanges carbon with an atmosphere of carbon potential **Cₛ = {Cs:.2f} wt.%** "
+                f"through **β = {beta:.1e} m/s** and has reached **{C_bc[0]:.3f} wt.%**"
+                if bc == "robin" else f"The surface concentration is fixed at **Cₛ = {Cs:.2f} wt.%**")
 st.markdown(f"""
 For the selected parameters:
 
@@ -213,13 +290,225 @@ For the selected parameters:
 - Max depth: **{max_depth_mm:.2f} mm**  
 - Diffusion coefficient: **{D_ns:.1e} m²/s**
 
-The surface concentration is fixed at **Cₛ = {Cs:.2f} wt.%**,  
+{surface_note},  
 and the initial bulk concentration is **C₀ = {C0:.2f} wt.%**.
 """)
 
+st.subheader("4.1 Finite-Difference Solution (Crank–Nicolson)")
+
+st.markdown("""
+The error function holds only for a **constant** D. In many alloys D depends on concentration
+(carbon diffuses faster in carbon-rich austenite), and then Fick's second law has to be solved numerically.
+Below, D rises geometrically from D at C₀ to D × ratio at Cₛ. With ratio = 1 the numerical profile should lie
+on the error-function curve. A coarse grid is solved and drawn **immediately**; finer grids then run
+**in the background** and replace it, until successive grids agree within the tolerance or the time
+budget runs out. A run is cancelled as soon as the inputs change.
+""")
+
+fd1, fd2 = st.columns(2)
+with fd1:
+    D_ratio = st.slider("D(Cₛ) / D(C₀)", 1.0, 20.0, 1.0, 0.5)
+with fd2:
+    fd_tolerance = st.select_slider("Refinement tolerance (wt.%)", options=[1e-2, 1e-3, 1e-4, 1e-5], value=1e-4,
+                                    format_func=lambda v: f"{v:g}")
+    fd_budget = st.slider("Time budget (s)", 0.5, 20.0, 3.0, 0.5)
+
+# Far boundary beyond the plotted depth and several diffusion lengths of the fastest D
+fd_depth = max(max_depth_mm / 1000.0, 6.0 * np.sqrt(D_ns * max(D_ratio, 1.0) * t_ns))
+fd_args = (C0, Cs, D_ns, t_ns, fd_depth)
+fd_job = jobs.submit(
+    "week10_fd", jobs.progressive, diffusion.crank_nicolson, diffusion.REFINE_LEVELS,
+    diffusion.profile_change, *fd_args, D_ratio=D_ratio, start=1, tolerance=fd_tolerance, budget_s=fd_budget,
+)
+
+
+def fd_coarse():
+    coarse = diffusion.crank_nicolson(*fd_args, D_ratio=D_ratio, **diffusion.REFINE_LEVELS[0])
+    return jobs.Refined(coarse, 0, None, None)
+
+
+def show_fd_profile(refined):
+    result = refined.result
+    fig_fd, ax_fd = plt.subplots(figsize=(7, 4))
+    ax_fd.plot(x_m * 1000.0, C_xt, label="Error function (constant D)")
+    shown = result.x <= max_depth_mm / 1000.0
+    ax_fd.plot(result.x[shown] * 1000.0, result.C[shown], "--", label=f"Crank–Nicolson, D ratio {D_ratio:g}")
+    ax_fd.set_xlabel("Depth x (mm)")
+    ax_fd.set_ylabel("Concentration C (wt.%)")
+    ax_fd.set_title("Finite-Difference vs Error-Function Profile")
+    ax_fd.legend()
+    figures.show(fig_fd, run)
+    deviation = np.max(np.abs(result.C[shown] - np.interp(result.x[shown], x_m, C_xt)))
+    status = "refining…" if refined.stopped is None else f"stopped: {refined.stopped}"
+    change = "" if refined.change is None else f", {refined.change:.1e} wt.% from the previous grid"
+    st.caption(f"Grid {refined.level + 1} of {len(diffusion.REFINE_LEVELS)}: {result.steps:,} steps on "
+               f"{result.x.size:,} nodes in {result.elapsed_s:.3f} s{change} ({status}). "
+               f"Largest difference from the error function: {deviation:.4f} wt.%")
+
+
+jobs.show(fd_job, show_fd_profile, label="Refining the grid", fallback=fd_coarse)
+
+# ------------------------------------------------------------
+# 4.2 Semiconductor doping: predeposition and drive-in
+# ------------------------------------------------------------
+run.section("doping")
+st.subheader("4.2 Semiconductor Doping – Predeposition and Drive-in")
+
+st.markdown(r"""
+Dopants are diffused into silicon in **two steps**. The **predeposition** holds the surface at the
+solid solubility \(C_s\) and gives the erfc profile of Section 2.3, with a dose
+\(Q = 2 C_s \sqrt{D_1 t_1 / \pi}\) (atoms/cm²). The **drive-in** then seals the surface and spreads
+that fixed dose deeper. When \(D_2 t_2 \gg D_1 t_1\) the profile is the **limited-source Gaussian**
+""")
+st.latex(r"C(x, t) = \frac{Q}{\sqrt{\pi D_2 t_2}} \exp\left(-\frac{x^2}{4 D_2 t_2}\right)")
+st.markdown(r"""
+Below, the exact two-step profile (valid for any \(D_1 t_1\) and \(D_2 t_2\)) is shown as well,
+with \(D = D_0 \exp(-E_a / kT)\) evaluated at each step's temperature. The **junction** lies where
+the dopant concentration equals the background doping \(C_B\) of the opposite type.
+""")
+
+dop1, dop2, dop3 = st.columns(3)
+with dop1:
+    dopant_key = st.selectbox("Dopant", list(doping.DOPANTS), format_func=lambda k: doping.DOPANTS[k].name)
+    dopant = doping.DOPANTS[dopant_key]
+    C_B = st.select_slider("Background doping C_B (atoms/cm³)", options=[1e14, 1e15, 1e16, 1e17],
+                           value=1e16, format_func=lambda v: f"{v:.0e}")
+with dop2:
+    T1 = st.slider("Predeposition temperature (°C)", 800, 1100, 950, 10)
+    t1 = st.slider("Predeposition time (min)", 5, 120, 30, 5)
+with dop3:
+    T2 = st.slider("Drive-in temperature (°C)", 950, 1250, 1100, 10)
+    t2 = st.slider("Drive-in time (min)", 10, 600, 60, 10)
+
+recipe = doping.screen(dopant, T1, t1, T2, t2, C_B)
+xj_reach = np.nanmax([recipe.xj, recipe.xj_gaussian, recipe.xj_predep, 1e-5])
+x_cm = np.linspace(0.0, 1.5 * xj_reach, 400)
+
+fig_d, ax_d = plt.subplots(figsize=(7, 4))
+ax_d.semilogy(x_cm * 1e4, doping.predeposition(x_cm, dopant.Cs, recipe.a), label="After predeposition (erfc)")
+ax_d.semilogy(x_cm * 1e4, doping.gaussian(x_cm, recipe.dose, recipe.b), "--", label="Drive-in, Gaussian")
+ax_d.semilogy(x_cm * 1e4, doping.two_step(x_cm, dopant.Cs, recipe.a, recipe.b), label="Drive-in, exact")
+ax_d.axhline(C_B, color="gray", linestyle=":", label="Background C_B")
+ax_d.set_ylim(C_B / 10.0, dopant.Cs * 2.0)
+ax_d.set_xlabel("Depth x (µm)")
+ax_d.set_ylabel("Concentration (atoms/cm³)")
+ax_d.set_title(f"{dopant.name}: {T1} °C / {t1} min + {T2} °C / {t2} min")
+ax_d.legend()
+figures.show(fig_d, run)
+
+st.markdown(f"""
+- D at predeposition: **{recipe.D1:.2e} cm²/s**; at drive-in: **{recipe.D2:.2e} cm²/s**
+- Dose: **{recipe.dose:.2e} atoms/cm²**; surface concentration after drive-in: **{recipe.surface:.2e} atoms/cm³**
+- Junction depth: **{recipe.xj * 1e4:.3f} µm** (Gaussian approximation {recipe.xj_gaussian * 1e4:.3f} µm;
+  after predeposition only {recipe.xj_predep * 1e4:.3f} µm)
+""")
+
+st.markdown("""
+**Screening recipes.** The same calculation runs on a whole grid of drive-in recipes at once
+(200 temperatures × 200 times = 40,000 recipes in one vectorised call) for the predeposition above.
+The contour lines are junction depths; the marker is the recipe above.
+""")
+
+T2_grid, t2_grid = np.meshgrid(np.linspace(950.0, 1250.0, 200), np.geomspace(10.0, 600.0, 200))
+screened = models.doping_screen(dopant, float(T1), float(t1), T2_grid, t2_grid, C_B)
+
+fig_m, ax_m = plt.subplots(figsize=(7, 4))
+depth_um = screened.xj * 1e4
+mesh = ax_m.pcolormesh(T2_grid, t2_grid, depth_um, shading="auto", cmap="viridis")
+contours = ax_m.contour(T2_grid, t2_grid, depth_um, levels=[0.5, 1, 2, 3, 5, 8], colors="white", linewidths=0.8)
+ax_m.clabel(contours, fmt="%g µm", fontsize=8)
+ax_m.plot(T2, t2, "r*", markersize=12)
+ax_m.set_yscale("log")
+ax_m.set_xlabel("Drive-in temperature (°C)")
+ax_m.set_ylabel("Drive-in time (min)")
+ax_m.set_title("Junction Depth over Drive-in Recipes")
+fig_m.colorbar(mesh, ax=ax_m, label="Junction depth (µm)")
+figures.show(fig_m, run)
+
+# ------------------------------------------------------------
+# 4.3 Finite slab: carburizing and decarburizing thin strip
+# ------------------------------------------------------------
+run.section("finite_slab")
+st.subheader("4.3 Finite Slab – Carburizing and Decarburizing Thin Strip")
+
+st.markdown(r"""
+The error function assumes a **semi-infinite** solid, which holds only while the diffusion length
+\(\sqrt{Dt}\) is small compared with the part. Thin strip annealed in a decarburizing atmosphere loses
+carbon through **both faces**, and the two profiles soon meet in the middle. For a slab of half-thickness
+\(l\) held at \(C_s\) on both faces (\(x\) measured from the centre) there are two exact series:
+""")
+st.latex(r"\frac{C - C_0}{C_s - C_0} = \sum_{n=0}^{\infty} (-1)^n \left[\operatorname{erfc}"
+         r"\frac{(2n+1)l - x}{2\sqrt{Dt}} + \operatorname{erfc}\frac{(2n+1)l + x}{2\sqrt{Dt}}\right]")
+st.latex(r"\frac{C - C_0}{C_s - C_0} = 1 - \frac{4}{\pi} \sum_{n=0}^{\infty} \frac{(-1)^n}{2n+1}"
+         r"\exp\left(-\frac{(2n+1)^2 \pi^2 D t}{4 l^2}\right) \cos\frac{(2n+1)\pi x}{2l}")
+st.markdown(r"""
+The first (images of the error function) needs only a term or two at **short times**; the second
+(Fourier series) at **long times**. Each time below uses whichever needs fewer terms for an error
+below \(10^{-6}\). A strip with one face sealed behaves like half of a strip twice as thick.
+With \(C_s < C_0\) the strip is **decarburized**.
+""")
+
+slab1, slab2, slab3 = st.columns(3)
+with slab1:
+    slab_mm = st.slider("Strip thickness (mm)", 0.2, 10.0, 1.0, 0.1)
+    slab_faces = st.radio("Exposed faces", [2, 1], horizontal=True,
+                          format_func=lambda k: {2: "Both faces", 1: "One face (back sealed)"}[k])
+with slab2:
+    slab_C0 = st.slider("Initial carbon C₀ (wt.%)", 0.0, 1.5, 0.8, 0.05)
+    slab_Cs = st.slider("Surface carbon Cₛ (wt.%)", 0.0, 1.5, 0.1, 0.05)
+with slab3:
+    slab_D = st.number_input("Diffusion coefficient D (m²/s)", value=1e-11, min_value=1e-16, format="%.1e",
+                             key="slab_D")
+    slab_hours = st.slider("Anneal time (hours)", 0.5, 50.0, 10.0, 0.5)
+
+slab_tol = 1e-6
+slab_m = slab_mm / 1000.0
+# Depth × time in one vectorised call
+slab_x, slab_t, slab_C = curves.slab_history(slab_C0, slab_Cs, slab_D, slab_m, slab_hours * 3600.0,
+                                             faces=slab_faces, tol=slab_tol)
+slab_mean = trapezoid(slab_C, slab_x, axis=0) / slab_m
+slab_half = slab_m / 2.0 if slab_faces == 2 else slab_m
+slab_centre = slab_C[np.argmin(np.abs(slab_x - slab_half))]
+
+fig_f, (ax_f, ax_g) = plt.subplots(1, 2, figsize=(11, 4))
+for fraction in (0.05, 0.15, 0.4, 1.0):
+    j = int(round(fraction * (slab_t.size - 1)))
+    ax_f.plot(slab_x * 1000.0, slab_C[:, j], label=f"t = {slab_t[j] / 3600.0:.2f} h")
+semi_infinite = slab_Cs - (slab_Cs - slab_C0) * erf(slab_x / (2.0 * np.sqrt(slab_D * slab_t[-1])))
+ax_f.plot(slab_x * 1000.0, semi_infinite, "k--", linewidth=1, label="Semi-infinite (erf), final time")
+ax_f.set_xlabel("Position through the strip (mm)")
+ax_f.set_ylabel("Carbon (wt.%)")
+ax_f.set_title("Profiles through the Strip")
+ax_f.legend(fontsize=8)
+ax_g.plot(slab_t / 3600.0, slab_mean, label="Mean")
+ax_g.plot(slab_t / 3600.0, slab_centre, label="Centre" if slab_faces == 2 else "Sealed face")
+ax_g.axhline(slab_Cs, color="gray", linestyle=":", label="Surface Cₛ")
+ax_g.set_xlabel("Time (h)")
+ax_g.set_ylabel("Carbon (wt.%)")
+ax_g.set_title("Approach to Equilibrium")
+ax_g.legend(fontsize=8)
+fig_f.tight_layout()
+figures.show(fig_f, run)
+
+image_terms, fourier_terms = curves.slab_terms(slab_t[1:], slab_D, slab_half, slab_tol)
+switch = np.flatnonzero(fourier_terms <= image_terms)
+if switch.size == 0:
+    series_note = "the images of the error function throughout (the strip still looks semi-infinite)"
+elif switch[0] == 0:
+    series_note = "the Fourier series throughout"
+else:
+    series_note = (f"the images of the error function up to **{slab_t[1:][switch[0]] / 3600.0:.2f} h** "
+                   f"and the Fourier series after")
+st.markdown(f"""
+- Series used: {series_note}
+- Terms at the final time: **{image_terms[-1]}** image pairs or **{fourier_terms[-1]}** Fourier terms
+- Mean carbon after {slab_hours:.1f} h: **{slab_mean[-1]:.3f} wt.%** (centre {slab_centre[-1]:.3f} wt.%)
+""")
+
 # ============================================================
 # 5. SIMULATION 3 – DIFFUSION DISTANCE ESTIMATE
 # ============================================================
+run.section("simulation_3")
 st.header("5. Simulation 3 – Diffusion Distance Estimate x ≈ √(Dt)")
 
 st.markdown("""
@@ -253,6 +542,7 @@ This simple estimate is very useful when designing **heat treatment durations**
 # ============================================================
 # 6. WORKED EXAMPLES (DETAILED)
 # ============================================================
+run.section("examples")
 st.header("6. Worked Examples")
 
 # Example 1
@@ -455,6 +745,7 @@ So at **900°C**, the diffusion coefficient is approximately
 # ============================================================
 # 7. KEY EQUATIONS
 # ============================================================
+run.section("key_equations")
 st.header("7. Key Equations – Week 10")
 
 st.latex(r"""
@@ -476,53 +767,61 @@ x_{\text{avg}} \approx \sqrt{D t}
 # ============================================================
 # 8. QUIZ
 # ============================================================
+run.section("quiz")
 st.header("8. Quick Quiz – Check Your Understanding")
 
-q1 = st.radio(
+q1 = quiz.radio(
+    "week10", "q1",
     "1) Which law describes non-steady-state diffusion?",
     [
         "Fick's First Law",
         "Fick's Second Law",
         "Hooke's Law"
-    ]
+    ],
+    answer="Fick's Second Law"
 )
 
 if q1 == "Fick's Second Law":
     st.success("Correct – Fick's Second Law governs non-steady-state diffusion.")
-elif q1 != "":
+elif q1 is not None:
     st.error("Not correct. Non-steady behavior is described by Fick's Second Law.")
 
-q2 = st.radio(
+q2 = quiz.radio(
+    "week10", "q2",
     "2) How does diffusion coefficient D depend on temperature in metals?",
     [
         "Linearly with T",
         "Inversely with T",
         "Exponentially with 1/T (Arrhenius behavior)"
-    ]
+    ],
+    answer="Exponentially with 1/T (Arrhenius behavior)"
 )
 
 if q2 == "Exponentially with 1/T (Arrhenius behavior)":
     st.success("Correct – D follows an Arrhenius-type exponential dependence.")
-elif q2 != "":
+elif q2 is not None:
     st.error("Not correct. D follows an Arrhenius-type exponential dependence on 1/T.")
 
-q3 = st.radio(
+q3 = quiz.radio(
+    "week10", "q3",
     "3) The approximate diffusion distance after time t is proportional to:",
     [
         "t",
         "√t",
         "1/t"
-    ]
+    ],
+    answer="√t"
 )
 
 if q3 == "√t":
     st.success("Correct – diffusion distance grows with the square root of time.")
-elif q3 != "":
+elif q3 is not None:
     st.error("Not correct. It scales with the square root of time (√t).")
 
 # ============================================================
 # 9. SUMMARY
 # ============================================================
+run.section("summary")
 st.header("9. Summary – Week 10 Conclusions")
 
 st.markdown("""
@@ -532,3 +831,5 @@ st.markdown("""
 - The diffusion coefficient **increases exponentially** with temperature (Arrhenius behavior).  
 - Diffusion depth grows roughly as **√(Dt)**, which is crucial for designing **heat treatments** (carburizing, nitriding, doping, etc.).
 """)
+
+run.finish()
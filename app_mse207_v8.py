@@ -2,12 +2,17 @@ import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
 
+from mse207 import cooling, curves, figures, metrics, models, quiz, streams
+
+run = metrics.start_rerun("week8")
+
 st.title("Week 8 – Material Processing Laboratory")
 st.markdown("### Heat Transfer, Cooling Curves, and Solidification of Metals")
 
 # ============================================================
 # 1. LEARNING OUTCOMES
 # ============================================================
+run.section("learning_outcomes")
 st.header("1. Learning Outcomes")
 
 st.markdown("""
@@ -23,6 +28,7 @@ After completing this module, students will be able to:
 # ============================================================
 # 2. THEORY
 # ============================================================
+run.section("theory")
 st.header("2. Theory of Heat Transfer in Metal Processing")
 
 # Subsection 2.1
@@ -82,6 +88,7 @@ st.markdown("""
 # ============================================================
 # 3. INTERACTIVE SIMULATION
 # ============================================================
+run.section("simulation")
 st.header("3. Interactive Simulation: Cooling Curve of a Metal")
 
 st.markdown("Use the sliders to change physical parameters and observe the cooling behavior.")
@@ -93,30 +100,286 @@ rho = st.slider("Density ρ (kg/m³)", 1000, 9000, 2700)
 Cp = st.slider("Heat Capacity Cp (J/kg·K)", 200, 1200, 900)
 h = st.slider("Convective Coefficient h (W/m²K)", 5.0, 200.0, 50.0)
 
-# Time axis
-t = np.linspace(0, 600, 600)
+# Newtonian cooling with an artificial solidification plateau
 T_env = 25.0
+t, T = curves.newton_cooling_curve(T_initial, T_melt, rho, Cp, h, T_env)
+
+
+def cooling_figure():
+    fig, ax = plt.subplots(figsize=(8, 4))
+    ax.plot(t, T, linewidth=2)
+    ax.axhline(T_melt, linestyle='--')
+    ax.set_xlabel("Time (s)")
+    ax.set_ylabel("Temperature (°C)")
+    ax.set_title("Cooling Curve with Solidification Plateau")
+    return fig
+
 
-# Simple Newtonian cooling model
-T = T_env + (T_initial - T_env) * np.exp(-h * t / (rho * Cp))
+figures.show_cached("week8_cooling_figure", (T_initial, T_melt, rho, Cp, h, T_env), cooling_figure, run)
 
-# Artificial solidification plateau
-plateau_start = int(200)
-plateau_end = int(350)
-if plateau_end <= len(T):
-    T[plateau_start:plateau_end] = T_melt
+# ------------------------------------------------------------
+# 3.1 Measured cooling curve from a thermocouple log
+# ------------------------------------------------------------
+run.section("measured_curve")
+st.subheader("3.1 Measured Cooling Curve – Automatic Thermal-Arrest Detection")
 
-fig, ax = plt.subplots(figsize=(8, 4))
-ax.plot(t, T, linewidth=2)
-ax.axhline(T_melt, linestyle='--')
-ax.set_xlabel("Time (s)")
-ax.set_ylabel("Temperature (°C)")
-ax.set_title("Cooling Curve with Solidification Plateau")
-st.pyplot(fig)
+st.markdown("""
+Lab thermocouple logs (kHz sampling, hundreds of MB per pour) are read **in chunks** and reduced to
+short blocks. For each block the least-squares slope gives a smoothed cooling rate \\(dT/dt\\).
+Thermal arrests are where the cooling rate collapses compared with Newtonian cooling:
+the first arrest starts at the **liquidus**, the last one ends at the **solidus**.
+""")
+
+log_path = st.text_input(
+    "Thermocouple log on the lab server (CSV/TXT, .npy or raw binary)",
+    value="",
+    placeholder="pours/2024-03-12_A356.csv",
+    help=f"Relative to the lab data directory `{streams.DATA_DIR}`.",
+)
+
+with st.expander("Log format"):
+    fmt1, fmt2 = st.columns(2)
+    with fmt1:
+        time_col = st.number_input("Time column (−1: none, use sample rate)", -1, 63, 0)
+        temp_col = st.number_input("Temperature column", 0, 63, 1)
+        sample_rate = st.number_input("Sample rate (Hz, logs without time column)", 1.0, 1e6, 1000.0)
+    with fmt2:
+        raw_dtype = st.selectbox("Raw binary sample type", ["<f4", "<f8", "<i2", "<i4"])
+        raw_columns = st.number_input("Raw binary channels per sample", 1, 64, 2)
+        block = st.number_input("Samples per block (derivative window)", 10, 100000, 1000, step=10)
+        rate_fraction = st.slider("Arrest threshold (fraction of normal cooling rate)", 0.05, 0.9, 0.35)
+
+if log_path:
+    try:
+        log_file = streams.data_path(log_path)
+    except (ValueError, OSError) as exc:
+        st.warning(str(exc))
+    else:
+        columns = (temp_col,) if time_col < 0 else (time_col, temp_col)
+        try:
+            summary, arrests, (t_dec, T_dec, T_lo, T_hi) = models.analyze_log(
+                streams.file_signature(log_file), columns, int(block),
+                sample_rate if time_col < 0 else None, raw_dtype, int(raw_columns), rate_fraction,
+            )
+        except (ValueError, OSError) as exc:
+            st.error(f"Could not read the log: {exc}")
+        else:
+            # Model curve from the sliders above, started at the peak of the log
+            i_peak = int(np.argmax(summary.T))
+            t_model = t_dec[t_dec >= summary.t[i_peak]]
+            T_model = T_env + (summary.T[i_peak] - T_env) * np.exp(
+                -h * (t_model - summary.t[i_peak]) / (rho * Cp)
+            )
+
+            fig_log, ax_log = plt.subplots(figsize=(8, 4))
+            ax_log.fill_between(t_dec, T_lo, T_hi, alpha=0.3, linewidth=0, label="Measured (min–max)")
+            ax_log.plot(t_dec, T_dec, linewidth=1.5, label="Measured (block mean)")
+            ax_log.plot(t_model, T_model, linestyle="--", label="Newtonian model")
+            for t_start, t_end, _, _ in arrests.segments:
+                ax_log.axvspan(t_start, t_end, color="tab:orange", alpha=0.15)
+            if arrests.segments:
+                ax_log.axhline(arrests.liquidus_T, color="tab:red", linestyle=":", label="Liquidus")
+                ax_log.axhline(arrests.solidus_T, color="tab:purple", linestyle=":", label="Solidus")
+            ax_log.set_xlabel("Time (s)")
+            ax_log.set_ylabel("Temperature (°C)")
+            ax_log.set_title("Measured Cooling Curve (decimated) vs Model")
+            ax_log.legend(loc="upper right")
+            figures.show(fig_log, run)
+
+            st.write(f"Samples read: **{summary.n_samples:,}** in {summary.t.size:,} blocks")
+            if arrests.segments:
+                st.markdown(f"""
+- Liquidus arrest: **{arrests.liquidus_T:.1f} °C** at t = {arrests.liquidus_t:.1f} s
+- Solidus (end of last arrest): **{arrests.solidus_T:.1f} °C** at t = {arrests.solidus_t:.1f} s
+- Plateau / freezing duration: **{arrests.plateau_s:.1f} s** ({len(arrests.segments)} arrest segment(s))
+- Reference cooling rate outside arrests: {arrests.reference_rate:.2f} °C/s
+""")
+            else:
+                st.info("No thermal arrest detected – try a lower threshold or a larger block size.")
+
+# ------------------------------------------------------------
+# 3.2 Batch estimation of h from measured cooling curves
+# ------------------------------------------------------------
+run.section("batch_fit")
+st.subheader("3.2 Batch Estimation of h from Measured Cooling Curves")
+
+st.markdown("""
+For a lumped part the cooling curve is \\(T = T_\\infty + (T_0 - T_\\infty)\\,e^{-t/\\tau}\\) with
+\\(\\tau = \\rho C_p (V/A) / h\\). Each curve is fitted on the linearised form
+\\(\\ln(T - T_\\infty)\\) when \\(T_\\infty\\) is known, and by nonlinear least squares otherwise.
+Curves are fitted in parallel; \\(h\\) uses ρ and Cp from the sliders above and the V/A below.
+""")
+
+fit_pattern = st.text_input(
+    "Cooling-curve files on the lab server (glob pattern)",
+    value="",
+    placeholder="shift_07/*.csv",
+    help=f"Relative to the lab data directory `{streams.DATA_DIR}`.",
+)
+fit1, fit2 = st.columns(2)
+with fit1:
+    v_over_a_mm = st.number_input("Part V/A (mm)", 0.1, 500.0, 10.0)
+    fit_block = st.number_input("Samples averaged per fitted point", 1, 100000, 100)
+with fit2:
+    known_env = st.checkbox(f"Ambient temperature known (T∞ = {T_env:.0f} °C)", value=True)
+    skip_freezing = st.checkbox("Exclude the freezing range (T_melt ± 20 °C)", value=True)
+
+if fit_pattern:
+    paths = streams.data_glob(fit_pattern)
+    if not paths:
+        st.warning(f"No files in the lab data directory `{streams.DATA_DIR}` match `{fit_pattern}`")
+    elif st.button(f"Fit {len(paths)} curve(s)"):
+        with st.spinner("Fitting curves in a process pool ..."):
+            table = models.fit_files(
+                tuple(streams.file_signature(p) for p in paths),
+                T_env=T_env if known_env else None,
+                rho_cp=rho * Cp,
+                v_over_a=v_over_a_mm / 1000.0,
+                exclude=(T_melt - 20.0, T_melt + 20.0) if skip_freezing else None,
+                block=int(fit_block),
+            )
+        good = table[~table["outlier"]]
+        st.write(
+            f"Fitted **{len(table)}** curves: median h = **{good['h_W_m2K'].median():.1f} W/m²K**, "
+            f"{int(table['outlier'].sum())} flagged as outliers."
+        )
+        st.dataframe(table, width="stretch")
+
+        fig_h, ax_h = plt.subplots(figsize=(8, 3))
+        ax_h.hist(good["h_W_m2K"].dropna(), bins=30)
+        ax_h.set_xlabel("Fitted h (W/m²K)")
+        ax_h.set_ylabel("Number of curves")
+        ax_h.set_title("Distribution of Fitted Convective Coefficients")
+        figures.show(fig_h, run)
+
+# ------------------------------------------------------------
+# 3.3 Microstructure of quenched steel bars
+# ------------------------------------------------------------
+run.section("microstructure")
+st.subheader("3.3 Microstructure of Quenched Steel Bars")
+
+st.markdown("""
+For steels, the cooling rate decides **which phases form** from austenite. Each bar below cools by
+Newton's law from 880 °C; along each cooling path the **Scheil additivity rule** decides when
+ferrite/pearlite and bainite start, **JMAK kinetics** give how much forms, and the remaining austenite
+turns into **martensite** below Ms (Koistinen–Marburger). Thousands of bar diameters are computed at once
+for an illustrative C-Mn steel (Ae3 ≈ 830 °C, Bs ≈ 560 °C, Ms ≈ 400 °C).
+""")
+
+quench_media = {"Water (h ≈ 5000 W/m²K)": 5000.0, "Oil (h ≈ 1000 W/m²K)": 1000.0,
+                "Forced air (h ≈ 100 W/m²K)": 100.0, "Still air (h ≈ 15 W/m²K)": 15.0}
+medium = st.selectbox("Quench medium", list(quench_media))
+
+diameters = np.geomspace(1.0, 300.0, 2000)
+tau_bar, phases = models.quench_phases(diameters, quench_media[medium])
+
+fig_p, ax_p = plt.subplots(figsize=(8, 4))
+ax_p.stackplot(
+    diameters, phases.ferrite_pearlite, phases.bainite, phases.martensite, phases.retained,
+    labels=["Ferrite + pearlite", "Bainite", "Martensite", "Retained austenite"],
+)
+ax_p.set_xscale("log")
+ax_p.set_xlim(diameters[0], diameters[-1])
+ax_p.set_ylim(0, 1)
+ax_p.set_xlabel("Bar Diameter (mm)")
+ax_p.set_ylabel("Phase Fraction")
+ax_p.set_title(f"Predicted Microstructure vs Bar Size – {medium.split(' (')[0]}")
+ax_p.legend(loc="center left", fontsize=8)
+figures.show(fig_p, run)
+
+i_half = np.flatnonzero(phases.martensite >= 0.5)
+if i_half.size:
+    st.write(f"Bars up to **{diameters[i_half[-1]]:.0f} mm** diameter are at least 50 % martensite "
+             "(the lumped model ignores the slower-cooling core, so real bars harden less deeply).")
+else:
+    st.write("No bar size in this range reaches 50 % martensite with this quench medium.")
+
+# ------------------------------------------------------------
+# 3.4 Radiation and convection at high temperature
+# ------------------------------------------------------------
+run.section("radiation")
+st.subheader("3.4 Cooling Hot Parts – Radiation and Convection Together")
+
+st.markdown(r"""
+The curve in Section 3 uses Newton's law alone. A hot surface also **radiates**, and the radiated flux
+grows with the fourth power of the absolute temperature:
+""")
+st.latex(r"\rho c_p \frac{V}{A} \frac{dT}{dt} = -h (T - T_\infty) - \varepsilon \sigma (T^4 - T_\infty^4)")
+st.markdown(r"""
+Writing the radiation as a coefficient \(h_{rad} = \varepsilon\sigma(T^2 + T_\infty^2)(T + T_\infty)\)
+shows the problem: for a steel surface (\(\varepsilon \approx 0.8\)) it passes a natural-convection
+\(h\) of 10–20 W/m²K at a few hundred °C and reaches about 200 W/m²K at 1200 °C. The time to cool from
+\(T_0\) to a target is computed directly from the integral of \(dT\) over the heat loss, without time
+steps. The part below uses ρ, Cp, h and the initial temperature from Section 3.
+""")
+
+rad1, rad2, rad3 = st.columns(3)
+with rad1:
+    emissivity = st.slider("Emissivity ε", 0.05, 1.0, 0.8, 0.05)
+with rad2:
+    part_va_mm = st.slider("Part V/A (mm)", 1.0, 100.0, 10.0, 1.0)
+with rad3:
+    T_target = st.slider("Target temperature (°C)", 50, 600, 100, 10)
+
+if T_initial <= T_target:
+    st.warning("The initial temperature in Section 3 must be above the target temperature.")
+else:
+    part_L = part_va_mm / 1000.0
+    # Convection only (ε = 0) and convection + radiation in one call
+    eps_pair = np.array([0.0, emissivity])
+    part_curves = cooling.cooling_curve(T_initial, T_target, part_L, rho, Cp, h, eps_pair, T_env)
+    t_target = part_curves.t[:, -1]
+    T_cross = float(cooling.crossover(h, emissivity, T_env))
+
+    fig_r, (ax_r, ax_q) = plt.subplots(1, 2, figsize=(11, 4))
+    ax_r.plot(part_curves.t[0] / 60.0, part_curves.T[0], "--", label="Convection only")
+    ax_r.plot(part_curves.t[1] / 60.0, part_curves.T[1], label="Convection + radiation")
+    ax_r.axhline(T_target, color="gray", linestyle=":", label="Target")
+    ax_r.set_xlabel("Time (min)")
+    ax_r.set_ylabel("Temperature (°C)")
+    ax_r.set_title("Cooling of the Part")
+    ax_r.legend()
+    T_axis = np.linspace(T_env, max(T_initial, 200), 300)
+    ax_q.plot(T_axis, cooling.radiative_h(T_axis, emissivity, T_env), label="Radiation, h_rad")
+    ax_q.axhline(h, color="C1", linestyle="--", label="Convection, h")
+    if np.isfinite(T_cross) and T_cross <= T_axis[-1]:
+        ax_q.axvline(T_cross, color="gray", linestyle=":")
+    ax_q.set_xlabel("Surface temperature (°C)")
+    ax_q.set_ylabel("Heat-transfer coefficient (W/m²K)")
+    ax_q.set_title("Which Mechanism Dominates")
+    ax_q.legend()
+    fig_r.tight_layout()
+    figures.show(fig_r, run)
+
+    crossover_note = (f"Radiation removes more heat than convection above **{T_cross:.0f} °C**."
+                      if np.isfinite(T_cross) else "Convection dominates at every temperature here.")
+    st.markdown(f"""
+- Time to reach {T_target} °C, convection only: **{t_target[0] / 60.0:.1f} min**
+- Time to reach {T_target} °C, convection + radiation: **{t_target[1] / 60.0:.1f} min**
+  ({100.0 * (1.0 - t_target[1] / t_target[0]):.0f} % shorter)
+- {crossover_note}
+""")
+
+    st.markdown("""
+**Cool-down of a mixed load.** For sizing the cool-down of a whole furnace load, the time to target is
+computed for 2,000 part sizes at once; the slowest (thickest) part sets the cool-down time.
+""")
+    load_va_mm = np.geomspace(1.0, 200.0, 2000)
+    load_times = cooling.time_to(T_target, T_initial, load_va_mm[:, None] / 1000.0, rho, Cp, h, eps_pair, T_env)
+
+    fig_l, ax_l = plt.subplots(figsize=(8, 4))
+    ax_l.loglog(load_va_mm, load_times[:, 0] / 3600.0, "--", label="Convection only")
+    ax_l.loglog(load_va_mm, load_times[:, 1] / 3600.0, label="Convection + radiation")
+    ax_l.set_xlabel("Part V/A (mm)")
+    ax_l.set_ylabel(f"Time to {T_target} °C (h)")
+    ax_l.set_title("Cool-down Time against Part Size")
+    ax_l.legend()
+    figures.show(fig_l, run)
 
 # ============================================================
 # 4. SOLVED EXAMPLES
 # ============================================================
+run.section("examples")
 st.header("4. Solved Examples")
 
 # Example 1
@@ -173,32 +436,35 @@ This means **latent heat** is being released during solidification and the mater
 # ============================================================
 # 5. QUIZ
 # ============================================================
+run.section("quiz")
 st.header("5. Quiz")
 
-q1 = st.radio("1) Temperature remains constant during:", 
-              ["Conduction", "Convection", "Radiation", "Solidification of pure metals"])
+q1 = quiz.radio("week8", "q1", "1) Temperature remains constant during:",
+                ["Conduction", "Convection", "Radiation", "Solidification of pure metals"],
+                answer="Solidification of pure metals")
 if q1 == "Solidification of pure metals":
     st.success("Correct!")
-else:
+elif q1 is not None:
     st.error("Incorrect.")
 
-q2 = st.radio("2) Which law describes conduction?", 
-              ["Newton’s law", "Fourier’s law", "Hooke’s law"])
+q2 = quiz.radio("week8", "q2", "2) Which law describes conduction?",
+                ["Newton’s law", "Fourier’s law", "Hooke’s law"], answer="Fourier’s law")
 if q2 == "Fourier’s law":
     st.success("Correct!")
-else:
+elif q2 is not None:
     st.error("Try again.")
 
-q3 = st.radio("3) In Chvorinov’s rule, solidification time increases with:", 
-              ["Surface area", "Volume/Area ratio", "Ambient temperature"])
+q3 = quiz.radio("week8", "q3", "3) In Chvorinov’s rule, solidification time increases with:",
+                ["Surface area", "Volume/Area ratio", "Ambient temperature"], answer="Volume/Area ratio")
 if q3 == "Volume/Area ratio":
     st.success("Correct!")
-else:
+elif q3 is not None:
     st.error("Incorrect.")
 
 # ============================================================
 # 6. SUMMARY
 # ============================================================
+run.section("summary")
 st.header("6. Summary of Week 8")
 
 st.markdown("""
@@ -208,3 +474,5 @@ st.markdown("""
 - Latent heat causes a temperature plateau during the phase change.  
 - Casting quality is strongly influenced by heat flow and cooling rate.  
 """)
+
+run.finish()
@@ -2,6 +2,8 @@ import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
 
+from mse207 import arc, curves, figures, haz, jobs, metrics, models, quiz, streams, weld
+
 # ---------------------------------------------------------
 #   MATERIAL PROCESS LABORATORY – WEEK 9
 #   Topic: Welding and Joining of Metals
@@ -14,6 +16,9 @@ st.set_page_config(
     layout="centered"
 )
 
+run = metrics.start_rerun("week9")
+run.section("intro")
+
 st.title("Material Process Laboratory – Week 9")
 st.subheader("Welding and Joining of Metals")
 
@@ -45,6 +50,7 @@ section = st.sidebar.selectbox(
         "Summary"
     ]
 )
+run.section(section)
 
 # ---------------------------------------------------------
 # 1) LEARNING OUTCOMES & THEORY
@@ -144,7 +150,8 @@ A simple (conceptual) relation is:
 - High heat input → low cooling rate.
 - Low heat input → high cooling rate.
 
-In this app, we will use a **simple model** to visualize the thermal profile near the weld.
+In this app, we will use a **simple model** to visualize the thermal profile near the weld, and the
+**Heat Input Simulation** section predicts the resulting HAZ phase fractions from the cooling path.
         """
     )
 
@@ -218,6 +225,149 @@ We use the relation:
         "You can also compare the effect of doubling welding speed or current."
     )
 
+    st.subheader("Predicted HAZ Grain Size")
+
+    st.markdown(
+        """
+Above Ac3 the steel is austenitic and its grains grow at a thermally activated rate. Integrating
+over the weld thermal cycle at each distance from the centreline gives the final grain size:
+"""
+    )
+    st.latex(r"d^n - d_0^n = \int k_0 \exp\!\left(-\frac{Q_g}{R\,T(t)}\right) dt")
+    st.markdown(
+        f"""
+Illustrative C-Mn steel constants: \\(n = {haz.GRAIN_N:.0f}\\), \\(Q_g = {haz.GRAIN_Q / 1000:.0f}\\) kJ/mol,
+\\(d_0 = {haz.GRAIN_D0:.0f}\\) µm. The thermal cycles use the heat input and plate thickness above.
+        """
+    )
+
+    fig_g, ax_g = plt.subplots(figsize=(8, 4))
+    for factor, style in ((0.5, ":"), (1.0, "-"), (2.0, "--")):
+        grains = models.haz_grain_size(factor * Q_kJ_per_mm, float(plate_thickness_mm))
+        ax_g.plot(grains.y, grains.d, style, label=f"Q = {factor * Q_kJ_per_mm:.2f} kJ/mm")
+    ax_g.axhline(haz.GRAIN_D0, color="gray", linewidth=0.8)
+    ax_g.set_xlabel("Distance from Weld Centreline (mm)")
+    ax_g.set_ylabel("Austenite Grain Size (µm)")
+    ax_g.set_title("HAZ Grain Size after One Pass (fusion zone left blank)")
+    ax_g.legend()
+    ax_g.grid(True)
+    figures.show(fig_g, run)
+
+    current = models.haz_grain_size(Q_kJ_per_mm, float(plate_thickness_mm))
+    i_fusion = np.flatnonzero(np.isfinite(current.d))[0]
+    st.write(
+        f"Grain size at the fusion line: **{current.d[i_fusion]:.0f} µm** "
+        f"({current.d[i_fusion] / haz.GRAIN_D0:.1f}× the base metal), "
+        f"computed over {current.d_t.shape[0]} positions × {current.d_t.shape[1]} time steps."
+    )
+
+    st.subheader("Predicted Coarse-Grain HAZ Microstructure")
+
+    st.markdown(
+        """
+The cooling path through the coarse-grain HAZ (peak 1350 °C) is followed for **thousands of heat inputs**
+at once. Along each path the **Scheil additivity rule** decides when ferrite/pearlite and bainite start,
+**JMAK kinetics** give how much forms, and the remaining austenite becomes **martensite** below Ms
+(illustrative C-Mn steel, same model as the Week 8 quenched bars).
+        """
+    )
+
+    Q_paths = np.linspace(0.2, 4.0, 2000)
+    t85_paths, phases = models.haz_phases(Q_paths, float(plate_thickness_mm))
+
+    fig_ph, ax_ph = plt.subplots(figsize=(8, 4))
+    ax_ph.stackplot(
+        Q_paths, phases.ferrite_pearlite, phases.bainite, phases.martensite, phases.retained,
+        labels=["Ferrite + pearlite", "Bainite", "Martensite", "Retained austenite"],
+    )
+    ax_ph.axvline(Q_kJ_per_mm, color="k", linestyle="--", label="Current Q")
+    ax_ph.set_xlim(Q_paths[0], Q_paths[-1])
+    ax_ph.set_ylim(0, 1)
+    ax_ph.set_xlabel("Heat Input Q (kJ/mm)")
+    ax_ph.set_ylabel("Phase Fraction")
+    ax_ph.set_title(f"Coarse-Grain HAZ Microstructure vs Heat Input (d = {plate_thickness_mm} mm)")
+    ax_ph.legend(loc="center right", fontsize=8)
+    figures.show(fig_ph, run)
+
+    i_Q = np.argmin(np.abs(Q_paths - Q_kJ_per_mm))
+    st.write(
+        f"At Q = {Q_kJ_per_mm:.2f} kJ/mm: t8/5 ≈ **{t85_paths[i_Q]:.1f} s** → "
+        f"{phases.ferrite_pearlite[i_Q]:.0%} ferrite + pearlite, {phases.bainite[i_Q]:.0%} bainite, "
+        f"{phases.martensite[i_Q]:.0%} martensite."
+    )
+
+    st.subheader("Measured Arc Waveform (Pulsed GMAW)")
+
+    st.markdown(
+        """
+For **pulsed** processes, voltage and current rise and fall together, so the arc power is the average
+of the **instantaneous** product, not the product of the averages:
+"""
+    )
+    st.latex(r"Q = \eta \, \frac{\langle V(t)\, I(t) \rangle}{v} \neq \eta \, \frac{\bar V \, \bar I}{v}")
+    st.markdown(
+        """
+Point the app at a logger file (10–50 kHz V/I samples) on the lab server. It is processed in chunks
+with \\(\\eta\\) and travel speed taken from the sliders above, and each arc-on period is reported as a weld segment.
+        """
+    )
+
+    wave_path = st.text_input(
+        "V/I waveform log on the lab server (CSV/TXT, .npy or raw binary)",
+        value="",
+        placeholder="gmaw/pulse_run_12.bin",
+        help=f"Relative to the lab data directory `{streams.DATA_DIR}`.",
+    )
+    with st.expander("Waveform format"):
+        wcol1, wcol2 = st.columns(2)
+        with wcol1:
+            wave_rate = st.number_input("Sample rate (Hz)", 100.0, 1e6, 20000.0, step=1000.0)
+            v_col = st.number_input("Voltage column", 0, 63, 0)
+            i_col = st.number_input("Current column", 0, 63, 1)
+        with wcol2:
+            wave_dtype = st.selectbox("Raw binary sample type", ["<f4", "<f8", "<i2", "<i4"])
+            wave_channels = st.number_input("Raw binary channels per sample", 2, 64, 2)
+            arc_on_current = st.number_input("Arc-on current threshold (A)", 0.0, 500.0, 10.0)
+
+    if wave_path:
+        try:
+            wave_file = streams.data_path(wave_path)
+        except (ValueError, OSError) as exc:
+            st.warning(str(exc))
+        else:
+            try:
+                wave = models.process_waveform(
+                    streams.file_signature(wave_file), wave_rate, (v_col, i_col),
+                    wave_dtype, int(wave_channels),
+                    eta=eta, travel_speed_mm_s=travel_speed_mm_s, arc_on_current=arc_on_current,
+                )
+            except (ValueError, OSError) as exc:
+                st.error(f"Could not read the waveform: {exc}")
+            else:
+                env = arc.decimate(wave.envelope)
+                fig_w, (ax_v, ax_i) = plt.subplots(2, 1, sharex=True, figsize=(8, 5))
+                ax_v.fill_between(env.t, env.V_min, env.V_max, linewidth=0)
+                ax_v.set_ylabel("Voltage (V)")
+                ax_v.set_title("Arc Waveform (min–max envelope)")
+                ax_i.fill_between(env.t, env.I_min, env.I_max, linewidth=0, color="tab:orange")
+                ax_i.set_ylabel("Current (A)")
+                ax_i.set_xlabel("Time (s)")
+                figures.show(fig_w, run)
+
+                Q_const = eta * wave.V_mean * wave.I_mean / (1000.0 * travel_speed_mm_s)
+                st.markdown(
+                    f"""
+- Samples: **{wave.n_samples:,}** ({wave.duration_s:.2f} s), processed at **{wave.msps:.1f} million samples/s**
+- Mean V / I: {wave.V_mean:.2f} V / {wave.I_mean:.1f} A — RMS V / I: {wave.V_rms:.2f} V / {wave.I_rms:.1f} A
+- Instantaneous-power mean: **{wave.P_mean:.0f} W** vs \\(\\bar V \\bar I\\) = {wave.V_mean * wave.I_mean:.0f} W
+- Whole-log \\(\\bar V \\bar I\\) heat input: {Q_const:.4f} kJ/mm
+                    """
+                )
+                if len(wave.segments):
+                    st.dataframe(wave.segments, width="stretch")
+                else:
+                    st.info("No arc-on segment found – check the current column and threshold.")
+
 
 # ---------------------------------------------------------
 # 3) SIMPLE WELD THERMAL PROFILE
@@ -258,21 +408,19 @@ We will link \(\Delta T\) to the **heat input**.
     )
     w = st.slider("Thermal Width Parameter w (mm)", min_value=3.0, max_value=30.0, value=10.0, step=1.0)
 
-    # Relate deltaT to Q: very simple proportional model
-    # For Q = 1 kJ/mm, let ΔT ≈ 1000°C (just a conceptual scale)
-    delta_T = 1000.0 * (Q_kJ_per_mm_input / 1.0)
-
-    x = np.linspace(-40, 40, 400)
-    T = T0 + delta_T * np.exp(-(x / w) ** 2)
+    # ΔT is taken proportional to Q (ΔT ≈ 1000°C for Q = 1 kJ/mm)
+    x, T = curves.gaussian_weld_profile(T0, Q_kJ_per_mm_input, w)
 
-    fig, ax = plt.subplots()
-    ax.plot(x, T)
-    ax.set_xlabel("Distance from Weld Centerline x (mm)")
-    ax.set_ylabel("Temperature (°C)")
-    ax.set_title("Conceptual Weld Thermal Profile")
-    ax.grid(True)
+    def profile_figure():
+        fig, ax = plt.subplots()
+        ax.plot(x, T)
+        ax.set_xlabel("Distance from Weld Centerline x (mm)")
+        ax.set_ylabel("Temperature (°C)")
+        ax.set_title("Conceptual Weld Thermal Profile")
+        ax.grid(True)
+        return fig
 
-    st.pyplot(fig)
+    figures.show_cached("week9_profile_figure", (T0, Q_kJ_per_mm_input, w), profile_figure, run)
 
     st.markdown(
         """
@@ -287,6 +435,168 @@ the temperature field and thus the **HAZ width**.
         """
     )
 
+    st.subheader("2-D Weld Temperature Field (Moving Arc on a Thin Plate)")
+
+    st.markdown(
+        """
+The Gaussian profile above is static. Here the arc **moves** along a thin plate and the transient heat
+equation is solved numerically over the whole plate (explicit finite differences, insulated edges,
+surface losses). A 2 mm grid is solved and drawn **immediately**; finer grids then run **in the
+background** and replace it until successive grids agree within the tolerance or the time budget runs
+out. Change the inputs at any time and the superseded run is cancelled. The heat input \(Q\) and \(T_0\) are taken from
+the sliders above; Rosenthal's quasi-steady thin-plate solution is shown for comparison.
+        """
+    )
+
+    fcol1, fcol2 = st.columns(2)
+    with fcol1:
+        field_speed = st.slider("Travel speed v (mm/s)", 2.0, 15.0, 5.0, step=0.5, key="field_speed")
+        field_thickness = st.slider("Plate thickness (mm)", 2.0, 12.0, 5.0, step=0.5, key="field_thickness")
+    with fcol2:
+        field_tolerance = st.slider("Refinement tolerance (°C)", 5, 100, 25, step=5, key="field_tolerance")
+        field_budget = st.slider("Time budget (s)", 1.0, 30.0, 5.0, step=1.0, key="field_budget")
+
+    field_args = (Q_kJ_per_mm_input, field_speed, field_thickness, float(T0))
+    field_job = jobs.submit(
+        "week9_plate_field", jobs.progressive, weld.moving_source_field, weld.REFINE_LEVELS,
+        weld.field_change, *field_args, start=1, tolerance=float(field_tolerance), budget_s=field_budget,
+    )
+
+    def field_coarse():
+        return jobs.Refined(weld.moving_source_field(*field_args, **weld.REFINE_LEVELS[0]), 0, None, None)
+
+    def show_plate_field(refined):
+        field = refined.result
+        fig_f, (ax_f, ax_l) = plt.subplots(2, 1, figsize=(8, 7))
+        extent = [field.x[0], field.x[-1], field.y[0], field.y[-1]]
+        im = ax_f.imshow(np.minimum(field.T, weld.T_MELT).T, origin="lower", extent=extent,
+                         aspect="equal", cmap="inferno")
+        ax_f.contour(field.x, field.y, field.peak.T, levels=[720, 1100, 1450], colors="cyan", linewidths=0.7)
+        ax_f.set_xlabel("x (mm)")
+        ax_f.set_ylabel("y (mm)")
+        ax_f.set_title("Temperature when the arc stops (°C); cyan: peak 720/1100/1450 °C")
+        fig_f.colorbar(im, ax=ax_f, shrink=0.8)
+
+        j0 = np.argmin(np.abs(field.y))
+        xi = field.x - field.source_x
+        ax_l.plot(xi, np.minimum(field.T[:, j0], weld.T_MELT), label="Finite differences")
+        ax_l.plot(xi, np.minimum(weld.rosenthal_thin(xi, 0.0, Q_kJ_per_mm_input, field_speed,
+                                                     field_thickness, float(T0)), weld.T_MELT),
+                  "--", label="Rosenthal (thin plate)")
+        ax_l.set_xlabel("Distance from the arc along the weld (mm)")
+        ax_l.set_ylabel("Temperature (°C)")
+        ax_l.set_title("Weld Centreline")
+        ax_l.legend()
+        ax_l.grid(True)
+        fig_f.tight_layout()
+        figures.show(fig_f, run)
+        dx = field.x[1] - field.x[0]
+        status = "refining…" if refined.stopped is None else f"stopped: {refined.stopped}"
+        change = "" if refined.change is None else f"; peaks moved {refined.change:.0f} °C from the previous grid"
+        st.caption(f"{dx:g} mm grid, {field.T.size:,} nodes, solved in {field.elapsed_s:.2f} s{change} ({status}).")
+
+    jobs.show(field_job, show_plate_field, label="Refining the grid", fallback=field_coarse)
+
+    st.subheader("Multi-Pass Weld Thermal History")
+
+    st.markdown(
+        """
+Thick sections are filled with **many passes**. Every pass reheats the weld metal and HAZ laid down
+before it, so the final microstructure depends on the whole sequence and on the **interpass temperature**
+(how hot the joint is when the next pass starts).
+
+Each pass is treated as an instantaneous line source in the cross-section; its solution in a plate of
+thickness \\(d\\) (insulated faces plus surface losses) is shifted to the pass start time and all passes are
+**superposed**:
+"""
+    )
+    st.latex(
+        r"T(y, z, t) = T_0 + \sum_i \frac{Q_i}{\rho c}\, g_y(y - y_i, t - t_i)\, g_z(z, z_i, t - t_i)"
+    )
+    st.markdown(
+        """
+The base metal temperature \\(T_0\\) and heat input \\(Q\\) above are used as preheat and heat input per pass.
+        """
+    )
+
+    mcol1, mcol2 = st.columns(2)
+    with mcol1:
+        n_passes = st.slider("Number of passes", min_value=1, max_value=100, value=30, step=1)
+        thickness = st.slider("Plate thickness d (mm)", min_value=10, max_value=60, value=25, step=5)
+    with mcol2:
+        control = st.radio("Next pass starts", ["below interpass limit", "at fixed interval"])
+        if control == "below interpass limit":
+            interpass_max = st.slider("Max interpass temperature (°C)", 100, 350, 250, step=10)
+            interval = None
+        else:
+            interval = st.slider("Time between passes (s)", 30, 900, 180, step=30)
+            interpass_max = None
+
+    multipass_job = jobs.submit(
+        "week9_multipass", models.multipass,
+        n_passes, float(Q_kJ_per_mm_input), float(thickness), float(T0),
+        interpass_max=interpass_max, interval=interval,
+    )
+
+    def show_multipass(hist):
+        # Tracked points at mid-thickness, just outside the groove
+        iz_mid = hist.z.size // 2
+        tracked = [np.argmin(np.abs(hist.y - (np.abs(hist.pass_y).max() + offset))) for offset in (3.0, 6.0, 12.0)]
+
+        fig_c, ax_c = plt.subplots(figsize=(8, 4))
+        for iy in tracked:
+            ax_c.plot(hist.t / 60.0, hist.T[iy, iz_mid], label=f"y = {hist.y[iy]:.0f} mm")
+        for Tc in (800, 500):
+            ax_c.axhline(Tc, color="gray", linestyle=":", linewidth=0.8)
+        ax_c.set_xlabel("Time (min)")
+        ax_c.set_ylabel("Temperature (°C)")
+        ax_c.set_title(f"Thermal Cycles at Mid-Thickness (z = {hist.z[iz_mid]:.1f} mm)")
+        ax_c.legend()
+        ax_c.grid(True)
+        figures.show(fig_c, run)
+
+        fig_m, (ax_p, ax_t) = plt.subplots(2, 1, sharex=True, figsize=(8, 6))
+        extent = [hist.y[0], hist.y[-1], hist.z[-1], hist.z[0]]
+        im_p = ax_p.imshow(hist.peak.T, extent=extent, aspect="auto", cmap="inferno")
+        ax_p.contour(hist.y, hist.z, hist.peak.T, levels=[720, 900, 1100, 1450], colors="white", linewidths=0.7)
+        ax_p.plot(hist.pass_y, hist.pass_z, "c.", markersize=4)
+        ax_p.set_ylabel("Depth z (mm)")
+        ax_p.set_title("Peak Temperature (°C) – contours at 720/900/1100/1450 °C")
+        fig_m.colorbar(im_p, ax=ax_p)
+        im_t = ax_t.imshow(hist.t85.T, extent=extent, aspect="auto", cmap="viridis")
+        ax_t.set_xlabel("Distance from Weld Centerline y (mm)")
+        ax_t.set_ylabel("Depth z (mm)")
+        ax_t.set_title("Final t8/5 (s)")
+        fig_m.colorbar(im_t, ax=ax_t)
+        figures.show(fig_m, run)
+
+        iy0 = np.argmin(np.abs(hist.y))
+        interpass = hist.interpass[iy0, 0, 1:]
+        dwell = np.diff(hist.pass_t)
+        t85_tracked = ", ".join(
+            f"{hist.t85[iy, iz_mid]:.1f} s" if np.isfinite(hist.t85[iy, iz_mid]) else "below 800 °C"
+            for iy in tracked
+        )
+        if hist.pass_t.size > 1:
+            st.markdown(
+                f"""
+- Monitoring grid: **{hist.peak.size:,} points × {hist.t.size:,} times**
+- Interpass temperature at the weld top: **{interpass.min():.0f}–{interpass.max():.0f} °C**
+- Time between passes: {dwell.min():.0f}–{dwell.max():.0f} s (total welding time {hist.pass_t[-1] / 60.0:.0f} min)
+- Final t8/5 at the tracked points: {t85_tracked}
+                """
+            )
+
+    jobs.show(multipass_job, show_multipass, label="Superposing the passes")
+
+    st.markdown(
+        """
+**Observe:** with a fixed interval the joint heats up pass after pass, so later passes see higher interpass
+temperatures and longer t8/5 (softer, coarser HAZ). An interpass limit holds the starting temperature
+constant at the cost of longer waiting times.
+        """
+    )
+
 
 # ---------------------------------------------------------
 # 4) SOLVED EXAMPLES
@@ -498,6 +808,50 @@ Let:
             """
         )
 
+        st.markdown(
+            """
+**Going further – zone widths from peak temperatures:**
+The √Q rule holds only for thick plates. Below, the peak temperature of a line source in a plate of
+thickness \\(d\\) is computed for a whole sweep of heat inputs, and the boundaries where it falls to
+\\(T_m\\) (fusion), 1100 °C (coarse-grain HAZ), Ac3 ≈ 900 °C (fine-grain HAZ) and Ac1 ≈ 720 °C
+(intercritical HAZ) are located for every heat input at once.
+            """
+        )
+
+        hcol1, hcol2 = st.columns(2)
+        with hcol1:
+            haz_thickness = st.slider("Plate thickness d (mm)", 3, 60, 10, step=1, key="haz_thickness")
+        with hcol2:
+            haz_T0 = st.slider("Preheat T₀ (°C)", 20, 300, 25, step=5, key="haz_T0")
+
+        Q_sweep = np.linspace(0.2, 4.0, 4000)
+        zones = models.zone_boundaries(Q_sweep, float(haz_T0), float(haz_thickness))
+
+        fig_z, ax_z = plt.subplots(figsize=(8, 4))
+        ax_z.plot(Q_sweep, zones.fusion, label="Fusion zone (half-width)")
+        ax_z.plot(Q_sweep, zones.cghaz, label="Coarse-grain HAZ")
+        ax_z.plot(Q_sweep, zones.fghaz, label="Fine-grain HAZ")
+        ax_z.plot(Q_sweep, zones.ichaz, label="Intercritical HAZ")
+        ax_z.plot(Q_sweep, zones.haz, "k", linewidth=2, label="Total HAZ")
+        i_ref = np.argmin(np.abs(Q_sweep - 0.5))
+        ax_z.plot(Q_sweep, zones.haz[i_ref] * np.sqrt(Q_sweep / Q_sweep[i_ref]), "k--",
+                  linewidth=1, label="√Q rule through Q = 0.5 kJ/mm")
+        ax_z.set_xlabel("Heat Input Q (kJ/mm)")
+        ax_z.set_ylabel("Width (mm)")
+        ax_z.set_title(f"HAZ Zone Widths vs Heat Input ({Q_sweep.size:,} heat inputs, d = {haz_thickness} mm)")
+        ax_z.legend(fontsize=8)
+        ax_z.grid(True)
+        figures.show(fig_z, run)
+
+        i_1 = np.argmin(np.abs(Q_sweep - 1.0))
+        st.markdown(
+            f"""
+For this plate the total HAZ grows from **{zones.haz[i_ref]:.2f} mm** at 0.5 kJ/mm to
+**{zones.haz[i_1]:.2f} mm** at 1.0 kJ/mm (ratio {zones.haz[i_1] / zones.haz[i_ref]:.2f}; the √Q rule gives 1.41).
+In thin plates heat can only spread sideways, so widths grow closer to **∝ Q** than ∝ √Q.
+            """
+        )
+
     elif example == "Example 5 – Process Selection":
         st.subheader("Example 5 – Process Selection for Thin Sheet")
 
@@ -547,7 +901,8 @@ If you **increase travel speed** while keeping voltage and current constant, wha
 Choose the best answer.
         """
     )
-    q1 = st.radio(
+    q1 = quiz.radio(
+        "week9", "q1",
         "Heat input trend:",
         [
             "Heat input increases.",
@@ -555,7 +910,7 @@ Choose the best answer.
             "Heat input stays the same.",
             "Heat input first increases then decreases."
         ],
-        index=1
+        answer="Heat input decreases."
     )
 
     if q1:
@@ -571,7 +926,8 @@ Choose the best answer.
 Which region in a weldment experiences temperatures high enough to **change microstructure** but **does not melt**?
         """
     )
-    q2 = st.radio(
+    q2 = quiz.radio(
+        "week9", "q2",
         "Select region:",
         [
             "Fusion Zone (FZ)",
@@ -579,7 +935,7 @@ Which region in a weldment experiences temperatures high enough to **change micr
             "Base Metal (BM)",
             "Filler Metal Only"
         ],
-        index=1
+        answer="Heat-Affected Zone (HAZ)"
     )
 
     if q2:
@@ -595,7 +951,8 @@ Which region in a weldment experiences temperatures high enough to **change micr
 Which process generally gives **best control of heat input** and is suitable for **high-quality thin sheet welding**?
         """
     )
-    q3 = st.radio(
+    q3 = quiz.radio(
+        "week9", "q3",
         "Select process:",
         [
             "Shielded Metal Arc Welding (SMAW)",
@@ -603,7 +960,7 @@ Which process generally gives **best control of heat input** and is suitable for
             "Submerged Arc Welding (SAW)",
             "Resistance Spot Welding (RSW)"
         ],
-        index=1
+        answer="Gas Tungsten Arc Welding (GTAW / TIG)"
     )
 
     if q3:
@@ -653,3 +1010,5 @@ Students are encouraged to:
         "You can extend this app by adding your own examples, more realistic thermal models, "
         "or links to experimental data from the laboratory."
     )
+
+run.finish()
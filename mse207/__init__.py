@@ -0,0 +1 @@
+"""Shared helpers for the MSE207 Material Processing Laboratory apps."""
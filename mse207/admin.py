@@ -0,0 +1,50 @@
+"""Access check for the instructor pages.
+
+The quiz analytics and session statistics pages show answers and other
+students' sessions, so they are not listed in the student navigation.
+Quiz analytics is served by the separate instructor app
+``app_mse207_admin.py``.  Session statistics must run in the process whose
+sessions it reports, so ``app_mse207.py`` serves it as a hidden page.
+Each page calls :func:`require` so that it refuses to render without the
+password.
+
+The password comes from ``st.secrets["admin_password"]`` or, failing that,
+the ``MSE207_ADMIN_PASSWORD`` environment variable.  With neither set the
+instructor pages are disabled.  A correct password unlocks the pages for
+the rest of the browser session.
+"""
+
+import hmac
+import os
+
+_STATE_KEY = "_mse207_admin"
+
+
+def password():
+    """The configured admin password, or None if the instructor pages are disabled."""
+    import streamlit as st
+
+    try:
+        secret = st.secrets.get("admin_password")
+    except Exception:   # no secrets.toml
+        secret = None
+    return secret or os.environ.get("MSE207_ADMIN_PASSWORD") or None
+
+
+def require():
+    """Stop the page unless this session has entered the admin password."""
+    import streamlit as st
+
+    if st.session_state.get(_STATE_KEY):
+        return
+    expected = password()
+    if expected is None:
+        st.error("Instructor pages are disabled: set MSE207_ADMIN_PASSWORD or `admin_password` in the secrets.")
+        st.stop()
+    entered = st.text_input("Instructor password", type="password")
+    if entered and hmac.compare_digest(entered.encode("utf-8"), expected.encode("utf-8")):
+        st.session_state[_STATE_KEY] = True
+        st.rerun()
+    if entered:
+        st.error("Wrong password.")
+    st.stop()
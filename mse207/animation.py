@@ -0,0 +1,171 @@
+"""Diffusion profiles animated in the browser from one batch of frames.
+
+Dragging the time slider reruns the page and renders a new figure for every
+step.  Here the profiles at all frame times are computed in one broadcast
+call (time × depth) instead.  They are quantised to 16-bit integers over the
+concentration range and sent once, base64-encoded, at about 2 bytes per
+point: 120 frames of 200 points are under 70 kB, about one rendered PNG.
+A small script in the iframe decodes them and draws each frame
+on a canvas, so playing and scrubbing cost the server nothing.
+"""
+
+import base64
+import json
+from collections import namedtuple
+
+import numpy as np
+from scipy.special import erf
+
+from mse207 import curves
+
+Frames = namedtuple("Frames", "x t lo hi data")     # mm, h, wt.%, wt.%, base64 of uint16 rows
+
+_LEVELS = 65535
+
+
+def encode(C, lo, hi):
+    """Base64 of ``C`` quantised to uint16 over ``[lo, hi]`` (little-endian, row-major)."""
+    scale = _LEVELS / (hi - lo) if hi > lo else 0.0
+    q = np.rint((np.clip(C, lo, hi) - lo) * scale).astype("<u2")
+    return base64.b64encode(q.tobytes()).decode("ascii")
+
+
+def decode(frames):
+    """Frames back as a float array ``(len(t), len(x))``; what the browser does."""
+    q = np.frombuffer(base64.b64decode(frames.data), dtype="<u2").reshape(len(frames.t), len(frames.x))
+    return frames.lo + q * ((frames.hi - frames.lo) / _LEVELS)
+
+
+def profile_frames(C0, Cs, D, t_end, max_depth_mm, beta=None, n_frames=120, n_x=200):
+    """Profiles ``C(x, t)`` of Simulation 2 from ``t_end / n_frames`` to ``t_end`` (s).
+
+    A fixed surface concentration gives the error function; ``beta`` (m/s)
+    switches to surface mass transfer (:func:`mse207.curves.robin_concentration`).
+    """
+    x = np.linspace(0.0, max_depth_mm / 1000.0, n_x)
+    t = np.linspace(t_end / n_frames, t_end, n_frames)
+    if beta is None:
+        C = Cs - (Cs - C0) * erf(x[None, :] / (2.0 * np.sqrt(D * t[:, None])))
+    else:
+        C = curves.robin_concentration(x[None, :], t[:, None], C0, Cs, D, beta)
+    lo, hi = float(min(C0, Cs)), float(max(C0, Cs))
+    return Frames(x=x * 1000.0, t=t / 3600.0, lo=lo, hi=hi, data=encode(C, lo, hi))
+
+
+def player_html(frames, x_label, y_label, level=None, level_label="", fps=24, height=360):
+    """HTML of a canvas player for ``frames`` with play, pause and a scrubber.
+
+    ``level`` draws a dashed horizontal reference line (e.g. the carbon potential).
+    """
+    meta = json.dumps({
+        "x": np.round(frames.x, 6).tolist(), "t": np.round(frames.t, 6).tolist(),
+        "lo": frames.lo, "hi": frames.hi, "levels": _LEVELS, "fps": fps,
+        "xLabel": x_label, "yLabel": y_label, "level": level, "levelLabel": level_label,
+    })
+    return _PLAYER.replace("__META__", meta).replace("__DATA__", frames.data).replace("__HEIGHT__", str(height))
+
+
+_PLAYER = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><style>
+  body { margin: 0; font: 13px "Source Sans Pro", sans-serif; color: #31333f; }
+  canvas { width: 100%; height: __HEIGHT__px; display: block; }
+  .bar { display: flex; align-items: center; gap: 10px; padding: 4px 8px; }
+  .bar input[type=range] { flex: 1; }
+  button { min-width: 64px; padding: 3px 10px; border: 1px solid #ccc; border-radius: 6px; background: #fff; }
+  .time { min-width: 90px; font-variant-numeric: tabular-nums; }
+</style></head><body>
+<canvas id="plot"></canvas>
+<div class="bar">
+  <button id="play">Play</button>
+  <input id="scrub" type="range" min="0" value="0" step="1">
+  <span class="time" id="time"></span>
+  <select id="speed"><option value="0.5">0.5×</option><option value="1" selected>1×</option>
+    <option value="2">2×</option><option value="4">4×</option></select>
+</div>
+<script>
+const META = __META__;
+const raw = atob("__DATA__");
+const bytes = new Uint8Array(raw.length);
+for (let i = 0; i < raw.length; i++) bytes[i] = raw.charCodeAt(i);
+const q = new Uint16Array(bytes.buffer);
+const nx = META.x.length, nt = META.t.length, span = (META.hi - META.lo) || 1;
+const value = (k, i) => META.lo + q[k * nx + i] * (META.hi - META.lo) / META.levels;
+
+const canvas = document.getElementById("plot"), ctx = canvas.getContext("2d");
+const scrub = document.getElementById("scrub"), label = document.getElementById("time");
+const play = document.getElementById("play"), speed = document.getElementById("speed");
+scrub.max = nt - 1;
+let frame = nt - 1, playing = false, last = 0, carry = 0;
+
+function ticks(lo, hi, n) {
+  const raw = (hi - lo) / n, mag = Math.pow(10, Math.floor(Math.log10(raw)));
+  const step = [1, 2, 2.5, 5, 10].map(m => m * mag).find(s => s >= raw);
+  const out = [];
+  for (let v = Math.ceil(lo / step) * step; v <= hi + 1e-9 * step; v += step) out.push(+v.toFixed(10));
+  return out;
+}
+
+function draw() {
+  const dpr = window.devicePixelRatio || 1, w = canvas.clientWidth, h = canvas.clientHeight;
+  canvas.width = w * dpr; canvas.height = h * dpr; ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+  ctx.clearRect(0, 0, w, h);
+  const pad = {l: 60, r: 16, t: 12, b: 42}, pw = w - pad.l - pad.r, ph = h - pad.t - pad.b;
+  const y0 = META.lo - 0.05 * span, y1 = META.hi + 0.05 * span, xmax = META.x[nx - 1];
+  const X = v => pad.l + pw * v / xmax, Y = v => pad.t + ph * (1 - (v - y0) / (y1 - y0));
+
+  ctx.strokeStyle = "#ddd"; ctx.fillStyle = "#31333f"; ctx.lineWidth = 1; ctx.font = "12px sans-serif";
+  ctx.textAlign = "center"; ctx.textBaseline = "top";
+  for (const v of ticks(0, xmax, 6)) {
+    ctx.beginPath(); ctx.moveTo(X(v), pad.t); ctx.lineTo(X(v), pad.t + ph); ctx.stroke();
+    ctx.fillText(v, X(v), pad.t + ph + 4);
+  }
+  ctx.textAlign = "right"; ctx.textBaseline = "middle";
+  for (const v of ticks(y0, y1, 5)) {
+    ctx.beginPath(); ctx.moveTo(pad.l, Y(v)); ctx.lineTo(pad.l + pw, Y(v)); ctx.stroke();
+    ctx.fillText(v, pad.l - 6, Y(v));
+  }
+  ctx.strokeStyle = "#31333f"; ctx.strokeRect(pad.l, pad.t, pw, ph);
+  ctx.textAlign = "center"; ctx.textBaseline = "bottom"; ctx.fillText(META.xLabel, pad.l + pw / 2, h - 2);
+  ctx.save(); ctx.translate(14, pad.t + ph / 2); ctx.rotate(-Math.PI / 2); ctx.textBaseline = "middle";
+  ctx.fillText(META.yLabel, 0, 0); ctx.restore();
+
+  if (META.level !== null) {
+    ctx.strokeStyle = "#888"; ctx.setLineDash([6, 4]); ctx.beginPath();
+    ctx.moveTo(pad.l, Y(META.level)); ctx.lineTo(pad.l + pw, Y(META.level)); ctx.stroke(); ctx.setLineDash([]);
+    ctx.textAlign = "right"; ctx.textBaseline = "bottom"; ctx.fillStyle = "#888";
+    ctx.fillText(META.levelLabel, pad.l + pw - 4, Y(META.level) - 2);
+  }
+  ctx.strokeStyle = "#1f77b4"; ctx.lineWidth = 2; ctx.beginPath();
+  for (let i = 0; i < nx; i++) {
+    const px = X(META.x[i]), py = Y(value(frame, i));
+    i ? ctx.lineTo(px, py) : ctx.moveTo(px, py);
+  }
+  ctx.stroke();
+  scrub.value = frame;
+  label.textContent = "t = " + META.t[frame].toFixed(2) + " h";
+}
+
+function tick(now) {
+  if (!playing) return;
+  carry += (now - last) / 1000 * META.fps * parseFloat(speed.value); last = now;
+  const steps = Math.floor(carry); carry -= steps;
+  if (steps) {
+    frame = frame + steps;
+    if (frame >= nt - 1) { frame = nt - 1; playing = false; play.textContent = "Play"; }
+    draw();
+  }
+  if (playing) requestAnimationFrame(tick);
+}
+
+play.onclick = () => {
+  playing = !playing; play.textContent = playing ? "Pause" : "Play";
+  if (playing) {
+    if (frame >= nt - 1) { frame = 0; draw(); }
+    last = performance.now(); carry = 0; requestAnimationFrame(tick);
+  }
+};
+scrub.oninput = () => { frame = +scrub.value; draw(); };
+window.addEventListener("resize", draw);
+draw();
+</script></body></html>
+"""
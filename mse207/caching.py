@@ -0,0 +1,62 @@
+"""Process-wide result caches shared by all week pages.
+
+``cached`` wraps ``st.cache_data`` so every page served by one process
+(see ``app_mse207.py``) reuses the same entries, and reports hits and misses
+to :mod:`mse207.metrics` under the given cache name.  With ``persist=True``
+a miss is looked up in :mod:`mse207.diskcache` before computing, so other
+workers and restarts share the result; edits of the code start new disk
+entries (see :mod:`mse207.diskcache`).
+
+Every cache keeps at most ``max_entries`` results for at most ``ttl``
+seconds, so the inputs students try do not pile up in memory until the
+process restarts.  Pass ``max_entries`` to tighten the limit for caches
+with large results.  Build the wrappers once at import time (see
+:mod:`mse207.models`), not in a page script.
+
+Configuration (environment variables):
+
+    MSE207_CACHE_ENTRIES       default entries kept per cache (default 32)
+    MSE207_CACHE_TTL_MINUTES   default lifetime of an entry in memory (default 60)
+"""
+
+import functools
+import os
+import threading
+
+import streamlit as st
+
+from mse207 import diskcache, metrics
+
+MAX_ENTRIES = int(os.environ.get("MSE207_CACHE_ENTRIES", "32"))
+TTL_SECONDS = float(os.environ.get("MSE207_CACHE_TTL_MINUTES", "60")) * 60.0
+
+
+def cached(name, persist=False, version=1, **cache_kwargs):
+    """Decorator: memoise ``fn`` in ``st.cache_data`` and count hits as ``name``."""
+    cache_kwargs.setdefault("max_entries", MAX_ENTRIES)
+    cache_kwargs.setdefault("ttl", TTL_SECONDS)
+
+    def decorate(fn):
+        state = threading.local()
+
+        @functools.wraps(fn)
+        def compute(*args, **kwargs):
+            # Only runs on a miss; st.cache_data skips it on a hit.
+            state.miss = True
+            if persist:
+                return diskcache.call(name, version, fn, args, kwargs)
+            return fn(*args, **kwargs)
+
+        cached_fn = st.cache_data(show_spinner=False, **cache_kwargs)(compute)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            state.miss = False
+            result = cached_fn(*args, **kwargs)
+            metrics.cache_lookup(name, hit=not state.miss)
+            return result
+
+        wrapper.clear = cached_fn.clear
+        return wrapper
+
+    return decorate
@@ -0,0 +1,126 @@
+"""Lumped cooling of hot parts by convection and radiation together.
+
+A part of volume-to-surface ratio ``L = V/A`` loses heat from its whole
+surface to surroundings at ``T_env``:
+
+    rho cp L dT/dt = -h (T - T_env) - eps sigma (T⁴ - T_env⁴)      (kelvin)
+
+Above about 600 °C the radiation term outgrows any natural-convection ``h``,
+so Newton's law alone predicts far too slow a cool-down.  Writing the
+radiation as a temperature-dependent coefficient
+
+    h_rad(T) = eps sigma (T² + T_env²)(T + T_env)
+
+and changing variable to ``s = ln(T - T_env)`` gives the time between two
+temperatures as the integral of a smooth, bounded function:
+
+    t = rho cp L ∫ ds / (h + h_rad(T(s)))
+
+:func:`time_to` evaluates it with composite Gauss–Legendre quadrature.  This
+is the event time at which a part reaches a target, with no time stepping
+and no step-size limit.  :func:`cooling_curve` samples the same integral
+level by level, and :func:`temperature_at` inverts it by Newton's method.
+All parameters broadcast, so a whole load of parts (sizes, emissivities,
+start temperatures) is one call.  Temperatures are in °C, lengths in m.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from mse207.numerics import bisect
+
+SIGMA = 5.670374419e-8      # Stefan–Boltzmann constant, W/m²K⁴
+KELVIN = 273.15
+
+CoolingCurve = namedtuple("CoolingCurve", "t T")
+
+_NODES, _WEIGHTS = np.polynomial.legendre.leggauss(8)
+_PANELS = 12
+
+
+def radiative_h(T, emissivity, T_env=25.0):
+    """Radiative heat-transfer coefficient (W/m²K) of a surface at ``T``."""
+    T_K, T_env_K = np.asarray(T, dtype=np.float64) + KELVIN, np.asarray(T_env, dtype=np.float64) + KELVIN
+    return emissivity * SIGMA * (T_K ** 2 + T_env_K ** 2) * (T_K + T_env_K)
+
+
+def heat_flux(T, h, emissivity, T_env=25.0):
+    """Convective and radiative heat flux (W/m²) leaving a surface at ``T``."""
+    return (h + radiative_h(T, emissivity, T_env)) * (np.asarray(T, dtype=np.float64) - T_env)
+
+
+def crossover(h, emissivity, T_env=25.0):
+    """Surface temperature (°C) above which radiation removes more heat than convection.
+
+    Solves ``h_rad(T) = h`` (NaN if radiation never catches up below 3000 °C).
+    """
+    h, emissivity, T_env = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (h, emissivity, T_env)))
+    T = bisect(lambda T: h - radiative_h(T, emissivity, T_env), T_env, np.full(h.shape, 3000.0))
+    return np.where(radiative_h(3000.0, emissivity, T_env) >= h, T, np.nan)
+
+
+# ============================================================
+# TIME BETWEEN TEMPERATURES
+# ============================================================
+def _integral(s_lo, s_hi, h, emissivity, T_env, panels=_PANELS):
+    """``∫ ds / (h + h_rad)`` over ``[s_lo, s_hi]`` by ``panels`` Gauss–Legendre panels."""
+    s_lo, s_hi, h, emissivity, T_env = (np.asarray(v, dtype=np.float64)[..., None, None]
+                                        for v in (s_lo, s_hi, h, emissivity, T_env))
+    width = (s_hi - s_lo) / panels
+    edge = s_lo + width * np.arange(panels)[:, None]
+    s = edge + 0.5 * width * (_NODES + 1.0)
+    integrand = 1.0 / (h + radiative_h(T_env + np.exp(s), emissivity, T_env))
+    return (0.5 * width[..., 0] * (integrand @ _WEIGHTS)).sum(axis=-1)
+
+
+def time_to(T_target, T0, L, rho, cp, h, emissivity, T_env=25.0):
+    """Time (s) for a part starting at ``T0`` to cool to ``T_target``.
+
+    0 when the part starts at or below the target; infinite when the target
+    is at or below ``T_env``.
+    """
+    T_target, T0 = np.asarray(T_target, dtype=np.float64), np.asarray(T0, dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        s_target = np.log(np.maximum(T_target - T_env, 1e-300))
+        s0 = np.log(np.maximum(T0 - T_env, 1e-300))
+    t = rho * cp * L * _integral(np.minimum(s_target, s0), s0, h, emissivity, T_env)
+    return np.where(T_target <= T_env, np.inf, np.where(T_target >= T0, 0.0, t))
+
+
+def cooling_curve(T0, T_end, L, rho, cp, h, emissivity, T_env=25.0, n=200):
+    """Temperature history from ``T0`` down to ``T_end`` (> ``T_env``) at ``n`` levels.
+
+    The levels are spaced evenly in ``ln(T - T_env)``, which spaces them
+    roughly evenly in time; returns :class:`CoolingCurve` with ``t`` and
+    ``T`` of shape ``(..., n)``.
+    """
+    T0, T_end, L, rho, cp, h, emissivity, T_env = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (T0, T_end, L, rho, cp, h, emissivity, T_env)))
+    s = np.linspace(np.log(T0 - T_env), np.log(T_end - T_env), n, axis=-1)
+    L, rho, cp, h, emissivity, T_env = (v[..., None] for v in (L, rho, cp, h, emissivity, T_env))
+    # Panel by panel between successive levels, then accumulated
+    steps = rho * cp * L * _integral(s[..., 1:], s[..., :-1], h, emissivity, T_env, panels=1)
+    t = np.concatenate([np.zeros(steps.shape[:-1] + (1,)), np.cumsum(steps, axis=-1)], axis=-1)
+    return CoolingCurve(t=t, T=T_env + np.exp(s))
+
+
+def temperature_at(t, T0, L, rho, cp, h, emissivity, T_env=25.0, iterations=30):
+    """Temperature (°C) of a part ``t`` seconds after it starts cooling from ``T0``.
+
+    Newton's method on ``time_to``.  The time is convex and decreasing in
+    ``s = ln(T - T_env)``, and the start assumes the fastest (initial)
+    cooling coefficient throughout, so the iterates rise monotonically to
+    the root.
+    """
+    t, T0 = np.asarray(t, dtype=np.float64), np.asarray(T0, dtype=np.float64)
+    capacity = rho * cp * L
+    s0 = np.log(T0 - T_env)
+    s = s0 - t * (h + radiative_h(T0, emissivity, T_env)) / capacity
+    for _ in range(iterations):
+        elapsed = capacity * _integral(s, s0, h, emissivity, T_env)
+        step = (elapsed - t) * (h + radiative_h(T_env + np.exp(s), emissivity, T_env)) / capacity
+        s = np.minimum(s + step, s0)
+        if np.all(np.abs(step) < 1e-12):
+            break
+    return T_env + np.exp(s)
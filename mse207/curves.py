@@ -0,0 +1,192 @@
+"""Closed-form curves plotted by the week pages, cached process-wide.
+
+Curves are sampled by :func:`mse207.sampling.adaptive` to a tolerance ``tol``
+relative to their span, over the part of the axis where they actually vary,
+and persisted in :mod:`mse207.diskcache` for the other server workers.
+"""
+
+import numpy as np
+from scipy.special import erf, erfc, erfcinv, erfcx
+
+from mse207 import sampling
+from mse207.caching import cached
+
+R_GAS = 8.314  # J/mol·K
+TOL = 1e-4
+
+
+# ============================================================
+# WEEK 8 – COOLING CURVE
+# ============================================================
+@cached("week8_cooling_curve", persist=True)
+def newton_cooling_curve(T_initial, T_melt, rho, Cp, h, T_env=25.0, tol=TOL):
+    """Newtonian cooling curve with the artificial solidification plateau."""
+    # Simple Newtonian cooling model
+    rate = h / (rho * Cp)
+
+    def newton(t):
+        return T_env + (T_initial - T_env) * np.exp(-rate * t)
+
+    # Artificial solidification plateau from 200 s to 350 s of the 600 s axis;
+    # beyond ln(1/tol) time constants the curve is flat at T_env
+    settled = (0.0, np.log(1.0 / tol) / rate)
+    t1, T1 = sampling.adaptive(newton, 0.0, 200.0, tol, support=settled)
+    t3, T3 = sampling.adaptive(newton, 350.0, 600.0, tol, support=settled)
+    t = np.concatenate((t1, [200.0, 350.0], t3))
+    T = np.concatenate((T1, [T_melt, T_melt], T3))
+    return t, T
+
+
+# ============================================================
+# WEEK 9 – WELD THERMAL PROFILE
+# ============================================================
+@cached("week9_weld_profile", persist=True)
+def gaussian_weld_profile(T0, Q_kJ_per_mm, w, tol=TOL):
+    """Conceptual Gaussian temperature profile across the weld."""
+    # Relate deltaT to Q: very simple proportional model
+    # For Q = 1 kJ/mm, let ΔT ≈ 1000°C (just a conceptual scale)
+    delta_T = 1000.0 * (Q_kJ_per_mm / 1.0)
+
+    # Beyond w sqrt(ln(1/tol)) the rise is below tol of its peak
+    reach = w * np.sqrt(np.log(1.0 / tol))
+    return sampling.adaptive(lambda x: T0 + delta_T * np.exp(-(x / w) ** 2), -40.0, 40.0, tol,
+                             support=(-reach, reach))
+
+
+# ============================================================
+# WEEK 10 – DIFFUSION
+# ============================================================
+@cached("week10_arrhenius", persist=True)
+def arrhenius_curve(D0, Q, T_min_C, T_max_C, tol=TOL):
+    """D(T) = D0 exp(-Q/RT) over a temperature range given in °C.
+
+    Sampled for a log axis: ``tol`` applies to ``log10 D``.
+    """
+    return sampling.adaptive(lambda T_K: D0 * np.exp(-Q / (R_GAS * T_K)),
+                             T_min_C + 273.15, T_max_C + 273.15, tol, log=True)
+
+
+@cached("week10_erf_profile", persist=True)
+def erf_profile(C0, Cs, D, t, max_depth_mm, tol=TOL):
+    """Constant-surface-concentration profile C(x, t) in a semi-infinite solid."""
+    # Depth axis (m)
+    max_depth = max_depth_mm / 1000.0
+    if not (D > 0 and t > 0):
+        x_m = np.array([0.0, max_depth])
+        return x_m, np.full_like(x_m, C0)
+
+    # Error function solution: C(x,t) = Cs - (Cs - C0)*erf(x / (2 sqrt(D t)))
+    # Beyond the depth where erfc(z) = tol the profile is flat at C0
+    length = 2.0 * np.sqrt(D * t)
+    return sampling.adaptive(lambda x_m: Cs - (Cs - C0) * erf(x_m / length), 0.0, max_depth, tol,
+                             support=(0.0, length * erfcinv(tol)))
+
+
+def robin_concentration(x, t, C0, Cs, D, beta):
+    """C(x, t) with surface mass transfer ``-D dC/dx = beta (Cs - C)`` at ``x = 0``.
+
+    ``Cs`` is the carbon potential of the atmosphere and ``beta`` (m/s) the
+    mass-transfer coefficient.  With ``h = beta / D`` and ``z = x / 2 sqrt(D t)``
+    (Crank, §3.5)::
+
+        (C - C0) / (Cs - C0) = erfc(z) - exp(h x + h² D t) erfc(z + h sqrt(D t))
+
+    The second term overflows for large ``h sqrt(D t)`` when evaluated as
+    written; it equals ``exp(-z²) erfcx(z + h sqrt(D t))``, which does not.
+    ``x`` and ``t`` broadcast (e.g. a depth column against a time row).
+    """
+    root_Dt = np.sqrt(D * np.asarray(t, dtype=np.float64))
+    z = np.asarray(x, dtype=np.float64) / (2.0 * root_Dt)
+    fraction = erfc(z) - np.exp(-z ** 2) * erfcx(z + beta / D * root_Dt)
+    return C0 + (Cs - C0) * fraction
+
+
+@cached("week10_robin_profile", persist=True)
+def robin_profile(C0, Cs, D, t, beta, max_depth_mm, tol=TOL):
+    """Profile C(x, t) under surface mass transfer, sampled like :func:`erf_profile`."""
+    max_depth = max_depth_mm / 1000.0
+    if not (D > 0 and t > 0 and beta > 0):
+        x_m = np.array([0.0, max_depth])
+        return x_m, np.full_like(x_m, C0)
+
+    # The profile lies below the fixed-surface one, so it is flat beyond the
+    # depth where erfc(z) falls to tol of its own surface rise
+    surface_rise = 1.0 - erfcx(beta / D * np.sqrt(D * t))
+    length = 2.0 * np.sqrt(D * t)
+    return sampling.adaptive(lambda x_m: robin_concentration(x_m, t, C0, Cs, D, beta), 0.0, max_depth, tol,
+                             support=(0.0, length * erfcinv(tol * surface_rise)))
+
+
+def slab_terms(t, D, half_thickness, tol=TOL):
+    """Terms the image and the Fourier series of :func:`slab_concentration` need for ``tol``.
+
+    Both series have terms of alternating sign or geometric decay, so the
+    first omitted term bounds the error.  The image series needs more terms
+    as ``D t`` grows and the Fourier series fewer; returns ``(image, fourier)``.
+    """
+    Dt = D * np.asarray(t, dtype=np.float64)
+    with np.errstate(divide="ignore"):
+        # Image pairs n >= N are below 2 erfc(N l / sqrt(D t)) anywhere in the slab
+        image = np.maximum(1.0, np.ceil(np.sqrt(Dt) * erfcinv(0.5 * tol) / half_thickness))
+        # Fourier terms fall at least by exp(-8 tau) each, so the tail after
+        # N terms is below (4/pi) exp(-(2N+1)² tau) / (1 - exp(-8 tau))
+        tau = np.pi ** 2 * Dt / (4.0 * half_thickness ** 2)
+        odd = np.sqrt(np.log(4.0 / (np.pi * tol * -np.expm1(-8.0 * tau))) / tau)
+    # D t = 0 needs infinitely many Fourier terms; cap it for the integer count
+    fourier = np.clip(np.nan_to_num(np.ceil(0.5 * (odd - 1.0)), nan=np.inf), 1.0, 2.0 ** 31)
+    return image.astype(np.int64), fourier.astype(np.int64)
+
+
+def _slab_image(xc, Dt, half_thickness, terms):
+    """Sum of images, ``(C - C0) / (Cs - C0)``; ``xc`` is measured from the centre."""
+    n = np.arange(terms)
+    sign = (-1.0) ** n
+    edge = (2 * n + 1) * half_thickness
+    root = 2.0 * np.sqrt(Dt)[:, None]
+    return (sign * (erfc((edge - xc[:, None]) / root) + erfc((edge + xc[:, None]) / root))).sum(axis=1)
+
+
+def _slab_fourier(xc, Dt, half_thickness, terms):
+    """Fourier-sine series, ``(C - C0) / (Cs - C0)``; ``xc`` is measured from the centre."""
+    odd = 2 * np.arange(terms) + 1
+    decay = np.exp(-(odd * np.pi / (2.0 * half_thickness)) ** 2 * Dt[:, None])
+    mode = np.cos(odd * np.pi * xc[:, None] / (2.0 * half_thickness))
+    return 1.0 - (4.0 / np.pi) * ((-1.0) ** (odd // 2) / odd * decay * mode).sum(axis=1)
+
+
+def slab_concentration(x, t, C0, Cs, D, thickness, faces=2, tol=TOL):
+    """C(x, t) in a slab initially at ``C0`` whose surfaces are held at ``Cs``.
+
+    ``x`` runs from an exposed face into the slab (0 to ``thickness``); with
+    ``faces=1`` the face at ``x = thickness`` is sealed, which is half of a
+    slab twice as thick.  ``Cs < C0`` is decarburization.  ``x`` and ``t``
+    broadcast.
+
+    Two series give the same profile (Crank, §4.3.1).  The erfc images of the
+    semi-infinite solution converge fast while ``D t`` is small compared with
+    the slab; the Fourier series converges fast once it is not.  Each time
+    uses the form with fewer terms for ``tol``, and terms are counted by
+    :func:`slab_terms`.
+    """
+    half = thickness / 2.0 if faces == 2 else thickness
+    x, t = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(t, dtype=np.float64))
+    xc = (x - half).ravel()
+    Dt = D * t.ravel()
+    fraction = np.zeros_like(Dt)
+
+    image_terms, fourier_terms = slab_terms(t.ravel(), D, half, tol)
+    started = Dt > 0
+    use_image = started & (image_terms <= fourier_terms)
+    for mask, series, terms in ((use_image, _slab_image, image_terms),
+                                (started & ~use_image, _slab_fourier, fourier_terms)):
+        if mask.any():
+            fraction[mask] = series(xc[mask], Dt[mask], half, int(terms[mask].max()))
+    return (C0 + (Cs - C0) * fraction).reshape(x.shape)
+
+
+@cached("week10_slab_history", persist=True)
+def slab_history(C0, Cs, D, thickness, duration, faces=2, tol=TOL, nx=201, nt=301):
+    """:func:`slab_concentration` on a depth × time grid; returns ``(x, t, C)``."""
+    x = np.linspace(0.0, thickness, nx)
+    t = np.linspace(0.0, duration, nt)
+    return x, t, slab_concentration(x[:, None], t[None, :], C0, Cs, D, thickness, faces=faces, tol=tol)
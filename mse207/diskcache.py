@@ -0,0 +1,346 @@
+"""Content-addressed on-disk cache shared by server workers and restarts.
+
+``st.cache_data`` lives in one process, so every worker behind the proxy,
+and every restart, recomputes the same curves.  This cache keeps results on
+disk under the SHA-256 of the function name, a version, the code and the
+arguments:
+
+    <root>/<key[:2]>/<key>/meta.json     structure of the result
+                           /0.npy, 1.npy arrays (opened memory-mapped)
+                           /0.bin        bytes (rendered PNG figures)
+
+Results may be arrays, numbers, strings, bytes and (named) tuples or lists
+of them; anything else is simply not cached on disk.  An entry is written
+to a temporary directory and published with one ``os.replace``, so readers
+see either nothing or a complete entry and never need a lock.  Entries are
+never modified, only evicted: when the cache outgrows its size limit the
+least recently used entries are removed under an exclusive ``fcntl`` lock
+(skipped where ``fcntl`` is missing).
+
+The code part of the key is the digest of every source file of this
+package and of the file that defines the function (a page script, for the
+figures it builds).  Editing the code therefore starts new entries and the
+old ones age out; a deployment never serves results of the code it
+replaced.  Bump ``version`` when results change for reasons outside the
+code, such as a data file the function reads.
+
+Configuration (environment variables):
+
+    MSE207_CACHE_DIR      cache root (default ".mse207_cache", empty disables)
+    MSE207_CACHE_MAX_MB   size limit before eviction (default 512)
+
+The compiled kernels of :mod:`mse207.kernels` are kept in ``<root>/numba``;
+:func:`clear` and eviction only touch the result shards.
+"""
+
+import contextlib
+import functools
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from mse207 import metrics
+
+try:
+    import fcntl
+except ImportError:   # Windows: entries are still published atomically
+    fcntl = None
+
+CACHE_DIR = os.environ.get("MSE207_CACHE_DIR", ".mse207_cache")
+MAX_BYTES = int(float(os.environ.get("MSE207_CACHE_MAX_MB", "512")) * 1024 ** 2)
+EVICT_TO = 0.8      # fraction of MAX_BYTES left after an eviction pass
+
+_META = "meta.json"
+
+metrics.REGISTRY.help.update({
+    "mse207_disk_cache_bytes": "Size of the on-disk result cache after the last store.",
+    "mse207_disk_cache_evictions_total": "Entries evicted from the on-disk result cache.",
+})
+
+
+class Uncacheable(TypeError):
+    """Raised for arguments or results the cache cannot key or store."""
+
+
+# ============================================================
+# KEYS
+# ============================================================
+def _feed(digest, obj):
+    if isinstance(obj, np.ndarray):
+        digest.update(f"nd{obj.dtype.str}{obj.shape}".encode())
+        digest.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, np.generic):
+        _feed(digest, obj.item())
+    elif obj is None or isinstance(obj, (bool, int, float, str, bytes)):
+        digest.update(f"{type(obj).__name__}:{obj!r};".encode())
+    elif isinstance(obj, (tuple, list)):
+        digest.update(f"{type(obj).__qualname__}(".encode())
+        for item in obj:
+            _feed(digest, item)
+        digest.update(b")")
+    elif isinstance(obj, dict):
+        digest.update(b"{")
+        for name in sorted(obj):
+            _feed(digest, name)
+            _feed(digest, obj[name])
+        digest.update(b"}")
+    else:
+        raise Uncacheable(f"cannot key {type(obj).__name__}")
+
+
+@functools.lru_cache(maxsize=None)
+def _package_digest():
+    # Hashed once: modules are not reloaded, so this is the code that runs.
+    root = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(root)):
+        if name.endswith(".py"):
+            digest.update(name.encode())
+            with open(os.path.join(root, name), "rb") as fh:
+                digest.update(fh.read())
+    return digest.hexdigest()
+
+
+_file_digests = {}   # path -> ((mtime_ns, size), digest)
+
+
+def _file_digest(path):
+    # Page scripts are executed anew on every rerun, so check for edits.
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    known = _file_digests.get(path)
+    if known is None or known[0] != stamp:
+        with open(path, "rb") as fh:
+            known = stamp, hashlib.sha256(fh.read()).hexdigest()
+        _file_digests[path] = known
+    return known[1]
+
+
+def code_version(fn):
+    """Digest of the package sources and of the file that defines ``fn``."""
+    code = getattr(inspect.unwrap(fn), "__code__", None)
+    try:
+        own = _file_digest(code.co_filename)
+    except (AttributeError, OSError):
+        # Built-in, or defined where there is no file: fall back to the bytecode
+        own = hashlib.sha256(code.co_code if code is not None else repr(fn).encode()).hexdigest()
+    return hashlib.sha256(f"{_package_digest()}:{own}".encode()).hexdigest()[:16]
+
+
+def key(name, version, args=(), kwargs=None):
+    """Hex key of ``name``/``version`` called with ``args`` and ``kwargs``."""
+    digest = hashlib.sha256()
+    _feed(digest, (name, str(version), tuple(args), dict(kwargs or {})))
+    return digest.hexdigest()
+
+
+# ============================================================
+# ENTRIES
+# ============================================================
+def _encode(obj, blobs):
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.hasobject:
+            raise Uncacheable("object arrays")
+        blobs.append(obj)
+        return {"npy": len(blobs) - 1}
+    if isinstance(obj, bytes):
+        blobs.append(obj)
+        return {"bin": len(blobs) - 1}
+    if isinstance(obj, np.generic):
+        return {"value": obj.item()}
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return {"value": obj}
+    if isinstance(obj, tuple) and hasattr(obj, "_fields"):
+        cls = type(obj)
+        return {"namedtuple": f"{cls.__module__}:{cls.__qualname__}",
+                "items": [_encode(item, blobs) for item in obj]}
+    if isinstance(obj, (tuple, list)):
+        return {type(obj).__name__: [_encode(item, blobs) for item in obj]}
+    raise Uncacheable(f"cannot store {type(obj).__name__}")
+
+
+def _decode(spec, path):
+    if "npy" in spec:
+        return np.load(os.path.join(path, f"{spec['npy']}.npy"), mmap_mode="r")
+    if "bin" in spec:
+        with open(os.path.join(path, f"{spec['bin']}.bin"), "rb") as fh:
+            return fh.read()
+    if "value" in spec:
+        return spec["value"]
+    if "namedtuple" in spec:
+        module, qualname = spec["namedtuple"].split(":")
+        cls = importlib.import_module(module)
+        for part in qualname.split("."):
+            cls = getattr(cls, part)
+        return cls(*(_decode(item, path) for item in spec["items"]))
+    if "tuple" in spec:
+        return tuple(_decode(item, path) for item in spec["tuple"])
+    return [_decode(item, path) for item in spec["list"]]
+
+
+def _entry_path(entry_key):
+    return os.path.join(CACHE_DIR, entry_key[:2], entry_key)
+
+
+def load(entry_key):
+    """``(True, value)`` for a stored entry, ``(False, None)`` otherwise."""
+    if not CACHE_DIR:
+        return False, None
+    path = _entry_path(entry_key)
+    try:
+        with open(os.path.join(path, _META), encoding="utf-8") as fh:
+            spec = json.load(fh)
+        value = _decode(spec, path)
+        os.utime(os.path.join(path, _META))   # recency for eviction
+    except (OSError, ValueError, KeyError, AttributeError, ImportError, TypeError):
+        # Missing, evicted mid-read, or written by an incompatible version
+        return False, None
+    return True, value
+
+
+def store(entry_key, value):
+    """Publish ``value`` under ``entry_key``; returns False if it cannot be stored."""
+    if not CACHE_DIR:
+        return False
+    blobs = []
+    try:
+        spec = _encode(value, blobs)
+    except Uncacheable:
+        return False
+
+    path = _entry_path(entry_key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".tmp-", dir=os.path.dirname(path))
+    try:
+        for index, blob in enumerate(blobs):
+            if isinstance(blob, bytes):
+                with open(os.path.join(staging, f"{index}.bin"), "wb") as fh:
+                    fh.write(blob)
+            else:
+                np.save(os.path.join(staging, f"{index}.npy"), blob, allow_pickle=False)
+        with open(os.path.join(staging, _META), "w", encoding="utf-8") as fh:
+            json.dump(spec, fh)
+        os.replace(staging, path)
+    except OSError:
+        # Another worker published the same entry first (or the disk is full)
+        shutil.rmtree(staging, ignore_errors=True)
+        return os.path.isdir(path)
+    _evict()
+    return True
+
+
+# ============================================================
+# EVICTION
+# ============================================================
+@contextlib.contextmanager
+def _locked():
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(CACHE_DIR, ".lock"), "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _shards():
+    # Only the <key[:2]> directories hold results; others (numba/) are not ours.
+    for shard in os.scandir(CACHE_DIR):
+        if len(shard.name) == 2 and shard.is_dir() and all(c in "0123456789abcdef" for c in shard.name):
+            yield shard
+
+
+def _entries():
+    """``(last_used, bytes, path)`` of every published entry."""
+    found = []
+    for shard in _shards():
+        for entry in os.scandir(shard.path):
+            if entry.name.startswith(".tmp-"):
+                continue
+            try:
+                files = list(os.scandir(entry.path))
+                used = os.stat(os.path.join(entry.path, _META)).st_mtime
+            except OSError:
+                continue
+            found.append((used, sum(f.stat().st_size for f in files), entry.path))
+    return found
+
+
+def _evict():
+    with _locked():
+        entries = _entries()
+        total = sum(size for _, size, _ in entries)
+        if total > MAX_BYTES:
+            evicted = 0
+            for _, size, path in sorted(entries):
+                if total <= EVICT_TO * MAX_BYTES:
+                    break
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+                evicted += 1
+            metrics.REGISTRY.inc("mse207_disk_cache_evictions_total", {}, evicted)
+        metrics.REGISTRY.set("mse207_disk_cache_bytes", {}, total)
+
+
+def clear():
+    """Remove every entry, leaving the compiled kernels in ``numba/``."""
+    if CACHE_DIR and os.path.isdir(CACHE_DIR):
+        with _locked():
+            for shard in list(_shards()):
+                shutil.rmtree(shard.path, ignore_errors=True)
+
+
+# ============================================================
+# FRONT ENDS
+# ============================================================
+def call(name, version, fn, args=(), kwargs=None, job=None, code=None):
+    """``fn(*args, **kwargs)`` through the disk cache, counted as ``name.disk``.
+
+    The key includes :func:`code_version` of ``code`` (default ``fn``).  A
+    background ``job`` (see :mod:`mse207.jobs`) is passed on to ``fn`` on a
+    miss, for progress and cancellation; it is not part of the key.
+    """
+    kwargs = kwargs or {}
+    try:
+        entry_key = key(
+            f"{name}:{fn.__module__}.{fn.__qualname__}:{code_version(code or fn)}", version, args, kwargs,
+        )
+    except Uncacheable:
+        entry_key = None
+    if entry_key is not None:
+        hit, value = load(entry_key)
+        metrics.cache_lookup(f"{name}.disk", hit=hit)
+        if hit:
+            return value
+    value = fn(*args, **kwargs) if job is None else fn(*args, job=job, **kwargs)
+    if entry_key is not None:
+        store(entry_key, value)
+    return value
+
+
+def figure_png(name, version, params, build, dpi=200):
+    """PNG bytes of the figure ``build()`` returns for ``params``, rendered once.
+
+    ``params`` must hold everything the figure depends on.
+    """
+    import matplotlib.pyplot as plt
+
+    from mse207 import figures
+
+    def render(params, dpi):
+        fig = build()
+        try:
+            return figures.to_png(fig, dpi)
+        finally:
+            plt.close(fig)
+
+    render.__qualname__ = "figure"
+    return call(name, version, render, (params, dpi), code=build)
@@ -0,0 +1,461 @@
+"""Static export of the week pages to standalone HTML and PDF.
+
+Most readers only want the theory, the worked examples and the default
+plots, and do not need a live session for them.  Each *view* of an app (every
+option of its navigation selectboxes: the week 9 sections and solved
+examples) is run headless with ``streamlit.testing.v1.AppTest`` at its default
+inputs.  Background jobs are awaited, the figures are collected from the
+:mod:`mse207.figures` pipeline, and the page is written out as:
+
+* ``<view>.html``: self-contained, with figures embedded as PNG and math
+  typeset by KaTeX (raw TeX stays readable offline);
+* ``<view>.pdf``: text, equations (matplotlib mathtext where it parses) and
+  figures flowed onto A4 pages with ``PdfPages``.
+
+An ``index.html`` links every view.  Views run in parallel in a process pool.
+A finished view reports the navigation options it has not covered yet, and
+those are queued at once, so new sections are picked up without listing
+them here.
+
+    python -m mse207.export --out site
+    python -m mse207.export --apps week9 --workers 4 --no-pdf
+
+Figures are matched to the page in the order they are drawn.
+"""
+
+import argparse
+import base64
+import html
+import io
+import multiprocessing
+import os
+import re
+import sys
+import textwrap
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APPS = {
+    "week8": "app_mse207_v8.py",
+    "week9": "app_mse207_v9.py",
+    "week10": "app_mse207_v10_1.py",
+}
+
+# Selectboxes that switch between views of an app, as (area, label);
+# every option is exported.
+NAVIGATION = {
+    "week9": (("sidebar", "Go to section"), ("main", "Select example")),
+}
+
+KATEX = "https://cdn.jsdelivr.net/npm/katex@0.16.11/dist"
+
+_HEADINGS = {"title": "h1", "header": "h2", "subheader": "h3"}
+_ALERTS = {"error", "warning", "info", "success", "exception"}
+_INPUTS = {
+    "slider", "select_slider", "number_input", "selectbox", "radio", "checkbox", "toggle",
+    "text_input", "text_area", "multiselect", "date_input", "time_input", "color_picker",
+}
+
+
+# ============================================================
+# HEADLESS RUN
+# ============================================================
+def _selectbox(at, area, label):
+    for box in (at.sidebar if area == "sidebar" else at.main).selectbox:
+        if box.label == label:
+            return box
+    return None
+
+
+def _wait_for_jobs(at, timeout):
+    from mse207 import jobs, sessions
+
+    if sessions.STATE_KEY not in at.session_state:
+        return
+    running = at.session_state[sessions.STATE_KEY].results.get(jobs._STATE_KEY, {})
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and not all(job.done for job in running.values()):
+        time.sleep(jobs.POLL_SECONDS)
+
+
+def _blocks(node, images):
+    """Flatten an element tree into ``(kind, ...)`` blocks in page order."""
+    for child in getattr(node, "children", {}).values():
+        kind = getattr(child, "type", None)
+        if kind in _HEADINGS:
+            yield (_HEADINGS[kind], child.value)
+        elif kind == "latex":
+            yield ("math", child.value.strip().strip("$").strip())
+        elif kind in ("markdown", "caption", "code"):
+            yield (kind, child.value)
+        elif kind in _ALERTS:
+            yield ("alert", kind, str(child.value))
+        elif kind == "image":
+            for _ in child.value:
+                png = next(images, None)
+                if png is not None:
+                    yield ("image", png)
+        elif kind in ("dataframe", "table"):
+            yield ("table", child.value)
+        elif kind in _INPUTS:
+            # Unanswered quiz radios have no value
+            yield ("input", child.label, "—" if child.value is None else child.value)
+        elif kind == "expander":
+            yield ("h4", child.label)
+            yield from _blocks(child, images)
+        else:
+            yield from _blocks(child, images)
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def export_view(app, picks, out_dir, pdf=True, timeout=120.0):
+    """Export one view of ``app`` after selecting ``picks`` (``(area, label, option)``).
+
+    Returns the index entry and the picks of the views it leads to.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    from mse207 import figures
+
+    started = time.perf_counter()
+    at = AppTest.from_file(os.path.join(ROOT, APPS[app]), default_timeout=timeout).run()
+    for area, label, option in picks:
+        _selectbox(at, area, label).select(option).run()
+    _wait_for_jobs(at, timeout)
+    with figures.capture() as pngs:
+        at.run()
+    blocks = list(_blocks(at.main, iter(pngs)))
+
+    view, children = [], []
+    chosen = {label for _, label, _ in picks}
+    for area, label in NAVIGATION.get(app, ()):
+        box = _selectbox(at, area, label)
+        if box is None:
+            continue
+        view.append(box.value)
+        if label not in chosen:
+            children += [picks + ((area, label, option),) for option in box.options if option != box.value]
+
+    name = "-".join([app] + [_slug(value) for value in view])
+    title = next((b[1] for b in blocks if b[0] == "h1"), app)
+    with open(os.path.join(out_dir, f"{name}.html"), "w", encoding="utf-8") as fh:
+        fh.write(_html(" – ".join([title] + view), blocks))
+    if pdf:
+        _pdf(os.path.join(out_dir, f"{name}.pdf"), blocks)
+
+    entry = {
+        "app": app, "view": view, "name": name, "title": title, "pdf": pdf,
+        "figures": len(pngs), "errors": [b[2] for b in blocks if b[0] == "alert" and b[1] == "exception"],
+        "seconds": time.perf_counter() - started,
+    }
+    return entry, children
+
+
+# ============================================================
+# HTML
+# ============================================================
+_MATH = re.compile(r"\$\$.+?\$\$|\\\[.+?\\\]|\\\(.+?\\\)|\$[^$\n]+?\$", re.S)
+_ITEM = re.compile(r"\s*(?:[-*+]|(\d+)\.)\s+(.*)")
+
+
+def _inline(text):
+    """Inline markdown (code, bold, italics, links) with math spans left for KaTeX."""
+    spans = []
+
+    def keep(match):
+        spans.append(match.group(0))
+        return f"\x00{len(spans) - 1}\x00"
+
+    text = html.escape(_MATH.sub(keep, text), quote=False)
+    text = re.sub(r"`([^`]+)`", r"<code>\1</code>", text)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    text = re.sub(r"(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?!\w)", r"<em>\1</em>", text)
+    text = re.sub(r"\[([^\]]+)\]\(([^)\s]+)\)", r'<a href="\2">\1</a>', text)
+    return re.sub("\x00(\\d+)\x00", lambda m: html.escape(spans[int(m.group(1))], quote=False), text)
+
+
+def _markdown(text):
+    """The markdown subset the week pages use: headings, lists and paragraphs."""
+    out, paragraph, items, ordered = [], [], [], False
+
+    def flush():
+        if paragraph:
+            out.append("<p>" + "<br>\n".join(_inline(line.strip()) for line in paragraph) + "</p>")
+            paragraph.clear()
+        if items:
+            tag = "ol" if ordered else "ul"
+            out.append(f"<{tag}>" + "".join(f"<li>{_inline(item)}</li>" for item in items) + f"</{tag}>")
+            items.clear()
+
+    for line in textwrap.dedent(text).strip().split("\n"):
+        heading = re.match(r"(#{1,6})\s+(.*)", line.strip())
+        item = _ITEM.match(line)
+        if not line.strip():
+            flush()
+        elif heading:
+            flush()
+            level = min(len(heading.group(1)) + 1, 6)
+            out.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+        elif item:
+            if paragraph:
+                flush()
+            ordered = item.group(1) is not None if not items else ordered
+            items.append(item.group(2))
+        elif items and line.startswith(" "):
+            items[-1] += " " + line.strip()
+        else:
+            if items:
+                flush()
+            # A hard line break is two trailing spaces, as in markdown
+            if paragraph and not paragraph[-1].endswith("  "):
+                paragraph[-1] = paragraph[-1].rstrip() + " " + line.strip()
+            else:
+                paragraph.append(line)
+    flush()
+    return "\n".join(out)
+
+
+def _html(title, blocks):
+    body = []
+    for block in blocks:
+        kind = block[0]
+        if kind in ("h1", "h2", "h3", "h4"):
+            body.append(f"<{kind}>{_inline(block[1])}</{kind}>")
+        elif kind == "markdown":
+            body.append(_markdown(block[1]))
+        elif kind == "caption":
+            body.append(f'<div class="caption">{_markdown(block[1])}</div>')
+        elif kind == "math":
+            body.append(f'<div class="math">\\[{html.escape(block[1], quote=False)}\\]</div>')
+        elif kind == "code":
+            body.append(f"<pre>{html.escape(block[1])}</pre>")
+        elif kind == "alert":
+            body.append(f'<div class="alert {block[1]}">{_markdown(block[2])}</div>')
+        elif kind == "image":
+            data = base64.b64encode(block[1]).decode("ascii")
+            body.append(f'<img src="data:image/png;base64,{data}" alt="figure">')
+        elif kind == "table":
+            body.append(block[1].to_html(border=0, classes="table", na_rep=""))
+        elif kind == "input":
+            body.append(f'<div class="input">{_inline(block[1])}: <b>{html.escape(str(block[2]))}</b></div>')
+    return _PAGE.format(title=html.escape(title), katex=KATEX, body="\n".join(body))
+
+
+_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<link rel="stylesheet" href="{katex}/katex.min.css">
+<script defer src="{katex}/katex.min.js"></script>
+<script defer src="{katex}/contrib/auto-render.min.js"
+  onload="renderMathInElement(document.body, {{delimiters: [
+    {{left: '$$', right: '$$', display: true}}, {{left: '\\\\[', right: '\\\\]', display: true}},
+    {{left: '\\\\(', right: '\\\\)', display: false}}, {{left: '$', right: '$', display: false}}]}})"></script>
+<style>
+body {{ font-family: sans-serif; max-width: 50rem; margin: 2rem auto; padding: 0 1rem; line-height: 1.5; }}
+img {{ max-width: 100%; }}
+.caption {{ color: #666; font-size: 0.9em; }}
+.input {{ color: #444; font-size: 0.9em; }}
+.alert {{ padding: 0.5rem 1rem; border-radius: 0.3rem; margin: 0.5rem 0; }}
+.info {{ background: #e8f0fe; }} .success {{ background: #e6f4ea; }}
+.warning {{ background: #fef7e0; }} .error, .exception {{ background: #fce8e6; }}
+.table {{ border-collapse: collapse; font-size: 0.9em; }}
+.table td, .table th {{ padding: 0.2rem 0.6rem; border-bottom: 1px solid #ddd; }}
+</style>
+</head>
+<body>
+<p><a href="index.html">All lecture notes</a></p>
+{body}
+</body>
+</html>
+"""
+
+
+def _write_index(out_dir, entries):
+    rows = []
+    for app in APPS:
+        views = sorted((e for e in entries if e["app"] == app), key=lambda e: e["name"])
+        if not views:
+            continue
+        rows.append(f"<h2>{html.escape(views[0]['title'])}</h2><ul>")
+        for e in views:
+            label = html.escape(" – ".join(e["view"]) or "Lecture note")
+            pdf = f' (<a href="{e["name"]}.pdf">PDF</a>)' if e["pdf"] else ""
+            rows.append(f'<li><a href="{e["name"]}.html">{label}</a>{pdf}</li>')
+        rows.append("</ul>")
+    page = _PAGE.format(title="MSE207 lecture notes", katex=KATEX, body="\n".join(rows))
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as fh:
+        fh.write(page.replace('<p><a href="index.html">All lecture notes</a></p>\n', ""))
+
+
+# ============================================================
+# PDF
+# ============================================================
+_PAGE_W, _PAGE_H, _MARGIN = 8.27, 11.69, 0.7     # A4, inches
+
+
+def _plain(text):
+    """Markdown reduced to text lines for the PDF; math delimiters dropped."""
+    text = textwrap.dedent(text).strip()
+    text = re.sub(r"\\\(|\\\)|\\\[|\\\]|\$\$", "", text)
+    text = re.sub(r"\*\*(.+?)\*\*|`([^`]+)`", lambda m: m.group(1) or m.group(2), text)
+    text = re.sub(r"^#+\s*", "", text, flags=re.M)
+    # Control characters from unescaped TeX in the page strings ("\a" in "\alpha")
+    text = re.sub(r"[\x00-\x08\x0b-\x1f]", "", text)
+    return text.replace("$", r"\$")
+
+
+class _PdfWriter:
+    """Flows text, equations and images down A4 pages."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.fig = None
+        self.y = 0.0
+
+    def _room(self, height):
+        if self.fig is None or self.y + height > _PAGE_H - _MARGIN:
+            self.close()
+            import matplotlib.pyplot as plt
+
+            self.fig = plt.figure(figsize=(_PAGE_W, _PAGE_H))
+            self.y = _MARGIN
+
+    def text(self, text, size=9.5, weight="normal", family="sans-serif", gap=0.08):
+        width = int((_PAGE_W - 2 * _MARGIN) * 72 / (size * 0.52))
+        line_h = size * 1.45 / 72
+        for raw in text.split("\n"):
+            for line in textwrap.wrap(raw, width) or [""]:
+                self._room(line_h)
+                self.y += line_h
+                self.fig.text(_MARGIN / _PAGE_W, 1 - self.y / _PAGE_H, line, fontsize=size,
+                              weight=weight, family=family)
+        self.y += gap
+
+    def math(self, tex):
+        from matplotlib.mathtext import MathTextParser
+
+        expression = "$" + " ".join(tex.split()) + "$"
+        try:
+            MathTextParser("path").parse(expression)
+        except ValueError:
+            self.text(tex, family="monospace")
+            return
+        self._room(0.45)
+        self.y += 0.35
+        self.fig.text(0.5, 1 - self.y / _PAGE_H, expression, fontsize=12, ha="center")
+        self.y += 0.15
+
+    def image(self, png):
+        import matplotlib.image as mpimg
+
+        pixels = mpimg.imread(io.BytesIO(png), format="png")
+        width = _PAGE_W - 2 * _MARGIN
+        height = min(width * pixels.shape[0] / pixels.shape[1], _PAGE_H - 2 * _MARGIN)
+        width = height * pixels.shape[1] / pixels.shape[0]
+        self._room(height + 0.1)
+        ax = self.fig.add_axes([(_PAGE_W - width) / 2 / _PAGE_W, 1 - (self.y + height) / _PAGE_H,
+                                width / _PAGE_W, height / _PAGE_H])
+        ax.imshow(pixels)
+        ax.set_axis_off()
+        self.y += height + 0.15
+
+    def close(self):
+        if self.fig is not None:
+            import matplotlib.pyplot as plt
+
+            self.pages.savefig(self.fig)
+            plt.close(self.fig)
+            self.fig = None
+
+
+def _pdf(path, blocks):
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    sizes = {"h1": 17, "h2": 14, "h3": 12, "h4": 10.5}
+    with PdfPages(path) as pages:
+        writer = _PdfWriter(pages)
+        for block in blocks:
+            kind = block[0]
+            if kind in sizes:
+                writer.text(_plain(block[1]), size=sizes[kind], weight="bold", gap=0.12)
+            elif kind in ("markdown", "caption"):
+                writer.text(_plain(block[1]), size=9.5 if kind == "markdown" else 8.5)
+            elif kind == "math":
+                writer.math(block[1])
+            elif kind == "code":
+                writer.text(block[1], family="monospace", size=8.5)
+            elif kind == "alert":
+                writer.text(_plain(block[2]), weight="bold", size=9)
+            elif kind == "image":
+                writer.image(block[1])
+            elif kind == "table":
+                writer.text(block[1].to_string(), family="monospace", size=7.5)
+            elif kind == "input":
+                writer.text(_plain(f"{block[1]}: {block[2]}"), size=8.5, gap=0.0)
+        writer.close()
+
+
+# ============================================================
+# DRIVER
+# ============================================================
+def export_all(out_dir, apps=tuple(APPS), workers=None, pdf=True, timeout=120.0):
+    """Export every view of ``apps`` into ``out_dir``; returns the index entries."""
+    os.makedirs(out_dir, exist_ok=True)
+    entries = []
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=context) as pool:
+        pending = {pool.submit(export_view, app, (), out_dir, pdf, timeout) for app in apps}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                entry, children = future.result()
+                entries.append(entry)
+                note = f", {len(entry['errors'])} error(s)" if entry["errors"] else ""
+                print(f"{entry['name']:<60} {entry['figures']:>3} figures {entry['seconds']:>6.1f} s{note}",
+                      flush=True)
+                pending |= {pool.submit(export_view, entry["app"], picks, out_dir, pdf, timeout)
+                            for picks in children}
+    _write_index(out_dir, entries)
+    return entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--out", default="site", help="output directory (default: site)")
+    parser.add_argument("--apps", default=",".join(APPS),
+                        help="comma-separated apps to export (default: all)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="parallel export processes (default: CPU count)")
+    parser.add_argument("--no-pdf", action="store_true", help="write HTML only")
+    parser.add_argument("--timeout", type=float, default=120.0,
+                        help="per-view timeout in seconds, including background jobs")
+    args = parser.parse_args(argv)
+
+    # Workers inherit the environment: no metrics exporters in the export.
+    os.environ.setdefault("MSE207_METRICS_PORT", "0")
+    os.environ.setdefault("MSE207_METRICS_FILE", "")
+    sys.path.insert(0, ROOT)
+
+    apps = [a.strip() for a in args.apps.split(",") if a.strip()]
+    unknown = [a for a in apps if a not in APPS]
+    if unknown:
+        parser.error(f"unknown app(s): {', '.join(unknown)}; choose from {', '.join(APPS)}")
+
+    started = time.perf_counter()
+    entries = export_all(args.out, apps, args.workers, not args.no_pdf, args.timeout)
+    print(f"\n{len(entries)} views written to {args.out} in {time.perf_counter() - started:.1f} s")
+
+
+if __name__ == "__main__":
+    # Pool tasks must pickle as mse207.export.*: AppTest replaces __main__
+    # with the app script inside the workers.
+    from mse207 import export
+
+    export.main()
@@ -0,0 +1,64 @@
+"""Figure pipeline shared by the week pages.
+
+Figures are rendered through :func:`show` so they are counted in the metrics
+and closed right after rendering; an open pyplot figure otherwise stays
+referenced by matplotlib for the life of the server process.
+
+:func:`show_cached` skips matplotlib altogether when the same figure has
+already been rendered by any worker: the PNG comes from
+:mod:`mse207.diskcache`, keyed by the parameters the figure is drawn from.
+Inside :func:`capture` every figure shown is also collected as PNG bytes, in
+drawing order, for the static export in :mod:`mse207.export`.
+"""
+
+import contextlib
+import io
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import streamlit as st  # noqa: E402
+
+from mse207 import diskcache  # noqa: E402
+
+_captured = None
+
+
+def to_png(fig, dpi=200):
+    """PNG bytes of ``fig``, saved the way ``st.pyplot`` saves it."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight", dpi=dpi)
+    return buffer.getvalue()
+
+
+@contextlib.contextmanager
+def capture():
+    """Collect the PNG bytes of every figure shown in this process into a list."""
+    global _captured
+    _captured = []
+    try:
+        yield _captured
+    finally:
+        _captured = None
+
+
+def show(fig, run=None):
+    """Render ``fig`` with ``st.pyplot``, count it on ``run`` and close it."""
+    if _captured is not None:
+        _captured.append(to_png(fig))
+    st.pyplot(fig)
+    if run is not None:
+        run.figure_rendered()
+    plt.close(fig)
+
+
+def show_cached(name, params, build, run=None, version=1):
+    """Render the figure ``build()`` returns for ``params``, from the disk cache when possible."""
+    png = diskcache.figure_png(name, version, params, build)
+    if _captured is not None:
+        _captured.append(png)
+    st.image(png, width="stretch")
+    if run is not None:
+        run.figure_rendered()
@@ -0,0 +1,200 @@
+"""A whole furnace load heated, carburized and cooled together.
+
+One load holds hundreds of parts of different size (``V/A``) and position in
+the basket.  They all see the same furnace history but heat and cool at
+their own rates.  Each part is lumped (one temperature) and gains heat by
+convection and radiation (:mod:`mse207.cooling`), scaled by an *exposure*
+between 0.4 at the centre of the load and 1 at its edge, where the part
+sees the fan and the walls.  Every time step advances the whole state
+together:
+
+* the part temperatures, one array of ``n`` values, by backward Euler with
+  Newton iterations (unconditionally stable, so the step only controls
+  accuracy);
+* optionally, the carbon profile below each part's surface, an ``n × nx``
+  array.  It is advanced by backward Euler with ``D(T)`` at each part's
+  temperature and surface mass transfer ``-D dC/dx = beta (C_p - C)``
+  (see :func:`mse207.curves.robin_concentration`).  All ``n`` tridiagonal
+  systems are solved in one :func:`mse207.kernels.thomas` call.  The
+  profile depth is capped at the part's ``V/A``, with no flux at the
+  centre, so thin parts can carburize through.
+
+The program ramps the furnace to the soak temperature and holds it.  The
+boost and diffuse stages are timed from the moment the furnace reaches
+temperature, or from the moment the slowest part does (``soak_from="load"``),
+as a load thermocouple would time them.  After that the furnace cools at a
+fixed rate.  The run ends when every part is below the unload temperature.
+:class:`LoadResult` reports the lagging part, the case depth of every part
+and the cycle time.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from mse207 import cooling, kernels
+
+R_GAS = 8.314
+
+# Carbon in austenite
+D0_CARBON = 2.3e-5      # m²/s
+Q_CARBON = 148e3        # J/mol
+
+LoadSpec = namedtuple("LoadSpec", "n_parts va_min_mm va_max_mm emissivity h_fan seed")
+Parts = namedtuple("Parts", "L emissivity exposure h")
+Program = namedtuple(
+    "Program", "soak_C heat_rate boost_h diffuse_h boost_Cp diffuse_Cp cool_rate unload_C",
+)
+LoadResult = namedtuple(
+    "LoadResult",
+    "parts t T_furnace T soak_start_s cool_start_s at_temperature_s lagging unload_s cycle_s "
+    "x C case_depth_mm",
+)
+
+DEFAULT_PROGRAM = Program(soak_C=925.0, heat_rate=10.0, boost_h=3.0, diffuse_h=1.5, boost_Cp=1.1,
+                          diffuse_Cp=0.8, cool_rate=5.0, unload_C=150.0)
+
+
+def parts(spec):
+    """Parts of a random load: sizes log-uniform in the ``V/A`` range, random basket positions."""
+    rng = np.random.default_rng(spec.seed)
+    n = spec.n_parts
+    L = np.exp(rng.uniform(np.log(spec.va_min_mm), np.log(spec.va_max_mm), n)) / 1000.0
+    position = np.sqrt(rng.random(n))           # radial position, 0 at the centre of the basket
+    return Parts(L=L, emissivity=np.full(n, spec.emissivity), exposure=0.4 + 0.6 * position,
+                 h=np.full(n, spec.h_fan))
+
+
+def carbon_diffusivity(T_C):
+    """Diffusivity of carbon in austenite (m²/s) at ``T_C`` (°C)."""
+    return D0_CARBON * np.exp(-Q_CARBON / (R_GAS * (np.asarray(T_C, dtype=np.float64) + 273.15)))
+
+
+# ============================================================
+# STEPS
+# ============================================================
+def _heat_step(T, T_furnace, dt, capacity, parts, iterations=4):
+    """Part temperatures after ``dt`` by backward Euler; ``T_furnace`` is the new furnace value."""
+    T_new = T.copy()
+    for _ in range(iterations):
+        h = parts.h + cooling.radiative_h(T_new, parts.emissivity, T_furnace)
+        gain = parts.exposure * h * (T_furnace - T_new)
+        # d(gain)/dT with the exact radiation derivative 4 eps sigma T³
+        slope = parts.exposure * (parts.h + 4.0 * parts.emissivity * cooling.SIGMA * (T_new + 273.15) ** 3)
+        T_new -= (capacity * (T_new - T) / dt - gain) / (capacity / dt + slope)
+    return T_new
+
+
+def _carbon_step(C, D, dx, dt, beta, C_p):
+    """Carbon profiles after ``dt`` by backward Euler (one row per part)."""
+    r = (D * dt / dx ** 2)[:, None]
+    b = (2.0 * beta * dt / dx)[:, None]
+    lower = np.broadcast_to(-r, C.shape).copy()
+    upper = lower.copy()
+    diag = np.broadcast_to(1.0 + 2.0 * r, C.shape).copy()
+    rhs = C.copy()
+    # Surface half-cell with mass transfer; zero flux at the far end
+    upper[:, 0] *= 2.0
+    diag[:, 0] += b[:, 0]
+    rhs[:, 0] += b[:, 0] * C_p
+    lower[:, -1] *= 2.0
+    return kernels.thomas(lower, diag, upper, rhs)
+
+
+def _case_depth(x, C, case_C):
+    """Depth (mm) where each profile falls to ``case_C``; NaN if the surface is below it."""
+    below = C < case_C
+    j = np.where(below.any(axis=1), below.argmax(axis=1), C.shape[1] - 1)
+    rows = np.arange(C.shape[0])
+    i = np.maximum(j - 1, 0)
+    frac = np.clip((C[rows, i] - case_C) / np.maximum(C[rows, i] - C[rows, j], 1e-300), 0.0, 1.0)
+    depth = x[rows, i] + frac * (x[rows, j] - x[rows, i])
+    return np.where(C[:, 0] >= case_C, 1000.0 * depth, np.nan)
+
+
+# ============================================================
+# DRIVER
+# ============================================================
+def simulate(load, program=DEFAULT_PROGRAM, carburize=True, soak_from="load", tolerance_C=10.0, C0=0.2,
+             case_C=0.4, beta=1.5e-7, rho=7850.0, cp=650.0, T_start=25.0, dt=60.0, nx=60, depth_mm=3.0,
+             max_hours=72.0, job=None):
+    """Run one furnace cycle for ``load`` (a :class:`LoadSpec` or :class:`Parts`).
+
+    A part is at temperature within ``tolerance_C`` of the soak setpoint.
+    Returns :class:`LoadResult`: times (s), the furnace and part temperature
+    histories (parts × times), the stage times, each part's time to reach
+    temperature and to reach the unload temperature, the slowest part, the
+    cycle time and, with ``carburize``, the final profiles and case depths
+    (depth where carbon falls to ``case_C``).
+    """
+    p = parts(load) if isinstance(load, LoadSpec) else load
+    n = p.L.size
+    capacity = rho * cp * p.L
+    n_steps = int(np.ceil(max_hours * 3600.0 / dt))
+
+    depth = np.minimum(depth_mm / 1000.0, p.L)
+    dx = depth / (nx - 1)
+    x = dx[:, None] * np.arange(nx)
+    C = np.full((n, nx), float(C0))
+
+    T = np.full(n, float(T_start))
+    T_furnace = float(T_start)
+    history_t, history_f, history_T = [0.0], [T_furnace], [T.copy()]
+    at_temperature = np.full(n, np.nan)
+    unload = np.full(n, np.nan)
+    soak_start = cool_start = None
+    furnace_ready = None
+
+    for step in range(1, n_steps + 1):
+        t = step * dt
+        # Furnace program: ramp, hold until the stages are done, then cool
+        if cool_start is None:
+            T_furnace = min(T_start + program.heat_rate / 60.0 * t, program.soak_C)
+            if furnace_ready is None and T_furnace >= program.soak_C:
+                furnace_ready = t
+        else:
+            T_furnace = max(program.soak_C - program.cool_rate / 60.0 * (t - cool_start), T_start)
+
+        T_old = T
+        T = _heat_step(T, T_furnace, dt, capacity, p)
+        reached = np.isnan(at_temperature) & (T >= program.soak_C - tolerance_C)
+        at_temperature[reached] = t
+
+        if soak_start is None:
+            if soak_from == "furnace" and furnace_ready is not None:
+                soak_start = furnace_ready
+            elif soak_from == "load" and not np.isnan(at_temperature).any():
+                soak_start = t
+        soaked = None if soak_start is None else t - soak_start
+        if cool_start is None and soaked is not None and soaked >= 3600.0 * (program.boost_h + program.diffuse_h):
+            cool_start = t
+
+        if carburize:
+            if soaked is None or cool_start is not None:
+                C_p, part_beta = program.diffuse_Cp, np.zeros(n)     # neutral atmosphere
+            else:
+                C_p = program.boost_Cp if soaked < 3600.0 * program.boost_h else program.diffuse_Cp
+                part_beta = np.full(n, beta)
+            C = _carbon_step(C, carbon_diffusivity(0.5 * (T + T_old)), dx, dt, part_beta, C_p)
+
+        if cool_start is not None:
+            done = np.isnan(unload) & (T <= program.unload_C)
+            unload[done] = t
+        history_t.append(t)
+        history_f.append(T_furnace)
+        history_T.append(T.copy())
+
+        if job is not None and step % 20 == 0:
+            stage = ("heating" if soak_start is None else "soaking" if cool_start is None else "cooling")
+            job.progress(min(1.0, t / (3600.0 * max_hours)), f"{stage}, t = {t / 3600.0:.1f} h")
+        if cool_start is not None and not np.isnan(unload).any():
+            break
+
+    lagging = int(np.argmax(np.where(np.isnan(at_temperature), np.inf, at_temperature)))
+    return LoadResult(
+        parts=p, t=np.array(history_t), T_furnace=np.array(history_f), T=np.array(history_T).T,
+        soak_start_s=soak_start, cool_start_s=cool_start, at_temperature_s=at_temperature, lagging=lagging,
+        unload_s=unload, cycle_s=float(np.max(unload)) if not np.isnan(unload).any() else np.inf,
+        x=x, C=C if carburize else None,
+        case_depth_mm=_case_depth(x, C, case_C) if carburize else None,
+    )
@@ -0,0 +1,184 @@
+"""Peak temperatures and HAZ zone boundaries for a line source in a plate.
+
+A fast-moving arc deposits ``Q`` (J/mm) on the top face of a plate of
+thickness ``d`` (see :mod:`mse207.weld`).  At the surface, a distance ``y``
+from the weld centreline, the temperature rise is
+
+    dT(y, t) = Q / (rho c) · Theta(s) exp(-y² / 4at) / (2 pi a t),
+    Theta(s) = sum_k exp(-k² / s),    s = a t / d²
+
+where the sum runs over the image sources reflected in both faces.  Setting
+``d dT/dt = 0`` gives the peak along a locus parametrised by ``s``:
+
+    y² = 4 s d² (1 - s Theta'/Theta),
+    dTp = Q / (rho c) · Theta exp(s Theta'/Theta - 1) / (2 pi s d²)
+
+which reduces to the thick-plate (``2Q / (pi e rho c y²)``) and thin-plate
+(``Q / (sqrt(2 pi e) rho c d y)``) Adams/Rykalin limits and does not depend
+on the diffusivity.  ``Tp`` is linear in ``Q``, so a whole heat-input sweep
+is one outer product.  Zone boundaries (Tm, 1100 °C, Ac3, Ac1) are found by
+vectorised bisection on ``s`` for every ``(heat input, boundary)`` pair at
+once.  The line source neglects the finite arc size, so zone boundaries close
+to the fusion line come out slightly wide.
+
+Austenite grain growth along the thermal cycles follows
+
+    d^n - d0^n = integral k0 exp(-Q_g / R T(t)) dt
+
+accumulated above Ac3 by a cumulative trapezoid over the time axis, for all
+positions at once.  The default constants are illustrative for a C-Mn steel.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from mse207 import kernels, weld
+from mse207.numerics import bisect
+from mse207.weld import RHO_C, T_MELT
+
+T_CGHAZ = 1100.0    # °C, onset of austenite grain coarsening
+AC3 = 900.0         # °C
+AC1 = 720.0         # °C
+LEVELS = (T_MELT, T_CGHAZ, AC3, AC1)
+
+R_GAS = 8.314       # J/(mol·K)
+GRAIN_N = 2.0       # growth exponent
+GRAIN_Q = 250e3     # J/mol
+GRAIN_K0 = 5e11     # µm^n/s
+GRAIN_D0 = 20.0     # µm, base metal austenite grain size
+
+Zones = namedtuple("Zones", "Q boundary fusion cghaz fghaz ichaz haz")
+GrainProfile = namedtuple("GrainProfile", "y peak d t d_t")
+
+# Theta is summed over images for s < 0.5 and over its Fourier dual above
+_SWITCH = 0.5
+_TERMS = np.arange(1, 5)[:, None]
+_LOG_S = (np.log(1e-8), np.log(1e8))
+
+
+# ============================================================
+# PEAK LOCUS
+# ============================================================
+def _theta(s):
+    """``Theta(s)`` and ``s Theta'(s) / Theta(s)``."""
+    s = np.asarray(s, dtype=np.float64)
+    flat = s.reshape(1, -1)
+    small = np.minimum(flat, _SWITCH)
+    large = np.maximum(flat, _SWITCH)
+
+    images = np.exp(-_TERMS ** 2 / small)
+    theta_i = 1.0 + 2.0 * images.sum(0)
+    slope_i = 2.0 * (_TERMS ** 2 / small * images).sum(0) / theta_i
+
+    modes = np.exp(-np.pi ** 2 * _TERMS ** 2 * large)
+    series = 1.0 + 2.0 * modes.sum(0)
+    theta_f = np.sqrt(np.pi * large[0]) * series
+    slope_f = 0.5 - 2.0 * large[0] * (np.pi ** 2 * _TERMS ** 2 * modes).sum(0) / series
+
+    use_images = flat[0] < _SWITCH
+    theta = np.where(use_images, theta_i, theta_f)
+    slope = np.where(use_images, slope_i, slope_f)
+    return theta.reshape(s.shape), slope.reshape(s.shape)
+
+
+def surface_cycle(y, t, Q_kJ_per_mm, thickness, T0=25.0, rho_c=RHO_C, a=weld.DIFFUSIVITY):
+    """Surface temperature at ``y`` (mm) and time ``t`` (s) after the arc passes.
+
+    All arguments broadcast, so one call gives a cycle per (position, heat
+    input) pair.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        theta, _ = _theta(a * t / thickness ** 2)
+        rise = (1000.0 * np.asarray(Q_kJ_per_mm) / rho_c * theta
+                * np.exp(-np.asarray(y) ** 2 / (4.0 * a * t)) / (2.0 * np.pi * a * t))
+    return T0 + np.where(t > 0, rise, 0.0)
+
+
+def peak_locus(s, thickness, rho_c=RHO_C):
+    """Distance ``y`` (mm) and peak rise per unit heat input (K per J/mm) at ``s``."""
+    theta, slope = _theta(s)
+    y = 2.0 * thickness * np.sqrt(s * (1.0 - slope))
+    rise = theta * np.exp(slope - 1.0) / (2.0 * np.pi * s * thickness ** 2 * rho_c)
+    return y, rise
+
+
+def peak_temperature(y, Q, T0=25.0, thickness=20.0, rho_c=RHO_C, T_melt=T_MELT):
+    """Peak temperature at ``y`` (mm from the centreline) for heat inputs ``Q`` (kJ/mm).
+
+    ``y`` and ``Q`` broadcast: ``peak_temperature(y[None, :], Q[:, None])``
+    gives the whole sweep.  Values are capped at ``T_melt``.
+    """
+    s = np.exp(np.linspace(*_LOG_S, 2000))
+    y_locus, rise = peak_locus(s, thickness, rho_c)
+    log_rise = np.interp(np.log(np.maximum(y, 1e-12)), np.log(y_locus), np.log(rise))
+    return np.minimum(T0 + 1000.0 * np.asarray(Q) * np.exp(log_rise), T_melt)
+
+
+# ============================================================
+# ZONE BOUNDARIES
+# ============================================================
+def zone_boundaries(Q, T0=25.0, thickness=20.0, levels=LEVELS, rho_c=RHO_C):
+    """Distances from the centreline (mm) where the peak temperature equals ``levels``.
+
+    ``boundary`` has shape ``(len(Q), len(levels))`` for heat inputs ``Q`` in
+    kJ/mm.  With the default levels the zone half-widths are returned too:
+    fusion zone, coarse-grain, fine-grain and intercritical HAZ, and the
+    whole HAZ.
+    """
+    Q = np.atleast_1d(np.asarray(Q, dtype=np.float64))
+    levels = np.asarray(levels, dtype=np.float64)
+    target = np.log((levels[None, :] - T0) / (1000.0 * Q[:, None]))
+
+    log_s = bisect(
+        lambda ls: np.log(peak_locus(np.exp(ls), thickness, rho_c)[1]) - target,
+        np.full(target.shape, _LOG_S[0]), np.full(target.shape, _LOG_S[1]),
+    )
+    boundary = peak_locus(np.exp(log_s), thickness, rho_c)[0]
+
+    widths = np.diff(boundary, axis=1) if levels.size == 4 else np.full((Q.size, 3), np.nan)
+    return Zones(
+        Q=Q,
+        boundary=boundary,
+        fusion=boundary[:, 0],
+        cghaz=widths[:, 0],
+        fghaz=widths[:, 1],
+        ichaz=widths[:, 2],
+        haz=boundary[:, -1] - boundary[:, 0],
+    )
+
+
+# ============================================================
+# GRAIN GROWTH
+# ============================================================
+def grain_growth(t, T, d0=GRAIN_D0, n=GRAIN_N, Q=GRAIN_Q, k0=GRAIN_K0, T_min=AC3):
+    """Grain size (µm) along thermal cycles ``T`` (°C) sampled at times ``t`` (s).
+
+    ``T`` has time on its last axis and any number of leading (position)
+    axes; the returned array has the same shape and holds the grain size
+    reached by each sample time.  Growth only counts above ``T_min``.
+    """
+    integral = kernels.cumulative_arrhenius(t, np.asarray(T, dtype=np.float64) + 273.15, k0, Q / R_GAS,
+                                           T_min + 273.15)
+    return (d0 ** n + integral) ** (1.0 / n)
+
+
+def haz_grain_size(Q_kJ_per_mm, thickness, T0=25.0, n_positions=400, n_times=800, t_end=300.0,
+                   **growth):
+    """Final austenite grain size against distance from the weld centreline.
+
+    Single-pass cycles from :func:`mse207.weld.temperature_rise` are
+    evaluated from the centreline out to beyond Ac1; positions that melt
+    are NaN.  ``d_t`` keeps the grain size history for every position.
+    """
+    y_ac1 = zone_boundaries(Q_kJ_per_mm, T0, thickness, levels=(AC1,)).boundary[0, 0]
+    y = np.linspace(0.0, 1.2 * y_ac1, n_positions)
+    t = np.concatenate([[0.0], np.geomspace(1e-3, t_end, n_times - 1)])
+    rise = weld.temperature_rise(y, [0.0], t, [0.0], [0.0], [0.0], 1000.0 * Q_kJ_per_mm, thickness)
+    T = T0 + rise[:, 0, :]
+
+    d_t = grain_growth(t, T, **growth)
+    peak = T.max(axis=-1)
+    d_t[peak >= T_MELT] = np.nan
+    return GrainProfile(y=y, peak=np.minimum(peak, T_MELT), d=d_t[:, -1], t=t, d_t=d_t)
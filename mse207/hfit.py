@@ -0,0 +1,233 @@
+"""Batch inverse fitting of the Newtonian cooling model to measured curves.
+
+Lumped (Newtonian) cooling gives
+
+    T(t) = T_env + (T_0 - T_env) exp(-t / tau),    tau = rho Cp (V/A) / h
+
+A single curve only determines ``tau``, so the fit reports both ways of
+reading it: ``h`` for a part of known ``rho Cp`` and ``V/A``, and the
+effective lumped capacity ``rho Cp V/A = h tau`` for a known ``h``.
+
+Each curve is first fitted on the linearised form
+``ln(T - T_env) = ln(T_0 - T_env) - t / tau`` (weighted least squares, only
+possible when ``T_env`` is known).  Curves without a known ``T_env`` or whose
+linear fit is poor are refitted by nonlinear least squares on
+``(T_0, T_env, 1/tau)``.  :func:`fit_many` spreads the curves over a process
+pool and returns one table row per curve with residuals and outlier flags.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Robust z-score above which a fitted value is flagged as an outlier.
+OUTLIER_Z = 3.5
+
+COLUMNS = [
+    "curve", "method", "T0_C", "T_env_C", "tau_s", "h_W_m2K", "rhoCp_VA_J_m2K",
+    "rms_K", "max_abs_K", "n_points", "outlier", "reason",
+]
+
+
+# ============================================================
+# SINGLE-CURVE FITS
+# ============================================================
+def _model(t, T0, T_env, inv_tau):
+    return T_env + (T0 - T_env) * np.exp(-inv_tau * t)
+
+
+def fit_linear(t, T, T_env, min_excess=0.05):
+    """Weighted log-linear fit; returns ``(T0, inv_tau)`` or ``None``.
+
+    Points within ``min_excess`` of the initial excess temperature are
+    dropped because the logarithm amplifies their noise.
+    """
+    excess = T - T_env
+    keep = excess > min_excess * np.max(excess)
+    if keep.sum() < 3:
+        return None
+    t_k, y = t[keep], np.log(excess[keep])
+    # Weights ~ excess² undo the noise amplification of the logarithm.
+    w = excess[keep]
+    A = np.column_stack([np.ones_like(t_k), -t_k]) * w[:, None]
+    coef, *_ = np.linalg.lstsq(A, y * w, rcond=None)
+    if coef[1] <= 0:
+        return None
+    return T_env + np.exp(coef[0]), coef[1]
+
+
+def fit_nonlinear(t, T, T0=None, T_env=None, inv_tau=None, fix_T_env=False):
+    """Nonlinear least squares on ``(T0, T_env, 1/tau)``; returns the same triple."""
+    from scipy.optimize import least_squares
+
+    T0 = T[0] if T0 is None else T0
+    if T_env is None:
+        T_env = T.min() - 0.05 * (T.max() - T.min())
+    if inv_tau is None:
+        # Time for the excess temperature to fall to 1/e, as a first guess
+        excess = (T - T_env) / max(T0 - T_env, 1e-9)
+        below = np.flatnonzero(excess < np.exp(-1.0))
+        inv_tau = 1.0 / max(t[below[0]] - t[0], 1e-9) if below.size else 1.0 / max(t[-1] - t[0], 1e-9)
+
+    scale = max(T.max() - T.min(), 1.0)
+    if fix_T_env:
+        result = least_squares(
+            lambda p: (_model(t, p[0], T_env, p[1]) - T) / scale,
+            [T0, inv_tau], bounds=([-np.inf, 0.0], [np.inf, np.inf]), x_scale="jac",
+        )
+        return result.x[0], T_env, result.x[1]
+    result = least_squares(
+        lambda p: (_model(t, *p) - T) / scale,
+        [T0, T_env, inv_tau], bounds=([-np.inf, -np.inf, 0.0], [np.inf, np.inf, np.inf]),
+        x_scale="jac",
+    )
+    return tuple(result.x)
+
+
+def fit_curve(t, T, T_env=None, rho_cp=None, v_over_a=None, h=None, exclude=None,
+              linear_tol=0.01):
+    """Fit one cooling curve; returns a dict with the :data:`COLUMNS` fields.
+
+    ``exclude=(T_low, T_high)`` masks a temperature band, typically the
+    solidification range whose latent heat the model does not include.
+    The linear fit is accepted when its RMS residual is below ``linear_tol``
+    times the temperature span.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    T = np.asarray(T, dtype=np.float64)
+    keep = np.isfinite(t) & np.isfinite(T)
+    # Fit from the peak onwards; before it the thermocouple is still heating.
+    keep &= np.arange(T.size) >= np.argmax(np.where(keep, T, -np.inf))
+    if exclude is not None:
+        keep &= (T < exclude[0]) | (T > exclude[1])
+    t, T = t[keep], T[keep]
+    if t.size:
+        t = t - t[0]
+
+    row = {"method": "failed", "n_points": int(T.size)}
+    if T.size < 4:
+        return row
+
+    params = None
+    span = T.max() - T.min()
+    if T_env is not None:
+        linear = fit_linear(t, T, T_env)
+        if linear is not None:
+            T0, inv_tau = linear
+            rms = np.sqrt(np.mean((_model(t, T0, T_env, inv_tau) - T) ** 2))
+            if rms <= linear_tol * span:
+                params, row["method"] = (T0, T_env, inv_tau), "linear"
+            else:
+                params = fit_nonlinear(t, T, T0, T_env, inv_tau, fix_T_env=True)
+                row["method"] = "nonlinear"
+    if params is None:
+        try:
+            params = fit_nonlinear(t, T)
+        except (ValueError, np.linalg.LinAlgError):
+            return row
+        row["method"] = "nonlinear"
+
+    T0, T_env_fit, inv_tau = params
+    residual = _model(t, T0, T_env_fit, inv_tau) - T
+    tau = 1.0 / inv_tau if inv_tau > 0 else np.inf
+    row.update({
+        "T0_C": T0,
+        "T_env_C": T_env_fit,
+        "tau_s": tau,
+        "h_W_m2K": rho_cp * v_over_a / tau if rho_cp and v_over_a else np.nan,
+        "rhoCp_VA_J_m2K": h * tau if h else np.nan,
+        "rms_K": float(np.sqrt(np.mean(residual ** 2))),
+        "max_abs_K": float(np.max(np.abs(residual))),
+    })
+    return row
+
+
+# ============================================================
+# BATCH FITS
+# ============================================================
+def _load_curve(source, block):
+    """``(name, t, T)`` from a path (block-averaged while streaming) or a tuple."""
+    if isinstance(source, (str, os.PathLike)):
+        from mse207 import thermocouple
+
+        summary = thermocouple.summarize_file(os.fspath(source), block=block)
+        return os.path.basename(os.fspath(source)), summary.t, summary.T
+    return source
+
+
+def _fit_job(job):
+    source, block, options = job
+    try:
+        name, t, T = _load_curve(source, block)
+    except (OSError, ValueError) as exc:
+        return {"curve": str(source), "method": "failed", "reason": f"unreadable: {exc}"}
+    row = fit_curve(t, T, **options)
+    row["curve"] = name
+    return row
+
+
+def flag_outliers(table, z=OUTLIER_Z):
+    """Mark rows whose ``log(tau)`` or RMS residual is a robust outlier."""
+    table["outlier"] = False
+    table["reason"] = table["reason"].fillna("").astype(str)
+    failed = table["method"] == "failed"
+    table.loc[failed, "outlier"] = True
+    table.loc[failed & (table["reason"] == ""), "reason"] = "fit failed"
+
+    ok = ~failed
+    for column, transform, label in (("tau_s", np.log, "time constant"), ("rms_K", None, "residual")):
+        values = table.loc[ok, column].astype(float)
+        if transform is not None:
+            values = transform(values)
+        median = np.median(values) if len(values) else np.nan
+        mad = 1.4826 * np.median(np.abs(values - median)) if len(values) else np.nan
+        if not mad > 0:
+            continue
+        score = (values - median) / mad
+        # Only large residuals are suspicious; a time constant can be off either way.
+        bad = score > z if label == "residual" else np.abs(score) > z
+        idx = values.index[bad]
+        table.loc[idx, "outlier"] = True
+        table.loc[idx, "reason"] = [
+            f"{r}; {label} z={s:.1f}" if r else f"{label} z={s:.1f}"
+            for r, s in zip(table.loc[idx, "reason"], score[bad])
+        ]
+    return table
+
+
+def fit_many(sources, T_env=None, rho_cp=None, v_over_a=None, h=None, exclude=None,
+             block=100, workers=None, chunksize=None):
+    """Fit many curves in parallel and return a ``pandas.DataFrame``.
+
+    ``sources`` are file paths (read and block-averaged inside the workers,
+    so the raw samples never cross process boundaries) or ``(name, t, T)``
+    tuples.  ``workers=1`` runs in-process.
+    """
+    import pandas as pd
+
+    options = {"T_env": T_env, "rho_cp": rho_cp, "v_over_a": v_over_a, "h": h, "exclude": exclude}
+    jobs = [(source, block, options) for source in sources]
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+
+    if workers <= 1 or len(jobs) <= 1:
+        rows = [_fit_job(job) for job in jobs]
+    else:
+        chunksize = chunksize or max(1, len(jobs) // (4 * workers))
+        # spawn: the Streamlit server is multi-threaded, which fork does not survive reliably.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            rows = list(pool.map(_fit_job, jobs, chunksize=chunksize))
+
+    table = pd.DataFrame(rows).reindex(columns=COLUMNS)
+    return flag_outliers(table)
+
+
+def fit_files(signatures, **options):
+    """:func:`fit_many` over :func:`mse207.streams.file_signature` tuples.
+
+    Keying a cached call on signatures rather than paths refits a curve
+    whenever its file is rewritten.
+    """
+    return fit_many([signature[0] for signature in signatures], **options)
@@ -0,0 +1,272 @@
+"""Background execution of long simulations for the week pages.
+
+A solver run in the script thread blocks the page, and every slider drag
+queues another rerun behind it.  :func:`submit` hands the work to a
+process-wide thread pool instead (the NumPy/SciPy kernels release the GIL)
+and keeps one job per *slot* in each session: submitting new inputs to a slot
+cancels the job they supersede, so only the latest inputs reach the page.
+
+Solvers cooperate through the ``job`` keyword they are called with::
+
+    def solve(n, job=None):
+        for step in range(n):
+            ...
+            if job is not None:
+                job.progress((step + 1) / n)    # raises Cancelled once superseded
+
+and the page shows the result, polling with a progress bar until it is ready::
+
+    job = jobs.submit("week10_fd", diffusion.crank_nicolson, C0, Cs, D, t, depth)
+    jobs.show(job, lambda result: ...)
+
+Arguments must be plain values: they are compared to tell new inputs from a
+rerun with the same ones.
+
+For progressive refinement the page draws a coarse result computed in the
+script thread straight away, and :func:`progressive` runs the solver on the
+finer levels in the background, publishing each one as it lands.  The
+coarse level is solved only while there is nothing else to draw, and the
+job starts after it::
+
+    job = jobs.submit("slot", jobs.progressive, solve, LEVELS, change, *args,
+                      start=1, tolerance=tol, budget_s=budget)
+    jobs.show(job, render, fallback=lambda: jobs.Refined(solve(*args, **LEVELS[0]), 0, None, None))
+
+Jobs are kept with the session's results (:func:`mse207.sessions.results`),
+so when a session is evicted for being idle or too heavy its jobs are
+cancelled and their results dropped; the page resubmits on its next rerun.
+
+Configuration (environment variables):
+
+    MSE207_JOB_WORKERS    pool size (default: CPU count, at least 2)
+"""
+
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from mse207 import metrics, sessions
+
+WORKERS = int(os.environ.get("MSE207_JOB_WORKERS", "0")) or max(2, os.cpu_count() or 1)
+POLL_SECONDS = 0.25
+
+_STATE_KEY = "_mse207_jobs"
+
+# A result from progressive(): the level it came from, its change from the
+# previous level, and why refinement stopped (None while still refining).
+Refined = namedtuple("Refined", "result level change stopped")
+
+metrics.REGISTRY.help.update({
+    "mse207_jobs_total": "Background jobs by slot and outcome (completed, cancelled, failed).",
+    "mse207_job_seconds": "Wall time of completed background jobs.",
+})
+
+
+class Cancelled(Exception):
+    """Raised inside a solver whose job has been superseded."""
+
+
+class Job:
+    """Handle on one background run: progress, cancellation and result."""
+
+    def __init__(self, slot, key):
+        self.slot = slot
+        self.key = key
+        self.fraction = 0.0
+        self.message = ""
+        self.elapsed = None
+        self.future = None
+        self.partial = None
+        self.revision = 0
+        self._cancel = threading.Event()
+        self._started = time.perf_counter()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    def cancel(self):
+        if self._cancel.is_set() or self.done:
+            return
+        self._cancel.set()
+        self.future.cancel()
+        metrics.REGISTRY.inc("mse207_jobs_total", {"slot": self.slot, "result": "cancelled"})
+
+    def progress(self, fraction, message=""):
+        """Report progress from the solver; raises :class:`Cancelled` once superseded."""
+        if self._cancel.is_set():
+            raise Cancelled
+        self.fraction = min(max(float(fraction), 0.0), 1.0)
+        self.message = message
+
+    def publish(self, partial):
+        """Make an intermediate result available to the page."""
+        self.partial = partial
+        self.revision += 1
+
+    def result(self):
+        return self.future.result()
+
+
+class _Stage:
+    """Maps a solver's 0–1 progress onto one level of a progressive run."""
+
+    def __init__(self, job, index, count):
+        self.job, self.index, self.count = job, index, count
+
+    def progress(self, fraction, message=""):
+        if self.job is not None:
+            note = f"level {self.index + 1} of {self.count}"
+            self.job.progress((self.index + fraction) / self.count,
+                              f"{note}: {message}" if message else note)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _executor():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="mse207-job")
+        return _pool
+
+
+def _run(job, fn, args, kwargs):
+    try:
+        result = fn(*args, job=job, **kwargs)
+    except Cancelled:
+        return None
+    except Exception:
+        metrics.REGISTRY.inc("mse207_jobs_total", {"slot": job.slot, "result": "failed"})
+        raise
+    job.elapsed = time.perf_counter() - job._started
+    job.fraction = 1.0
+    metrics.REGISTRY.inc("mse207_jobs_total", {"slot": job.slot, "result": "completed"})
+    metrics.REGISTRY.observe("mse207_job_seconds", {"slot": job.slot}, job.elapsed)
+    return result
+
+
+# ============================================================
+# PROGRESSIVE REFINEMENT
+# ============================================================
+def progressive(solve, levels, change, *args, start=0, tolerance=None, budget_s=None, job=None, **kwargs):
+    """Run ``solve(*args, **level, **kwargs)`` for each dict in ``levels``, coarse to fine.
+
+    Levels before ``start`` are skipped (the page has drawn them already).
+    Every level run is published to ``job`` as a :class:`Refined`.
+    Refinement stops after the last level, once ``change(previous, current)``
+    falls below ``tolerance``, or when the next level is predicted (from the
+    growth in cost so far) to end past ``budget_s`` seconds.
+    """
+    started = time.perf_counter()
+    previous, costs = None, []
+    for index in range(start, len(levels)):
+        t0 = time.perf_counter()
+        stage = _Stage(job, index - start, len(levels) - start)
+        result = solve(*args, job=stage, **levels[index], **kwargs)
+        costs.append(time.perf_counter() - t0)
+        delta = None if previous is None else change(previous, result)
+
+        stopped = None
+        if index == len(levels) - 1:
+            stopped = "finest level"
+        elif tolerance is not None and delta is not None and delta <= tolerance:
+            stopped = "converged"
+        elif budget_s is not None:
+            growth = costs[-1] / costs[-2] if len(costs) > 1 and costs[-2] > 0 else 4.0
+            if time.perf_counter() - started + costs[-1] * growth > budget_s:
+                stopped = "time budget"
+
+        refined = Refined(result, index, delta, stopped)
+        if job is not None:
+            job.publish(refined)
+        if stopped:
+            return refined
+        previous = result
+
+
+# ============================================================
+# PAGE API
+# ============================================================
+def _cancel_all(slots):
+    for job in list(slots.values()):
+        job.cancel()
+
+
+sessions.on_release(_STATE_KEY, _cancel_all)
+
+
+def submit(slot, fn, *args, **kwargs):
+    """Run ``fn(*args, job=..., **kwargs)`` in the pool as this session's ``slot``.
+
+    Returns the running job when the inputs are unchanged; otherwise cancels
+    it and starts a new one.
+    """
+    jobs = sessions.results().setdefault(_STATE_KEY, {})
+    key = (fn.__module__, fn.__qualname__, args, tuple(sorted(kwargs.items())))
+    current = jobs.get(slot)
+    if current is not None and not current.cancelled and current.key == key:
+        return current
+    if current is not None:
+        current.cancel()
+
+    job = Job(slot, key)
+    job.future = _executor().submit(_run, job, fn, args, kwargs)
+    jobs[slot] = job
+    return job
+
+
+def cancel(slot):
+    """Cancel this session's job in ``slot``, if any."""
+    job = sessions.results().get(_STATE_KEY, {}).pop(slot, None)
+    if job is not None:
+        job.cancel()
+
+
+def show(job, render, label="Running simulation", fallback=None):
+    """Call ``render(result)`` once ``job`` is done; until then show its progress.
+
+    While the job runs, the latest published partial result (or
+    ``fallback``) is rendered instead, and a fragment polls the job every
+    :data:`POLL_SECONDS`.  A new partial or the final result triggers a full
+    rerun, so the page redraws with it; polling stops once the job is done.
+    A callable ``fallback`` is only called when it is drawn.
+    """
+    if job.done:
+        _render(job, render)
+        return
+
+    shown = job.revision
+    current = job.partial if job.partial is not None else fallback
+    if callable(current):
+        current = current()
+    if current is not None:
+        render(current)
+
+    @st.fragment(run_every=POLL_SECONDS)
+    def poll():
+        if job.done or job.revision != shown:
+            st.rerun()
+        text = f"{label} … {job.fraction:.0%}"
+        st.progress(job.fraction, text=f"{text} ({job.message})" if job.message else text)
+
+    poll()
+
+
+def _render(job, render):
+    try:
+        result = job.result()
+    except Exception as exc:
+        st.error(f"Simulation failed: {exc}")
+        return
+    render(result)
@@ -0,0 +1,404 @@
+"""Inner loops of the solvers, compiled with numba when it is installed.
+
+Some of the week models are sequential at heart: a Crank–Nicolson step needs
+the previous one, a tridiagonal solve sweeps down and back up, and the Scheil
+sum and JMAK fraction of a cooling path depend on every earlier sample.
+NumPy can only vectorise these across independent rows, and even then each
+step allocates a handful of temporaries.  The week models draw no Monte
+Carlo samples, so the per-sample loop here is the Scheil/JMAK stepping of
+each cooling path.  Every kernel here has
+
+* a NumPy implementation, always available, which is the code the solvers
+  used before; and
+* a plain-loop implementation, compiled by ``numba.njit`` if numba imports.
+
+The module-level functions dispatch to the compiled loops when
+:data:`BACKEND` is ``"numba"``.  Compiled machine code is written to
+``<cache dir>/numba`` (see :mod:`mse207.diskcache`), so only the first
+process on a machine pays the compile time and the others load it in
+milliseconds.  Kernels compile on first call, never at import.
+
+    python -m mse207.kernels            # time every kernel on both backends
+
+Configuration (environment variables):
+
+    MSE207_KERNELS   "auto" (numba if installed, the default), "numba" or "numpy"
+"""
+
+import argparse
+import contextlib
+import math
+import os
+import time
+
+import numpy as np
+from scipy.linalg import solve_banded
+
+from mse207 import diskcache
+
+
+def _load_numba():
+    choice = os.environ.get("MSE207_KERNELS", "auto").lower()
+    if choice == "numpy":
+        return None
+    if diskcache.CACHE_DIR:
+        os.environ.setdefault("NUMBA_CACHE_DIR", os.path.abspath(os.path.join(diskcache.CACHE_DIR, "numba")))
+    try:
+        import numba
+    except ImportError:
+        if choice == "numba":
+            raise
+        return None
+    return numba
+
+
+_numba = _load_numba()
+BACKEND = "numba" if _numba is not None else "numpy"
+
+
+def _jit(fn):
+    """Compile ``fn`` lazily with numba; without numba it stays a Python function."""
+    if _numba is None:
+        return fn
+    return _numba.njit(cache=True, nogil=True)(fn)
+
+
+@contextlib.contextmanager
+def use(backend):
+    """Run the block with ``backend`` ("numpy" or "numba"); for benchmarks and checks."""
+    global BACKEND
+    if backend == "numba" and _numba is None:
+        raise RuntimeError("numba is not installed")
+    previous, BACKEND = BACKEND, backend
+    try:
+        yield
+    finally:
+        BACKEND = previous
+
+
+# ============================================================
+# TRIDIAGONAL SYSTEMS
+# ============================================================
+@_jit
+def _thomas_into(lower, diag, upper, rhs, out, scratch):
+    """Thomas algorithm for one system; ``lower[0]`` and ``upper[-1]`` are ignored."""
+    n = diag.size
+    scratch[0] = upper[0] / diag[0]
+    out[0] = rhs[0] / diag[0]
+    for i in range(1, n):
+        pivot = diag[i] - lower[i] * scratch[i - 1]
+        scratch[i] = upper[i] / pivot
+        out[i] = (rhs[i] - lower[i] * out[i - 1]) / pivot
+    for i in range(n - 2, -1, -1):
+        out[i] -= scratch[i] * out[i + 1]
+
+
+@_jit
+def _thomas_loops(lower, diag, upper, rhs):
+    out = np.empty_like(rhs)
+    scratch = np.empty(rhs.shape[1])
+    for k in range(rhs.shape[0]):
+        _thomas_into(lower[k], diag[k], upper[k], rhs[k], out[k], scratch)
+    return out
+
+
+def _thomas_numpy(lower, diag, upper, rhs):
+    if rhs.shape[0] == 1:
+        bands = np.stack([np.roll(upper[0], 1), diag[0], np.roll(lower[0], -1)])
+        return solve_banded((1, 1), bands, rhs[0], check_finite=False)[None]
+    # Sweep the rows, vectorised across the systems
+    n = rhs.shape[1]
+    out, scratch = np.empty_like(rhs), np.empty_like(rhs)
+    scratch[:, 0] = upper[:, 0] / diag[:, 0]
+    out[:, 0] = rhs[:, 0] / diag[:, 0]
+    for i in range(1, n):
+        pivot = diag[:, i] - lower[:, i] * scratch[:, i - 1]
+        scratch[:, i] = upper[:, i] / pivot
+        out[:, i] = (rhs[:, i] - lower[:, i] * out[:, i - 1]) / pivot
+    for i in range(n - 2, -1, -1):
+        out[:, i] -= scratch[:, i] * out[:, i + 1]
+    return out
+
+
+def thomas(lower, diag, upper, rhs):
+    """Solve tridiagonal systems along the last axis (leading axes are a batch).
+
+    Row ``i`` reads ``lower[i] x[i-1] + diag[i] x[i] + upper[i] x[i+1] = rhs[i]``.
+    No pivoting: the matrices must be diagonally dominant, as implicit
+    diffusion and conduction matrices are.
+    """
+    rhs = np.asarray(rhs, dtype=np.float64)
+    bands = [np.ascontiguousarray(np.broadcast_to(b, rhs.shape), dtype=np.float64).reshape(-1, rhs.shape[-1])
+             for b in (lower, diag, upper)]
+    flat = np.ascontiguousarray(rhs).reshape(-1, rhs.shape[-1])
+    solve = _thomas_loops if BACKEND == "numba" else _thomas_numpy
+    return solve(*bands, flat).reshape(rhs.shape)
+
+
+# ============================================================
+# CRANK–NICOLSON STEPS
+# ============================================================
+def _crank_nicolson_numpy(C, C0, Cs, D, D_ratio, r, first, steps, implicit_steps):
+    nx = C.size
+    for step in range(first, first + steps):
+        theta = 1.0 if step < implicit_steps else 0.5
+        if D_ratio == 1.0 or Cs == C0:
+            D_node = np.full_like(C, D)
+        else:
+            D_node = D * D_ratio ** np.clip((C - C0) / (Cs - C0), 0.0, 1.0)
+        # Face diffusivities and the explicit operator L C on interior nodes
+        D_face = 0.5 * (D_node[1:] + D_node[:-1]) * r
+        west, east = D_face[:-1], D_face[1:]
+        flux = east * (C[2:] - C[1:-1]) - west * (C[1:-1] - C[:-2])
+
+        rhs = C[1:-1] + (1.0 - theta) * flux
+        rhs[0] += theta * west[0] * C[0]
+        rhs[-1] += theta * east[-1] * C[-1]
+        bands = np.zeros((3, nx - 2))
+        bands[0, 1:] = -theta * east[:-1]
+        bands[1] = 1.0 + theta * (west + east)
+        bands[2, :-1] = -theta * west[1:]
+        C[1:-1] = solve_banded((1, 1), bands, rhs, check_finite=False)
+
+
+@_jit
+def _crank_nicolson_loops(C, C0, Cs, D, D_ratio, r, first, steps, implicit_steps):
+    nx = C.size
+    n = nx - 2
+    variable = D_ratio != 1.0 and Cs != C0
+    D_node = np.full(nx, D)
+    lower, diag, upper = np.empty(n), np.empty(n), np.empty(n)
+    rhs, scratch = np.empty(n), np.empty(n)
+    for step in range(first, first + steps):
+        theta = 1.0 if step < implicit_steps else 0.5
+        if variable:
+            for i in range(nx):
+                s = min(max((C[i] - C0) / (Cs - C0), 0.0), 1.0)
+                D_node[i] = D * D_ratio ** s
+        for k in range(n):
+            i = k + 1
+            west = 0.5 * (D_node[i - 1] + D_node[i]) * r
+            east = 0.5 * (D_node[i] + D_node[i + 1]) * r
+            lower[k] = -theta * west
+            upper[k] = -theta * east
+            diag[k] = 1.0 + theta * (west + east)
+            rhs[k] = C[i] + (1.0 - theta) * (east * (C[i + 1] - C[i]) - west * (C[i] - C[i - 1]))
+        rhs[0] -= lower[0] * C[0]
+        rhs[n - 1] -= upper[n - 1] * C[nx - 1]
+        _thomas_into(lower, diag, upper, rhs, C[1:nx - 1], scratch)
+
+
+def crank_nicolson_steps(C, C0, Cs, D, D_ratio, r, first, steps, implicit_steps):
+    """Advance profile ``C`` in place by ``steps`` steps of ``r = dt / dx²``.
+
+    The end values of ``C`` are held.  The steps are numbered from
+    ``first``, and those numbered below ``implicit_steps`` are fully implicit; the
+    diffusivity is interpolated geometrically from ``D`` at ``C0`` to
+    ``D · D_ratio`` at ``Cs`` and lagged one step.
+    """
+    step = _crank_nicolson_loops if BACKEND == "numba" else _crank_nicolson_numpy
+    step(C, float(C0), float(Cs), float(D), float(D_ratio), float(r), int(first), int(steps), int(implicit_steps))
+
+
+# ============================================================
+# CUMULATIVE ARRHENIUS INTEGRAL
+# ============================================================
+def _cumulative_arrhenius_numpy(t, T_K, k0, Q_R, T_min_K):
+    rate = np.where(T_K >= T_min_K, k0 * np.exp(-Q_R / T_K), 0.0)
+    steps = 0.5 * (rate[:, 1:] + rate[:, :-1]) * np.diff(t)
+    return np.concatenate([np.zeros((rate.shape[0], 1)), np.cumsum(steps, axis=-1)], axis=-1)
+
+
+@_jit
+def _cumulative_arrhenius_loops(t, T_K, k0, Q_R, T_min_K):
+    out = np.empty_like(T_K)
+    for row in range(T_K.shape[0]):
+        total, previous = 0.0, 0.0
+        for j in range(T_K.shape[1]):
+            rate = k0 * math.exp(-Q_R / T_K[row, j]) if T_K[row, j] >= T_min_K else 0.0
+            if j > 0:
+                total += 0.5 * (rate + previous) * (t[j] - t[j - 1])
+            out[row, j] = total
+            previous = rate
+    return out
+
+
+def cumulative_arrhenius(t, T_K, k0, Q_R, T_min_K):
+    """``∫ k0 exp(-Q_R / T) dt`` from the first sample, counted above ``T_min_K``.
+
+    ``Q_R`` is the activation energy over the gas constant (K).
+
+    ``T_K`` (K) has time on its last axis, sampled at the shared times ``t``;
+    the trapezoid integral to every sample has the shape of ``T_K``.
+    """
+    T_K = np.asarray(T_K, dtype=np.float64)
+    flat = np.ascontiguousarray(T_K).reshape(-1, T_K.shape[-1])
+    integrate = _cumulative_arrhenius_loops if BACKEND == "numba" else _cumulative_arrhenius_numpy
+    return integrate(np.asarray(t, dtype=np.float64), flat, float(k0), float(Q_R), float(T_min_K)).reshape(T_K.shape)
+
+
+# ============================================================
+# SCHEIL + JMAK ALONG COOLING PATHS
+# ============================================================
+def _jmak_step(X, tau, n, dt, start_fraction):
+    """Advance JMAK fraction ``X`` by ``dt`` at a temperature with start time ``tau``."""
+    k = -np.log(1.0 - start_fraction) / tau ** n
+    X = np.clip(X, 0.0, 1.0 - 1e-12)
+    t_fictitious = (-np.log(1.0 - X) / k) ** (1.0 / n)
+    return 1.0 - np.exp(-k * (t_fictitious + dt) ** n)
+
+
+def _scheil_jmak_numpy(dt, index, start, tau_fp_table, tau_b_table, n_fp, n_b, start_fraction):
+    n_paths = dt.shape[0]
+    S_fp, S_b = np.zeros(n_paths), np.zeros(n_paths)
+    X_fp, X_b = np.zeros(n_paths), np.zeros(n_paths)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for j in range(dt.shape[1]):
+            cooling = j >= start
+            tau_fp, tau_b = tau_fp_table[index[:, j]], tau_b_table[index[:, j]]
+            step = dt[:, j]
+
+            S_fp += np.where(cooling, step / tau_fp, 0.0)
+            grow = cooling & (S_fp >= 1.0) & np.isfinite(tau_fp)
+            if grow.any():
+                X_fp = np.where(grow, _jmak_step(np.maximum(X_fp, start_fraction), tau_fp, n_fp, step,
+                                                 start_fraction), X_fp)
+
+            S_b += np.where(cooling, step / tau_b, 0.0)
+            grow = cooling & (S_b >= 1.0) & np.isfinite(tau_b)
+            if grow.any():
+                X_b = np.where(grow, _jmak_step(np.maximum(X_b, start_fraction), tau_b, n_b, step,
+                                                start_fraction), X_b)
+    return X_fp, X_b
+
+
+@_jit
+def _jmak_scalar(X, tau, n, dt, start_fraction):
+    k = -math.log(1.0 - start_fraction) / tau ** n
+    X = min(max(X, start_fraction), 1.0 - 1e-12)
+    t_fictitious = (-math.log(1.0 - X) / k) ** (1.0 / n)
+    return 1.0 - math.exp(-k * (t_fictitious + dt) ** n)
+
+
+@_jit
+def _scheil_jmak_loops(dt, index, start, tau_fp_table, tau_b_table, n_fp, n_b, start_fraction):
+    n_paths = dt.shape[0]
+    X_fp, X_b = np.zeros(n_paths), np.zeros(n_paths)
+    for p in range(n_paths):
+        S_fp, S_b, x_fp, x_b = 0.0, 0.0, 0.0, 0.0
+        for j in range(start[p], dt.shape[1]):
+            tau_fp, tau_b = tau_fp_table[index[p, j]], tau_b_table[index[p, j]]
+            step = dt[p, j]
+            if math.isfinite(tau_fp):
+                S_fp += step / tau_fp
+                if S_fp >= 1.0:
+                    x_fp = _jmak_scalar(x_fp, tau_fp, n_fp, step, start_fraction)
+            if math.isfinite(tau_b):
+                S_b += step / tau_b
+                if S_b >= 1.0:
+                    x_b = _jmak_scalar(x_b, tau_b, n_b, step, start_fraction)
+        X_fp[p], X_b[p] = x_fp, x_b
+    return X_fp, X_b
+
+
+def scheil_jmak(dt, index, start, tau_fp_table, tau_b_table, n_fp, n_b, start_fraction):
+    """Ferrite/pearlite and bainite fractions at the end of each cooling path.
+
+    ``dt`` and ``index`` (into the ``tau`` tables) have one row per path and
+    one column per step; kinetics begin at column ``start`` of each path.
+    See :mod:`mse207.transform`.
+    """
+    args = (np.ascontiguousarray(dt, dtype=np.float64), np.ascontiguousarray(index, dtype=np.intp),
+            np.asarray(start, dtype=np.intp), tau_fp_table, tau_b_table,
+            float(n_fp), float(n_b), float(start_fraction))
+    return (_scheil_jmak_loops if BACKEND == "numba" else _scheil_jmak_numpy)(*args)
+
+
+# ============================================================
+# BENCHMARK
+# ============================================================
+def _cases():
+    """``(name, run)`` pairs on inputs the week pages actually produce."""
+    from mse207 import haz, transform
+
+    rng = np.random.default_rng(0)
+    n_sys, n = 2000, 200
+    lower, upper = -rng.random((n_sys, n)), -rng.random((n_sys, n))
+    diag, rhs = 2.5 + rng.random((n_sys, n)), rng.random((n_sys, n))
+
+    def fd():
+        C = np.full(400, 0.2)
+        C[0] = 1.0
+        crank_nicolson_steps(C, 0.2, 1.0, 1e-11, 5.0, 14400.0 / 2000 / (2e-3 / 399) ** 2, 0, 2000, 4)
+        return C
+
+    t = np.concatenate([[0.0], np.geomspace(1e-3, 300.0, 799)])
+    T_K = 273.15 + 25.0 + 1400.0 * np.exp(-t[None, :] / rng.uniform(5.0, 60.0, (400, 1))) \
+        * (1.0 - np.exp(-t[None, :] / 0.5))
+
+    steel = transform.C_MN_STEEL
+    tau_fp, tau_b = transform.incubation_table(steel)
+    u = np.linspace(0.0, 6.0, 600)
+    tau = rng.uniform(1.0, 200.0, 2000)
+    dt = np.diff(tau[:, None] * u[None, :], axis=1)
+    T_path = 25.0 + 855.0 * np.exp(-u)
+    index = np.broadcast_to(np.clip(0.5 * (T_path[1:] + T_path[:-1]), 0, steel.Ae3).astype(np.intp), dt.shape)
+    start = np.zeros(2000, dtype=np.intp)
+
+    return [
+        ("thomas (2,000 systems × 200)", lambda: thomas(lower, diag, upper, rhs)),
+        ("crank_nicolson_steps (400 nodes × 2,000 steps)", fd),
+        ("cumulative_arrhenius (400 cycles × 800)",
+         lambda: cumulative_arrhenius(t, T_K, haz.GRAIN_K0, haz.GRAIN_Q / haz.R_GAS, haz.AC3 + 273.15)),
+        ("scheil_jmak (2,000 paths × 600)",
+         lambda: np.stack(scheil_jmak(dt, index, start, tau_fp, tau_b, steel.fp_n, steel.bainite_n, 0.01))),
+    ]
+
+
+def _best(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - started)
+    return min(times), result
+
+
+def benchmark(repeat=3):
+    """Rows of ``(kernel, numpy_s, first_call_s, numba_s, max_difference)``.
+
+    ``first_call_s`` includes compiling or loading the cached machine code;
+    the numba columns are None without numba.
+    """
+    rows = []
+    for name, fn in _cases():
+        with use("numpy"):
+            numpy_s, expected = _best(fn, repeat)
+        first_s = numba_s = difference = None
+        if _numba is not None:
+            with use("numba"):
+                first_s, _ = _best(fn, 1)
+                numba_s, result = _best(fn, repeat)
+            difference = float(np.nanmax(np.abs(result - expected)))
+        rows.append((name, numpy_s, first_s, numba_s, difference))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per kernel; the best is kept")
+    args = parser.parse_args(argv)
+
+    if _numba is None:
+        print("numba is not installed (or MSE207_KERNELS=numpy): timing the NumPy kernels only")
+    print(f"{'kernel':<50}{'numpy':>10}{'numba 1st':>11}{'numba':>10}{'speedup':>9}{'max diff':>10}")
+    for name, numpy_s, first_s, numba_s, difference in benchmark(args.repeat):
+        line = f"{name:<50}{numpy_s * 1e3:>8.1f}ms"
+        if numba_s is not None:
+            line += (f"{first_s * 1e3:>9.1f}ms{numba_s * 1e3:>8.1f}ms{numpy_s / numba_s:>8.1f}x"
+                     f"{difference:>10.1e}")
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Concurrent-session load test for the week 8, 9 and 10 apps.
+
+Each simulated student is a headless ``streamlit.testing.v1.AppTest`` session
+that replays a slider-drag script against one app.  All sessions of a level
+run concurrently in this process, as they would on one server, and the
+report gives reruns per second, rerun latency percentiles and the growth of
+the process RSS as concurrency rises.
+
+    python -m mse207.loadtest --sessions 1,5,10,25 --drags 4
+    python -m mse207.loadtest --apps week9 --sessions 20 --json report.json
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APPS = {
+    "week8": "app_mse207_v8.py",
+    "week9": "app_mse207_v9.py",
+    "week10": "app_mse207_v10_1.py",
+}
+
+# Scenario steps: ("slider", label, low, high) drags a slider to a random
+# target in [low, high]; ("sidebar", label, option) and ("select", label,
+# option) pick a selectbox option, in the sidebar or the main area.
+SCENARIOS = {
+    "week8": [
+        ("slider", "Convective Coefficient h (W/m²K)", 5.0, 200.0),
+        ("slider", "Initial Temperature (°C)", 600, 1200),
+        ("slider", "Melting Temperature (°C)", 400, 900),
+        ("slider", "Heat Capacity Cp (J/kg·K)", 200, 1200),
+    ],
+    "week9": [
+        ("sidebar", "Go to section", "Heat Input Simulation"),
+        ("slider", "Welding Current I (amps)", 50, 350),
+        ("slider", "Travel Speed v (mm/s)", 2.0, 20.0),
+        ("sidebar", "Go to section", "Weld Thermal Profile"),
+        ("slider", "Assumed Heat Input Q (kJ/mm)", 0.2, 3.0),
+        ("slider", "Thermal Width Parameter w (mm)", 3.0, 30.0),
+        ("sidebar", "Go to section", "Solved Examples"),
+        ("select", "Select example", "Example 4 – HAZ Width Comparison"),
+        ("sidebar", "Go to section", "Quiz"),
+    ],
+    "week10": [
+        ("slider", "Diffusion time (hours)", 0.5, 10.0),
+        ("slider", "Maximum depth (mm)", 0.2, 5.0),
+        ("slider", "Surface concentration Cₛ (wt.%)", 0.1, 2.0),
+        ("slider", "Activation energy Q (kJ/mol)", 50.0, 300.0),
+    ],
+}
+
+
+# ============================================================
+# MEMORY
+# ============================================================
+def rss_bytes():
+    """Current resident set size of this process (peak RSS off Linux)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+# ============================================================
+# ONE SIMULATED SESSION
+# ============================================================
+def _find(widgets, label):
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    raise LookupError(f"no widget labelled {label!r}")
+
+
+def _drag_values(slider, target, frames):
+    """Values a slider passes through while being dragged to ``target``."""
+    start = float(slider.value)
+    step = float(slider.step or 1.0)
+    values = []
+    for value in np.linspace(start, target, frames + 1)[1:]:
+        value = slider.min + round((value - slider.min) / step) * step
+        value = min(max(value, slider.min), slider.max)
+        values.append(type(slider.value)(round(value, 10)))
+    return values
+
+
+def run_session(app, seed, drags, frames, timeout):
+    """Replay ``drags`` passes of the app's scenario; return rerun latencies."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    latencies = []
+
+    at = AppTest.from_file(os.path.join(ROOT, APPS[app]), default_timeout=timeout)
+    started = time.perf_counter()
+    at.run()
+    latencies.append(time.perf_counter() - started)
+
+    for _ in range(drags):
+        for step in SCENARIOS[app]:
+            kind, label = step[0], step[1]
+            if kind == "slider":
+                slider = _find(at.slider, label)
+                actions = [(slider, v) for v in _drag_values(slider, rng.uniform(step[2], step[3]), frames)]
+            elif kind == "sidebar":
+                actions = [(_find(at.sidebar.selectbox, label), step[2])]
+            else:
+                actions = [(_find(at.selectbox, label), step[2])]
+
+            for widget, value in actions:
+                widget.set_value(value)
+                started = time.perf_counter()
+                at.run()
+                latencies.append(time.perf_counter() - started)
+                if at.exception:
+                    raise RuntimeError(f"{app}: {at.exception[0].value}")
+    return latencies
+
+
+# ============================================================
+# CONCURRENCY LEVELS
+# ============================================================
+def run_level(app, sessions, drags, frames, timeout):
+    """Run ``sessions`` concurrent sessions of ``app`` and summarise them."""
+    rss_before = rss_bytes()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix=f"load-{app}") as pool:
+        futures = [
+            pool.submit(run_session, app, seed, drags, frames, timeout)
+            for seed in range(sessions)
+        ]
+        results = [future.result() for future in futures]
+    wall = time.perf_counter() - started
+    rss_after = rss_bytes()
+
+    latencies = np.concatenate([np.asarray(r) for r in results])
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    return {
+        "app": app,
+        "sessions": sessions,
+        "reruns": int(latencies.size),
+        "wall_s": wall,
+        "reruns_per_s": latencies.size / wall,
+        "p50_ms": p50 * 1e3,
+        "p90_ms": p90 * 1e3,
+        "p99_ms": p99 * 1e3,
+        "max_ms": latencies.max() * 1e3,
+        "rss_mb": rss_after / 2**20,
+        "rss_growth_mb": (rss_after - rss_before) / 2**20,
+        "threads": threading.active_count(),
+    }
+
+
+def format_report(rows):
+    header = (f"{'app':<7} {'sess':>5} {'reruns':>7} {'rerun/s':>8} {'p50 ms':>8} "
+              f"{'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'RSS MB':>8} {'ΔRSS MB':>8}")
+    lines = [header, "-" * len(header)]
+    for r in rows:
+        lines.append(
+            f"{r['app']:<7} {r['sessions']:>5} {r['reruns']:>7} {r['reruns_per_s']:>8.1f} "
+            f"{r['p50_ms']:>8.1f} {r['p90_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f} "
+            f"{r['rss_mb']:>8.1f} {r['rss_growth_mb']:>+8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--apps", default=",".join(APPS),
+                        help="comma-separated apps to drive (default: all)")
+    parser.add_argument("--sessions", default="1,2,5,10",
+                        help="comma-separated concurrency levels (default: 1,2,5,10)")
+    parser.add_argument("--drags", type=int, default=2,
+                        help="passes through each app's scenario per session")
+    parser.add_argument("--frames", type=int, default=5,
+                        help="intermediate reruns per slider drag")
+    parser.add_argument("--timeout", type=float, default=60.0,
+                        help="per-rerun timeout in seconds")
+    parser.add_argument("--json", help="also write the report rows to this file")
+    args = parser.parse_args(argv)
+
+    # The harness measures the apps, not the exporters.
+    os.environ.setdefault("MSE207_METRICS_PORT", "0")
+    os.environ.setdefault("MSE207_METRICS_FILE", "")
+    sys.path.insert(0, ROOT)
+
+    apps = [a.strip() for a in args.apps.split(",") if a.strip()]
+    levels = [int(n) for n in args.sessions.split(",")]
+    unknown = [a for a in apps if a not in APPS]
+    if unknown:
+        parser.error(f"unknown app(s): {', '.join(unknown)}; choose from {', '.join(APPS)}")
+
+    rows = []
+    for app in apps:
+        for sessions in levels:
+            row = run_level(app, sessions, args.drags, args.frames, args.timeout)
+            rows.append(row)
+            print(format_report([row]).splitlines()[-1], flush=True)
+
+    print()
+    print(format_report(rows))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(rows, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
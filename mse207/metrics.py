@@ -0,0 +1,319 @@
+"""Local metrics for the MSE207 lecture apps.
+
+Records per-app and per-section rerun latency histograms, active sessions,
+per-session memory estimates, figure renders and cache hit ratios.  Session
+accounting and the eviction of idle sessions live in :mod:`mse207.sessions`,
+which runs at the end of every rerun.  Each finished rerun is appended to a JSON-lines file and the current totals are
+served as Prometheus text on a local port, so a scraper on the same host can
+read them without any external service.
+
+Configuration (environment variables):
+
+    MSE207_METRICS_FILE   JSON-lines output file (default "metrics.jsonl",
+                          empty string disables the file)
+    MSE207_METRICS_PORT   Prometheus port on 127.0.0.1 (default 9207, 0 disables)
+
+Usage inside an app script::
+
+    run = metrics.start_rerun("week8")
+    run.section("theory")
+    ...
+    run.section("simulation")
+    st.pyplot(fig)
+    run.figure_rendered()
+    ...
+    run.finish()
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mse207 import sessions
+
+METRICS_FILE = os.environ.get("MSE207_METRICS_FILE", "metrics.jsonl")
+METRICS_PORT = int(os.environ.get("MSE207_METRICS_PORT", "9207"))
+
+# A session counts as active if it reran within this many seconds.
+SESSION_ACTIVE_SECONDS = 300.0
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MEMORY_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9)
+
+
+# ============================================================
+# METRIC TYPES
+# ============================================================
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+
+class Registry:
+    """Thread-safe store of counters, gauges and histograms keyed by labels."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.help = {}
+
+    def inc(self, name, labels, amount=1.0):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0.0) + amount
+
+    def set(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.gauges[key] = value
+
+    def observe(self, name, labels, value, buckets=LATENCY_BUCKETS):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = Histogram(buckets)
+            hist.observe(value)
+
+    def counter_value(self, name, labels):
+        with self.lock:
+            return self.counters.get((name, tuple(sorted(labels.items()))), 0.0)
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self.lock:
+            families = {}
+            for (name, labels), value in self.counters.items():
+                families.setdefault((name, "counter"), []).append((labels, value))
+            for (name, labels), value in self.gauges.items():
+                families.setdefault((name, "gauge"), []).append((labels, value))
+            for (name, labels), hist in self.histograms.items():
+                families.setdefault((name, "histogram"), []).append((labels, hist))
+
+            for (name, kind), samples in sorted(families.items()):
+                if name in self.help:
+                    lines.append(f"# HELP {name} {self.help[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(samples, key=lambda s: s[0]):
+                    if kind != "histogram":
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                        continue
+                    for upper, count in zip(value.buckets, value.counts):
+                        le = labels + (("le", _format_value(upper)),)
+                        lines.append(f"{name}_bucket{_format_labels(le)} {count}")
+                    inf = labels + (("le", "+Inf"),)
+                    lines.append(f"{name}_bucket{_format_labels(inf)} {value.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value.total)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value):
+    return repr(float(value))
+
+
+REGISTRY = Registry()
+REGISTRY.help.update({
+    "mse207_rerun_seconds": "Wall time of a full script rerun.",
+    "mse207_section_seconds": "Wall time spent in one section of a script rerun.",
+    "mse207_active_sessions": f"Sessions that reran within the last {SESSION_ACTIVE_SECONDS:.0f} s.",
+    "mse207_session_memory_bytes": "Estimated bytes held by a session (state and results) at the end of a rerun.",
+    "mse207_sessions_tracked": "Sessions whose results are held in memory.",
+    "mse207_session_results_bytes": "Estimated bytes of results held by all sessions together.",
+    "mse207_session_evictions_total": "Sessions whose results were dropped, by policy (idle, memory).",
+    "mse207_session_evicted_bytes_total": "Estimated bytes of session results dropped, by policy.",
+    "mse207_figures_rendered_total": "Figures rendered to the browser.",
+    "mse207_cache_requests_total": "Cache lookups by cache name and result.",
+    "mse207_cache_hit_ratio": "Fraction of cache lookups that were hits.",
+})
+
+
+# ============================================================
+# SESSIONS
+# ============================================================
+def active_sessions(app=None):
+    return sessions.active(app, SESSION_ACTIVE_SECONDS)
+
+
+def _refresh_session_gauges():
+    for app in sessions.apps():
+        REGISTRY.set("mse207_active_sessions", {"app": app}, active_sessions(app))
+    stats = sessions.snapshot()
+    REGISTRY.set("mse207_sessions_tracked", {}, len(stats))
+    REGISTRY.set("mse207_session_results_bytes", {}, sum(s.results_bytes for s in stats))
+
+
+# ============================================================
+# RERUN TIMING
+# ============================================================
+class Rerun:
+    """Timer for one script rerun, split into named sections."""
+
+    def __init__(self, app):
+        self.app = app
+        self.session_id = sessions.current_session_id()
+        self.started = time.perf_counter()
+        self.current = None
+        self.current_started = self.started
+        self.sections = {}
+        self.figures = 0
+        self.finished = False
+
+    def section(self, name):
+        """Close the running section (if any) and start timing ``name``."""
+        now = time.perf_counter()
+        self._close_section(now)
+        self.current = name
+        self.current_started = now
+
+    def _close_section(self, now):
+        if self.current is None:
+            return
+        elapsed = now - self.current_started
+        self.sections[self.current] = self.sections.get(self.current, 0.0) + elapsed
+        REGISTRY.observe("mse207_section_seconds", {"app": self.app, "section": self.current}, elapsed)
+        self.current = None
+
+    def figure_rendered(self, count=1):
+        self.figures += count
+        REGISTRY.inc("mse207_figures_rendered_total", {"app": self.app}, count)
+
+    def finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        now = time.perf_counter()
+        self._close_section(now)
+        total = now - self.started
+        REGISTRY.observe("mse207_rerun_seconds", {"app": self.app}, total)
+
+        session, evicted = sessions.touch(self.app)
+        session_bytes = session.bytes if session is not None else sessions.session_state_bytes()
+        REGISTRY.observe("mse207_session_memory_bytes", {"app": self.app}, session_bytes,
+                         buckets=MEMORY_BUCKETS)
+        for reason, freed in evicted:
+            REGISTRY.inc("mse207_session_evictions_total", {"reason": reason})
+            REGISTRY.inc("mse207_session_evicted_bytes_total", {"reason": reason}, freed)
+        _refresh_session_gauges()
+
+        _write_record({
+            "ts": time.time(),
+            "app": self.app,
+            "session": self.session_id,
+            "rerun_s": round(total, 6),
+            "sections": {name: round(value, 6) for name, value in self.sections.items()},
+            "figures": self.figures,
+            "session_bytes": session_bytes,
+            "results_bytes": session.results_bytes if session is not None else 0,
+            "active_sessions": active_sessions(self.app),
+        })
+
+
+def start_rerun(app):
+    """Begin timing a rerun of ``app``; starts the exporters on first use."""
+    _start_exporters()
+    return Rerun(app)
+
+
+# ============================================================
+# CACHE STATISTICS
+# ============================================================
+def cache_lookup(cache, hit):
+    """Count one lookup in ``cache`` and refresh its hit-ratio gauge."""
+    REGISTRY.inc("mse207_cache_requests_total", {"cache": cache, "result": "hit" if hit else "miss"})
+    hits = REGISTRY.counter_value("mse207_cache_requests_total", {"cache": cache, "result": "hit"})
+    misses = REGISTRY.counter_value("mse207_cache_requests_total", {"cache": cache, "result": "miss"})
+    REGISTRY.set("mse207_cache_hit_ratio", {"cache": cache}, hits / (hits + misses))
+
+
+# ============================================================
+# EXPORTERS (JSON LINES + PROMETHEUS TEXT)
+# ============================================================
+_exporters_started = False
+_exporters_lock = threading.Lock()
+_file = None
+_file_lock = threading.Lock()
+
+
+def _write_record(record):
+    global _file
+    if not METRICS_FILE:
+        return
+    line = json.dumps(record, separators=(",", ":")) + "\n"
+    with _file_lock:
+        try:
+            if _file is None:
+                _file = open(METRICS_FILE, "a", encoding="utf-8")
+            _file.write(line)
+            _file.flush()
+        except OSError as exc:
+            print(f"mse207.metrics: cannot write {METRICS_FILE}: {exc}", file=sys.stderr)
+
+
+class _PrometheusHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        _refresh_session_gauges()
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_prometheus(port=METRICS_PORT, host="127.0.0.1"):
+    """Serve ``/metrics`` on ``host:port`` from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _PrometheusHandler)
+    thread = threading.Thread(target=server.serve_forever, name="mse207-metrics", daemon=True)
+    thread.start()
+    return server
+
+
+def _start_exporters():
+    global _exporters_started
+    if _exporters_started:
+        return
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+        if METRICS_PORT:
+            try:
+                serve_prometheus(METRICS_PORT)
+            except OSError as exc:
+                # Another worker on this host already owns the port.
+                print(f"mse207.metrics: Prometheus endpoint disabled ({exc})", file=sys.stderr)
@@ -0,0 +1,44 @@
+"""Cached entry points of the models the week pages call.
+
+The wrappers are built once, when this module is imported, rather than in
+the page scripts on every rerun.  They share the process-wide caches of
+:mod:`mse207.caching`, so every entry is bounded by its ``max_entries`` and
+``ttl``.  Results that take long to compute are also persisted for the
+other workers (``persist=True``).  Uploaded or server-side files are not
+persisted: their results depend on the file contents, not just on the
+arguments.
+
+Models too slow for the script thread are run through :mod:`mse207.jobs`
+and take its ``job`` keyword; they share results through the disk cache
+alone.
+"""
+
+from mse207 import animation, arc, diskcache, doping, haz, hfit, thermocouple, transform, weld
+from mse207.caching import cached
+
+# ============================================================
+# WEEK 8
+# ============================================================
+analyze_log = cached("week8_thermocouple", max_entries=8)(thermocouple.analyze_log)
+fit_files = cached("week8_hfit", max_entries=8)(hfit.fit_files)
+quench_phases = cached("week8_quench_phases", persist=True)(transform.quench_phases)
+
+# ============================================================
+# WEEK 9
+# ============================================================
+haz_grain_size = cached("week9_grain_size", persist=True)(haz.haz_grain_size)
+haz_phases = cached("week9_cghaz_phases", persist=True)(transform.haz_phases)
+process_waveform = cached("week9_waveform", max_entries=8)(arc.process_file)
+zone_boundaries = cached("week9_haz_zones", persist=True)(haz.zone_boundaries)
+
+
+def multipass(*args, job=None, **kwargs):
+    """:func:`mse207.weld.simulate` for :func:`mse207.jobs.submit`."""
+    return diskcache.call("week9_multipass", 2, weld.simulate, args, kwargs, job=job)
+
+
+# ============================================================
+# WEEK 10
+# ============================================================
+profile_frames = cached("week10_profile_frames", persist=True)(animation.profile_frames)
+doping_screen = cached("week10_doping_screen", persist=True)(doping.screen)
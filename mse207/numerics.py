@@ -0,0 +1,22 @@
+"""Vectorised numerical helpers shared by the models.
+
+The models solve the same small problem for thousands of inputs at once
+(one zone boundary per heat input, one junction per doping recipe), so the
+helpers here work elementwise on whole arrays rather than on scalars.
+"""
+
+import numpy as np
+
+
+def bisect(f, lo, hi, iterations=60):
+    """Vectorised bisection for a decreasing ``f`` with ``f(lo) >= 0 >= f(hi)``.
+
+    ``lo`` and ``hi`` are arrays; every element is solved in the same pass.
+    """
+    lo, hi = np.array(lo, dtype=np.float64), np.array(hi, dtype=np.float64)
+    for _ in range(iterations):
+        mid = 0.5 * (lo + hi)
+        positive = f(mid) >= 0
+        lo = np.where(positive, mid, lo)
+        hi = np.where(positive, hi, mid)
+    return 0.5 * (lo + hi)
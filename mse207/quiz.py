@@ -0,0 +1,279 @@
+"""Quiz responses stored locally and aggregated per question.
+
+Every answer picked in a quiz radio is recorded with its app, question,
+session and correctness.  When a class of 300 answers within the same few
+seconds, one disk transaction per click would make every rerun wait on
+the disk in turn.  Instead :func:`record` appends to an in-process buffer
+and returns at once.  A daemon writer thread flushes the buffer every
+``MSE207_QUIZ_FLUSH_SECONDS``, or as soon as ``MSE207_QUIZ_BATCH`` answers
+are waiting, in one transaction.
+
+The store is an SQLite file in WAL mode.  Readers (the analytics page)
+never block the writer, and server workers that share the file queue
+briefly on its write lock, once per batch rather than once per answer.
+The aggregate queries in :func:`answer_counts` and :func:`question_stats`
+are answered from covering indexes on ``(app, question, ...)``.
+
+Configuration (environment variables):
+
+    MSE207_QUIZ_DB              database file (default "quiz.sqlite3",
+                                empty string disables recording)
+    MSE207_QUIZ_FLUSH_SECONDS   longest time an answer waits in the buffer (default 1)
+    MSE207_QUIZ_BATCH           buffered answers that trigger an early flush (default 500)
+
+Usage inside an app script::
+
+    q1 = quiz.radio("week8", "q1", "1) Which law describes conduction?",
+                    ["Newton's law", "Fourier's law"], answer="Fourier's law")
+
+``python -m mse207.quiz`` prints the per-question statistics.
+"""
+
+import argparse
+import atexit
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from mse207 import metrics, sessions
+
+QUIZ_DB = os.environ.get("MSE207_QUIZ_DB", "quiz.sqlite3")
+FLUSH_SECONDS = float(os.environ.get("MSE207_QUIZ_FLUSH_SECONDS", "1"))
+BATCH_SIZE = int(os.environ.get("MSE207_QUIZ_BATCH", "500"))
+
+AnswerCount = namedtuple("AnswerCount", "app question answer correct responses")
+QuestionStats = namedtuple(
+    "QuestionStats", "app question label answer responses sessions first_correct final_correct",
+)
+
+metrics.REGISTRY.help.update({
+    "mse207_quiz_responses_total": "Quiz answers recorded, by app and question.",
+    "mse207_quiz_flush_seconds": "Wall time of one batched write of quiz answers.",
+    "mse207_quiz_flush_rows": "Quiz answers written per batch.",
+})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    app TEXT NOT NULL,
+    question TEXT NOT NULL,
+    session TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    correct INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS questions (
+    app TEXT NOT NULL,
+    question TEXT NOT NULL,
+    label TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    PRIMARY KEY (app, question)
+);
+CREATE INDEX IF NOT EXISTS responses_by_answer ON responses (app, question, answer, correct);
+CREATE INDEX IF NOT EXISTS responses_by_session ON responses (app, question, session, id);
+"""
+
+
+def _connect(path=None):
+    conn = sqlite3.connect(path or QUIZ_DB, timeout=30.0, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+# ============================================================
+# BUFFERED WRITER
+# ============================================================
+_pending = []           # response rows waiting for the next flush
+_pending_questions = {}  # (app, question) -> (label, answer) not yet stored
+_known_questions = set()
+_lock = threading.Lock()
+_wake = threading.Event()
+_write_lock = threading.Lock()
+_conn = None
+_writer = None
+
+
+def record(app, question, answer, correct, session=None):
+    """Buffer one answer; it reaches the database within ``FLUSH_SECONDS``."""
+    if not QUIZ_DB:
+        return
+    row = (time.time(), app, question, session or "", str(answer), int(bool(correct)))
+    with _lock:
+        _pending.append(row)
+        full = len(_pending) >= BATCH_SIZE
+    _start_writer()
+    metrics.REGISTRY.inc("mse207_quiz_responses_total", {"app": app, "question": question})
+    if full:
+        _wake.set()
+
+
+def register(app, question, label, answer):
+    """Store the wording and correct answer of a question (once per process)."""
+    if not QUIZ_DB or (app, question) in _known_questions:
+        return
+    with _lock:
+        _known_questions.add((app, question))
+        _pending_questions[(app, question)] = (label, str(answer))
+
+
+def flush():
+    """Write everything buffered so far; returns the number of answers written."""
+    with _lock:
+        rows, _pending[:] = list(_pending), []
+        questions = dict(_pending_questions)
+        _pending_questions.clear()
+    if not rows and not questions:
+        return 0
+
+    global _conn
+    started = time.perf_counter()
+    with _write_lock:
+        try:
+            if _conn is None:
+                _conn = _connect()
+            with _conn:
+                _conn.execute("BEGIN IMMEDIATE")
+                _conn.executemany(
+                    "INSERT OR REPLACE INTO questions (app, question, label, answer) VALUES (?, ?, ?, ?)",
+                    [key + value for key, value in questions.items()],
+                )
+                _conn.executemany(
+                    "INSERT INTO responses (ts, app, question, session, answer, correct) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error as exc:
+            # Keep the answers for the next flush rather than losing them.
+            print(f"mse207.quiz: cannot write {QUIZ_DB}: {exc}", file=sys.stderr)
+            with _lock:
+                _pending[:0] = rows
+                for key, value in questions.items():
+                    _pending_questions.setdefault(key, value)
+            return 0
+    metrics.REGISTRY.observe("mse207_quiz_flush_seconds", {}, time.perf_counter() - started)
+    metrics.REGISTRY.observe("mse207_quiz_flush_rows", {}, len(rows), buckets=(1, 10, 100, 1000, 10000))
+    return len(rows)
+
+
+def _run_writer():
+    while True:
+        _wake.wait(FLUSH_SECONDS)
+        _wake.clear()
+        flush()
+
+
+def _start_writer():
+    global _writer
+    if _writer is not None:
+        return
+    with _lock:
+        if _writer is not None:
+            return
+        _writer = threading.Thread(target=_run_writer, name="mse207-quiz", daemon=True)
+        _writer.start()
+        atexit.register(flush)
+
+
+# ============================================================
+# QUIZ WIDGET
+# ============================================================
+def _answered(app, question, key, answer):
+    import streamlit as st
+
+    choice = st.session_state.get(key)
+    if choice is not None:
+        record(app, question, choice, choice == answer, sessions.current_session_id())
+
+
+def radio(app, question, label, options, answer, **kwargs):
+    """``st.radio`` for quiz ``question`` of ``app`` that records every answer picked.
+
+    Answers are recorded when the student picks them, so the radio starts
+    with nothing selected (``index=None``): a preselected option would
+    never be counted if kept.  Returns the selected option like
+    ``st.radio``, or None until one is picked.
+    """
+    import streamlit as st
+
+    register(app, question, label, answer)
+    key = kwargs.pop("key", f"quiz_{app}_{question}")
+    kwargs["index"] = None
+    return st.radio(label, options, key=key, on_change=_answered, args=(app, question, key, answer), **kwargs)
+
+
+# ============================================================
+# ANALYTICS
+# ============================================================
+def _where(app):
+    # A literal condition (not "? IS NULL OR ...") lets SQLite seek the index.
+    return ("WHERE app = ?", (app,)) if app is not None else ("", ())
+
+
+def answer_counts(app=None, path=None):
+    """How often each answer was picked, per question (all attempts)."""
+    flush()
+    where, params = _where(app)
+    conn = _connect(path)
+    try:
+        rows = conn.execute(
+            f"SELECT app, question, answer, correct, COUNT(*) FROM responses {where} "
+            "GROUP BY app, question, answer, correct ORDER BY app, question, COUNT(*) DESC",
+            params,
+        ).fetchall()
+    finally:
+        conn.close()
+    return [AnswerCount(*row) for row in rows]
+
+
+def question_stats(app=None, path=None):
+    """Per-question totals.
+
+    ``sessions`` counts students who answered; ``first_correct`` and
+    ``final_correct`` are the fractions of them whose first and latest
+    answer was right.
+    """
+    flush()
+    where, params = _where(app)
+    conn = _connect(path)
+    try:
+        rows = conn.execute(
+            f"""
+            WITH attempts AS (
+                SELECT app, question, session, MIN(id) AS first, MAX(id) AS final, COUNT(*) AS n
+                FROM responses {where}
+                GROUP BY app, question, session
+            )
+            SELECT a.app, a.question, COALESCE(q.label, a.question), COALESCE(q.answer, ''),
+                   SUM(a.n), COUNT(*), AVG(f.correct), AVG(l.correct)
+            FROM attempts a
+            JOIN responses f ON f.id = a.first
+            JOIN responses l ON l.id = a.final
+            LEFT JOIN questions q ON q.app = a.app AND q.question = a.question
+            GROUP BY a.app, a.question
+            ORDER BY a.app, a.question
+            """,
+            params,
+        ).fetchall()
+    finally:
+        conn.close()
+    return [QuestionStats(*row) for row in rows]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-question statistics of the recorded quiz answers.")
+    parser.add_argument("--app", default=None, help="only this app (e.g. week8)")
+    parser.add_argument("--db", default=QUIZ_DB, help="database file")
+    args = parser.parse_args(argv)
+
+    print(f"{'app':<8} {'question':<9} {'answers':>8} {'students':>9} {'first ok':>9} {'final ok':>9}")
+    for s in question_stats(args.app, args.db):
+        print(f"{s.app:<8} {s.question:<9} {s.responses:>8} {s.sessions:>9} "
+              f"{s.first_correct:>9.0%} {s.final_correct:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Error-controlled sampling of closed-form curves for plotting.
+
+A curve is drawn as a polyline, so what matters is how far the polyline
+strays from the curve between its vertices.  :func:`adaptive` starts from a
+coarse uniform grid and bisects every interval whose midpoint lies further
+than the tolerance from the chord through its ends, repeating on the new
+intervals only.  Points gather where the curve bends (a diffusion front, the
+flank of a weld profile) and flat stretches keep a handful.
+
+Where a curve is known to be flat outside some interval (an error function
+beyond a few ``sqrt(D t)``, a Gaussian beyond a few widths), pass it as
+``support``: only that part is sampled, and each flat end becomes a single
+segment.
+"""
+
+import numpy as np
+
+N_START = 17
+MAX_DEPTH = 14
+
+
+def adaptive(f, a, b, tol=1e-3, support=None, log=False, n_start=N_START, max_depth=MAX_DEPTH):
+    """Sample the vectorised ``f`` on ``[a, b]``; returns ``(x, y)``.
+
+    ``tol`` is relative to the span of ``f`` over the starting grid (of
+    ``log10 f`` with ``log=True``, for curves drawn on a log axis).  No
+    interval is split more than ``max_depth`` times, which bounds the work
+    at jumps.
+    """
+    lo, hi = a, b
+    if support is not None:
+        lo, hi = max(a, support[0]), min(b, support[1])
+    if hi <= lo:
+        x = np.array([a, b], dtype=np.float64)
+        return x, f(x)
+
+    x = np.linspace(lo, hi, n_start)
+    y = f(x)
+    g = np.log10 if log else np.asarray
+    gy = g(y)
+    span = np.ptp(gy)
+    if span > 0:
+        threshold = tol * span
+        active = np.ones(x.size - 1, dtype=bool)
+        for _ in range(max_depth):
+            left = np.flatnonzero(active)
+            mid = 0.5 * (x[left] + x[left + 1])
+            y_mid = f(mid)
+            error = np.abs(g(y_mid) - 0.5 * (gy[left] + gy[left + 1]))
+            split = error > threshold
+            if not split.any():
+                break
+            position = left[split] + 1
+            x = np.insert(x, position, mid[split])
+            y = np.insert(y, position, y_mid[split])
+            gy = np.insert(gy, position, g(y_mid[split]))
+            # Only the two halves of each split interval need another look
+            inserted = position + np.arange(position.size)
+            active = np.zeros(x.size - 1, dtype=bool)
+            active[inserted - 1] = True
+            active[inserted] = True
+
+    if lo > a:
+        x, y = np.concatenate(([a], x)), np.concatenate((f(np.array([a])), y))
+    if hi < b:
+        x, y = np.concatenate((x, [b])), np.concatenate((y, f(np.array([b]))))
+    return x, y
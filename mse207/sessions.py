@@ -0,0 +1,264 @@
+"""Per-session memory accounting and eviction of idle or heavy sessions.
+
+Every browser tab is a session that keeps its widget state and the results
+it computed, such as finished simulation jobs with all their arrays.
+Students leave tabs open for hours, and each abandoned tab holds its
+results until the server restarts.
+
+Each session gets one :class:`Session` stored in its ``st.session_state``.
+It holds the session's droppable results (:func:`results`, used by
+:mod:`mse207.jobs`) and the byte estimates from its last rerun.  A module
+table keeps every session, so the policies can act on sessions other than
+the one rerunning.  At the end of every rerun (:func:`touch`, called from
+:mod:`mse207.metrics`) two eviction policies run:
+
+* **idle** – a session without a rerun for ``MSE207_SESSION_IDLE_MINUTES``
+  loses its results and leaves the table;
+* **memory** – when all sessions' results together exceed
+  ``MSE207_SESSION_MAX_MB``, the least recently active sessions lose their
+  results until the total is below ``EVICT_TO`` of the cap.
+
+Only results are dropped, never widget state.  A session that comes back
+resubmits its jobs on the next rerun and recomputes what it shows.
+
+Configuration (environment variables):
+
+    MSE207_SESSION_IDLE_MINUTES   idle time before a session's results are dropped
+                                  (default 30, 0 disables)
+    MSE207_SESSION_MAX_MB         cap on all sessions' results together (default 1024,
+                                  0 disables)
+"""
+
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+
+IDLE_SECONDS = float(os.environ.get("MSE207_SESSION_IDLE_MINUTES", "30")) * 60.0
+MAX_BYTES = int(float(os.environ.get("MSE207_SESSION_MAX_MB", "1024")) * 1024 ** 2)
+EVICT_TO = 0.8      # fraction of MAX_BYTES left after a memory eviction pass
+
+STATE_KEY = "_mse207_session"
+
+SessionStats = namedtuple(
+    "SessionStats", "session_id apps idle_s reruns state_bytes results_bytes evictions last_eviction",
+)
+
+
+# ============================================================
+# MEMORY ESTIMATES
+# ============================================================
+def estimate_bytes(obj, _seen=None):
+    """Rough size of ``obj`` including NumPy buffers, containers and object attributes."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes + sys.getsizeof(obj, 0)
+
+    size = sys.getsizeof(obj, 0)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += estimate_bytes(key, _seen) + estimate_bytes(value, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += estimate_bytes(item, _seen)
+    elif hasattr(obj, "__dict__") and not isinstance(obj, (type, type(sys))) and not callable(obj):
+        # Plain objects such as jobs and their futures hold the actual results.
+        size += estimate_bytes(vars(obj), _seen)
+    return size
+
+
+def current_session_id():
+    """Streamlit session id of the running script, or None outside a session."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else None
+
+
+def session_state_bytes(exclude=()):
+    """Estimated bytes held in the current session's ``st.session_state``."""
+    try:
+        import streamlit as st
+        items = [(k, v) for k, v in st.session_state.items() if k not in exclude]
+    except Exception:
+        return 0
+    seen = set()
+    return sum(estimate_bytes(key, seen) + estimate_bytes(value, seen) for key, value in items)
+
+
+# ============================================================
+# SESSION TABLE
+# ============================================================
+class Session:
+    """Results and accounting of one browser session."""
+
+    def __init__(self, session_id):
+        self.token = next(_tokens)
+        self.session_id = session_id
+        self.results = {}
+        self.seen = {}              # app -> time of its last finished rerun
+        self.last_seen = time.time()
+        self.reruns = 0
+        self.state_bytes = 0
+        self.results_bytes = 0
+        self.evictions = 0
+        self.last_eviction = None
+
+    @property
+    def bytes(self):
+        return self.state_bytes + self.results_bytes
+
+
+_tokens = itertools.count()
+_table = {}             # token -> Session
+_lock = threading.Lock()
+_evict_lock = threading.Lock()
+_release = {}           # results key -> callable run on the value before it is dropped
+_evicted = {}           # reason -> [sessions, bytes]
+
+
+def current():
+    """The running session's :class:`Session`, created on first use (None outside Streamlit)."""
+    session_id = current_session_id()
+    if session_id is None:
+        return None
+    import streamlit as st
+
+    session = st.session_state.get(STATE_KEY)
+    if session is None:
+        session = st.session_state[STATE_KEY] = Session(session_id)
+    with _lock:
+        _table.setdefault(session.token, session)
+    return session
+
+
+def results():
+    """Dict of the running session's droppable results (a throwaway dict outside Streamlit)."""
+    session = current()
+    return session.results if session is not None else {}
+
+
+def on_release(key, release):
+    """Call ``release(value)`` on ``results()[key]`` before a session's results are dropped."""
+    _release[key] = release
+
+
+def touch(app):
+    """Account the running session at the end of a rerun of ``app`` and apply the policies.
+
+    Returns the session (None outside Streamlit) and the evictions made,
+    as ``(reason, bytes)`` pairs.
+    """
+    session = current()
+    if session is None:
+        return None, []
+    now = time.time()
+    session.seen[app] = session.last_seen = now
+    session.reruns += 1
+    session.state_bytes = session_state_bytes(exclude=(STATE_KEY,))
+    session.results_bytes = estimate_bytes(session.results)
+    return session, evict(now, keep=session)
+
+
+# ============================================================
+# EVICTION
+# ============================================================
+def _drop(session, reason):
+    for key, value in list(session.results.items()):
+        release = _release.get(key)
+        if release is not None:
+            release(value)
+    session.results.clear()
+    freed, session.results_bytes = session.results_bytes, 0
+    session.evictions += 1
+    session.last_eviction = reason
+    totals = _evicted.setdefault(reason, [0, 0])
+    totals[0] += 1
+    totals[1] += freed
+    return freed
+
+
+def evict(now=None, keep=None):
+    """Apply the idle and memory policies to every session except ``keep``.
+
+    Returns ``(reason, bytes)`` for each eviction.  Skipped while another
+    thread is already evicting.
+    """
+    if not _evict_lock.acquire(blocking=False):
+        return []
+    try:
+        now = time.time() if now is None else now
+        with _lock:
+            table = list(_table.values())
+        evicted = []
+
+        if IDLE_SECONDS:
+            for session in table:
+                if session is not keep and now - session.last_seen > IDLE_SECONDS:
+                    evicted.append(("idle", _drop(session, "idle")))
+                    with _lock:
+                        _table.pop(session.token, None)
+            table = [s for s in table if s.token in _table]
+
+        total = sum(s.results_bytes for s in table)
+        if MAX_BYTES and total > MAX_BYTES:
+            for session in sorted(table, key=lambda s: s.last_seen):
+                if total <= EVICT_TO * MAX_BYTES:
+                    break
+                if session is keep or not session.results:
+                    continue
+                freed = _drop(session, "memory")
+                total -= freed
+                evicted.append(("memory", freed))
+        return evicted
+    finally:
+        _evict_lock.release()
+
+
+# ============================================================
+# STATISTICS
+# ============================================================
+def active(app=None, within=300.0):
+    """Sessions that finished a rerun (of ``app``, if given) within ``within`` seconds."""
+    now = time.time()
+    with _lock:
+        table = list(_table.values())
+    return sum(
+        1 for s in table
+        if any(now - seen <= within for a, seen in list(s.seen.items()) if app is None or a == app)
+    )
+
+
+def apps():
+    """Apps rerun by any tracked session."""
+    with _lock:
+        table = list(_table.values())
+    return {a for s in table for a in list(s.seen)}
+
+
+def snapshot():
+    """:class:`SessionStats` of every tracked session, heaviest first."""
+    now = time.time()
+    with _lock:
+        table = list(_table.values())
+    stats = [
+        SessionStats(s.session_id, sorted(s.seen), now - s.last_seen, s.reruns, s.state_bytes, s.results_bytes,
+                     s.evictions, s.last_eviction)
+        for s in table
+    ]
+    return sorted(stats, key=lambda s: s.state_bytes + s.results_bytes, reverse=True)
+
+
+def evictions():
+    """``{reason: (sessions, bytes freed)}`` since the process started."""
+    return {reason: tuple(totals) for reason, totals in _evicted.items()}
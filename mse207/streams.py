@@ -0,0 +1,133 @@
+"""Chunked readers for large logger files.
+
+Every reader yields 2-D float64 arrays of at most ``chunk_rows`` rows, one
+column per requested channel, so a file of any size is processed with
+memory bounded by the chunk size:
+
+* CSV / text logs are parsed incrementally with ``pandas.read_csv``.
+* Raw binary logs (interleaved little-endian channels) and ``.npy`` files
+  are memory-mapped and sliced; pages are only touched chunk by chunk.
+
+The pages read files named by the user, so :func:`data_path` only lets
+them read inside the lab data directory.  Relative names are taken from
+that directory; names that resolve outside it (``..``, absolute paths
+elsewhere, symbolic links out of it) are refused.
+
+Configuration (environment variables):
+
+    MSE207_DATA_DIR     directory the pages may read logs from (default "data")
+"""
+
+import glob
+import os
+
+import numpy as np
+
+CSV_SUFFIXES = (".csv", ".txt", ".tsv")
+NPY_SUFFIXES = (".npy",)
+DEFAULT_CHUNK_ROWS = 1_000_000
+DATA_DIR = os.environ.get("MSE207_DATA_DIR", "data")
+
+
+def _inside(root, path):
+    return os.path.commonpath([root, path]) == root
+
+
+def data_path(name):
+    """Resolve the file ``name`` inside ``DATA_DIR``.
+
+    Raises ``ValueError`` if it lies outside the directory and
+    ``FileNotFoundError`` if there is no such file.
+    """
+    root = os.path.realpath(DATA_DIR)
+    path = os.path.realpath(os.path.join(root, name))
+    if not _inside(root, path):
+        raise ValueError(f"`{name}` is outside the lab data directory `{DATA_DIR}`")
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"File not found on the server: `{name}`")
+    return path
+
+
+def data_glob(pattern):
+    """Sorted files inside ``DATA_DIR`` that match the glob ``pattern``.
+
+    Matches that resolve outside the directory are dropped.
+    """
+    root = os.path.realpath(DATA_DIR)
+    paths = {os.path.realpath(p) for p in glob.glob(os.path.join(root, pattern))}
+    return sorted(p for p in paths if _inside(root, p) and os.path.isfile(p))
+
+
+def sniff_csv(path):
+    """Return ``(separator, header_row)`` guessed from the first line of ``path``."""
+    with open(path, "r", encoding="utf-8", errors="replace") as fh:
+        first = fh.readline()
+    sep = r"\s+"
+    for candidate in (",", ";", "\t"):
+        if candidate in first:
+            sep = candidate
+            break
+    fields = first.strip().split(sep) if sep != r"\s+" else first.split()
+    try:
+        [float(f) for f in fields]
+        header = None
+    except ValueError:
+        header = 0
+    return sep, header
+
+
+def iter_csv_chunks(path, columns=(0, 1), chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield ``(rows, len(columns))`` arrays from a delimited text file."""
+    import pandas as pd
+
+    sep, header = sniff_csv(path)
+    reader = pd.read_csv(
+        path,
+        sep=sep,
+        header=header,
+        usecols=list(columns),
+        chunksize=chunk_rows,
+        engine="c" if sep != r"\s+" else "python",
+        dtype=np.float64,
+    )
+    with reader:
+        for frame in reader:
+            # usecols does not keep the requested order.
+            yield frame.iloc[:, np.argsort(np.argsort(columns))].to_numpy(np.float64)
+
+
+def open_memmap(path, dtype="<f4", n_columns=2, offset=0):
+    """Memory-map a raw interleaved binary log (or a ``.npy`` file) as rows × channels."""
+    if path.lower().endswith(NPY_SUFFIXES):
+        data = np.load(path, mmap_mode="r")
+        return data.reshape(len(data), -1) if data.ndim == 1 else data
+    itemsize = np.dtype(dtype).itemsize
+    n_rows = (os.path.getsize(path) - offset) // (itemsize * n_columns)
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(n_rows, n_columns))
+
+
+def iter_memmap_chunks(data, columns=(0, 1), chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield float64 copies of ``chunk_rows``-row slices of a memory-mapped array."""
+    columns = list(columns)
+    for start in range(0, len(data), chunk_rows):
+        yield np.asarray(data[start:start + chunk_rows, columns], dtype=np.float64)
+
+
+def iter_chunks(path, columns=(0, 1), chunk_rows=DEFAULT_CHUNK_ROWS, dtype="<f4",
+                n_columns=2, offset=0):
+    """Yield channel chunks from ``path``, choosing the reader by file suffix.
+
+    Text suffixes (``.csv``, ``.txt``, ``.tsv``) are parsed as
+    delimited text; ``.npy`` is memory-mapped through NumPy; anything else is
+    treated as raw interleaved binary of ``dtype`` with ``n_columns`` channels
+    after ``offset`` header bytes.
+    """
+    if path.lower().endswith(CSV_SUFFIXES):
+        return iter_csv_chunks(path, columns, chunk_rows)
+    return iter_memmap_chunks(open_memmap(path, dtype, n_columns, offset), columns, chunk_rows)
+
+
+def file_signature(path):
+    """``(path, size, mtime)`` – changes whenever the file is rewritten."""
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
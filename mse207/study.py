@@ -0,0 +1,288 @@
+"""Parameter studies over the week models, fanned out to a process pool.
+
+A study evaluates one :data:`MODELS` entry at every point of a design:
+
+* :func:`cartesian`: a full factorial grid, the same number of levels per factor;
+* :func:`latin_hypercube`: ``n`` points, one in each of ``n`` equal slices of
+  every factor, shuffled independently.
+
+Factors spanning decades (``D``, ``h``) are spaced logarithmically.
+
+The design and the result table live in ``multiprocessing.shared_memory``
+blocks.  Pool workers attach to them by name, evaluate a chunk of rows with
+the vectorised model and write their outputs in place, so only
+``(start, stop)`` travels back through the pool.  Rows are independent, so the
+work spreads over every core of :data:`WORKERS`.  :func:`run` accepts the
+``job`` handle of :mod:`mse207.jobs` and publishes a snapshot of the table
+as chunks land, so the page can draw the study while it fills in.
+
+This module does not import streamlit, which keeps the pool workers light.
+
+Configuration (environment variables):
+
+    MSE207_STUDY_WORKERS  pool size (default: CPU count)
+"""
+
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import types
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+from scipy.special import erf, erfinv
+
+from mse207 import diffusion
+
+WORKERS = int(os.environ.get("MSE207_STUDY_WORKERS", "0")) or os.cpu_count() or 1
+PUBLISH_SECONDS = 0.5
+
+Factor = namedtuple("Factor", "name label low high log")
+Model = namedtuple("Model", "title evaluate factors outputs chunk")
+StudyResult = namedtuple("StudyResult", "model factors design values done elapsed_s")
+
+
+# ============================================================
+# MODELS
+# ============================================================
+def _case_depth(p):
+    """Depth (mm) where the erf profile falls to ``C_target``; NaN if it never does."""
+    s = (p["Cs"] - p["C_target"]) / (p["Cs"] - p["C0"])
+    length = 2.0 * np.sqrt(p["D"] * p["t_h"] * 3600.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        depth = np.where((s > 0) & (s < 1), length * erfinv(s) * 1000.0, np.nan)
+    C_1mm = p["Cs"] - (p["Cs"] - p["C0"]) * erf(1e-3 / length)
+    return {"case_depth_mm": depth, "C_at_1mm": C_1mm}
+
+
+def _case_depth_fd(p):
+    """As :func:`_case_depth`, by Crank–Nicolson with a concentration-dependent D."""
+    depth = np.full(p["D"].size, np.nan)
+    for i in range(depth.size):
+        t = p["t_h"][i] * 3600.0
+        domain = 6.0 * np.sqrt(p["D"][i] * p["D_ratio"][i] * t)
+        fd = diffusion.crank_nicolson(p["C0"][i], p["Cs"][i], p["D"][i], t, domain,
+                                      nx=100, nt=100, D_ratio=p["D_ratio"][i])
+        below = np.flatnonzero(fd.C <= p["C_target"][i])
+        if below.size and below[0] > 0:
+            j = below[0]
+            depth[i] = 1000.0 * np.interp(p["C_target"][i], fd.C[[j, j - 1]], fd.x[[j, j - 1]])
+    return {"case_depth_mm": depth}
+
+
+def _cooling(p, T_env=25.0):
+    """Newtonian cooling as in the week 8 curve: time to reach the melting point."""
+    tau = p["rho"] * p["Cp"] / p["h"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t_melt = np.where(p["T_initial"] > p["T_melt"],
+                          tau * np.log((p["T_initial"] - T_env) / (p["T_melt"] - T_env)), 0.0)
+    return {"time_to_melt_s": t_melt, "T_at_600s": T_env + (p["T_initial"] - T_env) * np.exp(-600.0 / tau)}
+
+
+_CARBURIZING = (
+    Factor("C0", "C₀ (wt.%)", 0.05, 0.4, False),
+    Factor("Cs", "Cₛ (wt.%)", 0.8, 1.4, False),
+    Factor("D", "D (m²/s)", 1e-12, 1e-10, True),
+    Factor("t_h", "Time (h)", 0.5, 10.0, False),
+    Factor("C_target", "Case carbon (wt.%)", 0.4, 0.6, False),
+)
+
+MODELS = {
+    "week10_case_depth": Model(
+        "Week 10 – case depth (error function)", _case_depth, _CARBURIZING,
+        ("case_depth_mm", "C_at_1mm"), 20000,
+    ),
+    "week10_case_depth_fd": Model(
+        "Week 10 – case depth with concentration-dependent D (Crank–Nicolson)", _case_depth_fd,
+        _CARBURIZING + (Factor("D_ratio", "D(Cₛ) / D(C₀)", 1.0, 20.0, True),),
+        ("case_depth_mm",), 50,
+    ),
+    "week8_cooling": Model(
+        "Week 8 – Newtonian cooling to the melting point", _cooling,
+        (
+            Factor("T_initial", "Initial temperature (°C)", 600.0, 1200.0, False),
+            Factor("T_melt", "Melting temperature (°C)", 400.0, 1200.0, False),
+            Factor("rho", "ρ (kg/m³)", 1000.0, 9000.0, False),
+            Factor("Cp", "Cp (J/kg·K)", 200.0, 1200.0, False),
+            Factor("h", "h (W/m²K)", 5.0, 200.0, True),
+        ),
+        ("time_to_melt_s", "T_at_600s"), 20000,
+    ),
+}
+
+
+# ============================================================
+# DESIGNS
+# ============================================================
+def _scale(factor, u):
+    """Map ``u`` in [0, 1] onto the factor's range."""
+    if factor.log:
+        return factor.low * (factor.high / factor.low) ** u
+    return factor.low + (factor.high - factor.low) * u
+
+
+def cartesian(factors, levels):
+    """Full factorial design, ``levels`` values per factor; ``levels ** k`` rows."""
+    u = np.linspace(0.0, 1.0, levels)
+    grids = np.meshgrid(*[_scale(f, u) for f in factors], indexing="ij")
+    return np.column_stack([g.ravel() for g in grids])
+
+
+def latin_hypercube(factors, n, seed=0):
+    """Latin-hypercube design of ``n`` rows."""
+    rng = np.random.default_rng(seed)
+    columns = [(rng.permutation(n) + rng.random(n)) / n for _ in factors]
+    return np.column_stack([_scale(f, u) for f, u in zip(factors, columns)])
+
+
+def design(kind, factors, points, seed=0):
+    """``"cartesian"`` (levels chosen to give about ``points`` rows) or ``"lhs"``."""
+    if kind == "cartesian":
+        return cartesian(factors, max(2, int(round(points ** (1.0 / len(factors))))))
+    return latin_hypercube(factors, points, seed)
+
+
+# ============================================================
+# SHARED MEMORY
+# ============================================================
+def _attach(name):
+    """Attach to an existing block, leaving its cleanup to the process that created it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: spawned workers report to their parent's resource
+        # tracker, which forgets the block when the parent unlinks it
+        return shared_memory.SharedMemory(name=name)
+
+
+_attached = {}
+
+
+def _table(name, shape):
+    block = _attached.get(name)
+    if block is None:
+        # Keep the latest few studies' blocks mapped in this worker
+        while len(_attached) >= 4:
+            _attached.pop(next(iter(_attached))).close()
+        block = _attached[name] = _attach(name)
+    return np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+
+
+def _evaluate_chunk(model_name, design_name, values_name, n, start, stop):
+    """Pool task: evaluate rows ``start:stop`` and write them into the shared table."""
+    model = MODELS[model_name]
+    rows = _table(design_name, (n, len(model.factors)))[start:stop]
+    out = model.evaluate({f.name: rows[:, i] for i, f in enumerate(model.factors)})
+    values = _table(values_name, (n, len(model.outputs)))
+    for j, name in enumerate(model.outputs):
+        values[start:stop, j] = out[name]
+    return start, stop
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_gate = None    # in a worker: the pool's start-up gate
+
+
+def _init_worker(gate):
+    global _gate
+    _gate = gate
+
+
+def _started():
+    # Keeps the worker busy until every worker has been spawned
+    _gate.wait()
+    return os.getpid()
+
+
+def _executor():
+    """The process pool, built on first use with all :data:`WORKERS` running.
+
+    Streamlit runs each page as ``__main__``, and a spawned process re-imports
+    ``__main__`` on start-up, which would run the whole page in every worker.
+    Left alone, the pool spawns its workers one at a time as tasks arrive,
+    under whichever page is ``__main__`` at that moment.  Here every worker
+    is spawned at once, under the lock, with a blank ``__main__`` in place,
+    and the pool never spawns again.  ``__main__`` is therefore replaced
+    once per server process.  A page that installs its own ``__main__`` in
+    the meantime keeps it.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            context = multiprocessing.get_context("spawn")
+            gate = context.Event()
+            pool = ProcessPoolExecutor(max_workers=WORKERS, mp_context=context,
+                                       initializer=_init_worker, initargs=(gate,))
+            main = sys.modules.get("__main__")
+            blank = sys.modules["__main__"] = types.ModuleType("__main__")
+            try:
+                # A task submitted while no worker is idle spawns one; the
+                # gate keeps them all busy until the last has been spawned
+                started = [pool.submit(_started) for _ in range(WORKERS)]
+            finally:
+                if sys.modules.get("__main__") is blank:
+                    sys.modules["__main__"] = main
+            gate.set()
+            wait(started)
+            _pool = pool
+        return _pool
+
+
+# ============================================================
+# DRIVER
+# ============================================================
+def run(model_name, kind, points, factors=None, seed=0, job=None):
+    """Evaluate ``MODELS[model_name]`` over a design; returns :class:`StudyResult`.
+
+    ``factors`` overrides the model's factor ranges (same names and order).
+    """
+    started = time.perf_counter()
+    model = MODELS[model_name]
+    factors = tuple(factors or model.factors)
+    rows = design(kind, factors, points, seed)
+    n = rows.shape[0]
+
+    blocks = [shared_memory.SharedMemory(create=True, size=max(8, n * width * 8))
+              for width in (len(factors), len(model.outputs))]
+    try:
+        table = np.ndarray(rows.shape, dtype=np.float64, buffer=blocks[0].buf)
+        table[:] = rows
+        values = np.ndarray((n, len(model.outputs)), dtype=np.float64, buffer=blocks[1].buf)
+        values[:] = np.nan
+        done = np.zeros(n, dtype=bool)
+
+        # Small enough chunks to keep every worker busy and the page updating
+        chunk = max(1, min(model.chunk, -(-n // (4 * WORKERS))))
+        pool = _executor()
+        pending = {pool.submit(_evaluate_chunk, model_name, blocks[0].name, blocks[1].name, n,
+                               start, min(start + chunk, n))
+                   for start in range(0, n, chunk)}
+        last_publish = 0.0
+        try:
+            while pending:
+                finished, pending = wait(pending, timeout=PUBLISH_SECONDS, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    start, stop = future.result()
+                    done[start:stop] = True
+                if job is not None:
+                    job.progress(done.mean(), f"{int(done.sum()):,} of {n:,} points")
+                    if pending and time.perf_counter() - last_publish > PUBLISH_SECONDS:
+                        job.publish(StudyResult(model_name, factors, rows, values.copy(), done.copy(),
+                                                time.perf_counter() - started))
+                        last_publish = time.perf_counter()
+        finally:
+            for future in pending:
+                future.cancel()
+            # Chunks already running still write into the blocks
+            wait(pending)
+        return StudyResult(model_name, factors, rows, values.copy(), done,
+                           time.perf_counter() - started)
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
@@ -0,0 +1,205 @@
+"""Streaming analysis of measured thermocouple cooling curves.
+
+A kHz cooling-curve log is reduced chunk by chunk to fixed-size blocks.  For
+every block we keep the mean time and temperature, the temperature envelope
+and the least-squares slope dT/dt, so the derivative is smoothed over the
+block and never needs more than one chunk of raw samples in memory.  Thermal
+arrests are then found on the (small) block series:
+
+    rate(t) = -dT/dt,    k(t) = rate / (T - T_env)
+
+For Newtonian cooling k is roughly constant, while latent heat release makes
+it collapse.  Blocks with k below ``rate_fraction`` of its typical value form
+arrests; the first arrest starts at the liquidus, the last one ends at the
+solidus (for a pure metal both are the same plateau).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from mse207 import streams
+
+CurveSummary = namedtuple("CurveSummary", "t T T_min T_max dTdt n_samples")
+Arrests = namedtuple(
+    "Arrests",
+    "segments liquidus_T liquidus_t solidus_T solidus_t plateau_s reference_rate",
+)
+
+
+# ============================================================
+# CHUNKED REDUCTION
+# ============================================================
+def _reduce_blocks(t, T):
+    """Per-row statistics of ``(n_blocks, block)`` time and temperature arrays."""
+    t_mean = t.mean(axis=1)
+    T_mean = T.mean(axis=1)
+    dt = t - t_mean[:, None]
+    sxx = np.einsum("ij,ij->i", dt, dt)
+    sxy = np.einsum("ij,ij->i", dt, T - T_mean[:, None])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = np.where(sxx > 0, sxy / sxx, np.nan)
+    return t_mean, T_mean, T.min(axis=1), T.max(axis=1), slope
+
+
+def summarize(chunks, block=1000, sample_rate=None):
+    """Reduce a stream of ``(t, T)`` (or ``T``-only) chunks to block statistics.
+
+    Chunks with a single column are temperatures sampled at ``sample_rate`` Hz.
+    Samples left over at the end of a chunk are carried into the next one, so
+    block boundaries do not depend on the chunk size.
+    """
+    pieces = []
+    carry_t = carry_T = np.empty(0)
+    sample_index = 0
+
+    for chunk in chunks:
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if chunk.ndim == 1 or chunk.shape[1] == 1:
+            if not sample_rate:
+                raise ValueError("sample_rate is required for temperature-only logs")
+            T = chunk.reshape(-1)
+            t = (sample_index + np.arange(T.size)) / sample_rate
+        else:
+            t, T = chunk[:, 0], chunk[:, 1]
+        sample_index += T.size
+
+        ok = np.isfinite(t) & np.isfinite(T)
+        if not ok.all():
+            t, T = t[ok], T[ok]
+        if carry_t.size:
+            t = np.concatenate([carry_t, t])
+            T = np.concatenate([carry_T, T])
+
+        n_blocks = t.size // block
+        used = n_blocks * block
+        if n_blocks:
+            pieces.append(_reduce_blocks(t[:used].reshape(n_blocks, block),
+                                         T[:used].reshape(n_blocks, block)))
+        carry_t, carry_T = t[used:].copy(), T[used:].copy()
+
+    if carry_t.size >= 2:
+        pieces.append(_reduce_blocks(carry_t[None, :], carry_T[None, :]))
+    if not pieces:
+        raise ValueError("log contains fewer than two valid samples")
+
+    columns = [np.concatenate(parts) for parts in zip(*pieces)]
+    return CurveSummary(*columns, n_samples=sample_index)
+
+
+def summarize_file(path, columns=(0, 1), block=1000, sample_rate=None,
+                   chunk_rows=streams.DEFAULT_CHUNK_ROWS, dtype="<f4", n_columns=2, offset=0):
+    """:func:`summarize` a CSV, ``.npy`` or raw binary log without loading it whole."""
+    chunks = streams.iter_chunks(path, columns, chunk_rows, dtype, n_columns, offset)
+    return summarize(chunks, block, sample_rate)
+
+
+# ============================================================
+# SMOOTHING AND ARREST DETECTION
+# ============================================================
+def moving_average(values, window):
+    """Centred moving average that ignores NaNs and shrinks at the ends."""
+    if window <= 1:
+        return np.asarray(values, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    ok = np.isfinite(values)
+    kernel = np.ones(int(window))
+    total = np.convolve(np.where(ok, values, 0.0), kernel, mode="same")
+    count = np.convolve(ok.astype(np.float64), kernel, mode="same")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def _runs(mask):
+    """``(start, stop)`` index pairs of the True runs in ``mask``."""
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return np.column_stack([np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)])
+
+
+def detect_arrests(summary, T_env=None, rate_fraction=0.35, smooth=5, min_duration=None):
+    """Locate thermal arrests in a :class:`CurveSummary`.
+
+    ``min_duration`` (s) defaults to 1 % of the logged time; shorter arrests
+    are treated as noise, and arrests separated by less than ``smooth`` blocks
+    are merged.
+    """
+    t, T = summary.t, summary.T
+    rate = -moving_average(summary.dTdt, smooth)
+    if T_env is None:
+        T_env = float(np.min(summary.T_min))
+    if min_duration is None:
+        min_duration = 0.01 * (t[-1] - t[0])
+
+    excess = T - T_env
+    # Ignore the heating transient of the thermocouple (and the blocks whose
+    # smoothed rate still sees it) and the tail where T is too close to
+    # ambient for the normalised rate to mean anything.
+    valid = (np.arange(T.size) >= np.argmax(T) + smooth) & (excess > 0.05 * np.max(excess))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        k = np.where(valid, rate / excess, np.nan)
+
+    cooling = valid & (k > 0)
+    if not cooling.any():
+        return Arrests([], None, None, None, None, 0.0, 0.0)
+    k_ref = np.percentile(k[cooling], 75)
+    runs = _runs(valid & (k < rate_fraction * k_ref))
+
+    merged = []
+    for start, stop in runs:
+        if merged and start - merged[-1][1] < smooth:
+            merged[-1][1] = stop
+        else:
+            merged.append([start, stop])
+
+    segments = []
+    for start, stop in merged:
+        t_start, t_stop = t[start], t[stop - 1]
+        if t_stop - t_start >= min_duration:
+            segments.append((t_start, t_stop, T[start], T[stop - 1]))
+
+    reference_rate = float(np.percentile(rate[cooling], 75))
+    if not segments:
+        return Arrests([], None, None, None, None, 0.0, reference_rate)
+    first, last = segments[0], segments[-1]
+    return Arrests(
+        segments=segments,
+        liquidus_T=float(first[2]), liquidus_t=float(first[0]),
+        solidus_T=float(last[3]), solidus_t=float(last[1]),
+        plateau_s=float(last[1] - first[0]),
+        reference_rate=reference_rate,
+    )
+
+
+# ============================================================
+# DECIMATION FOR PLOTTING
+# ============================================================
+def decimate(summary, max_points=2000):
+    """Merge blocks into at most ``max_points`` groups: ``(t, T_mean, T_min, T_max)``."""
+    n = summary.t.size
+    factor = max(1, int(np.ceil(n / max_points)))
+    if factor == 1:
+        return summary.t, summary.T, summary.T_min, summary.T_max
+    n_groups = int(np.ceil(n / factor))
+    pad = n_groups * factor - n
+
+    def grouped(values, fill):
+        return np.concatenate([values, np.full(pad, fill)]).reshape(n_groups, factor)
+
+    return (
+        np.nanmean(grouped(summary.t, np.nan), axis=1),
+        np.nanmean(grouped(summary.T, np.nan), axis=1),
+        grouped(summary.T_min, np.inf).min(axis=1),
+        grouped(summary.T_max, -np.inf).max(axis=1),
+    )
+
+
+def analyze_log(signature, columns=(0, 1), block=1000, sample_rate=None, dtype="<f4",
+                n_columns=2, rate_fraction=0.35, max_points=2000):
+    """Summarise, detect arrests and decimate the log identified by ``signature``.
+
+    ``signature`` is :func:`mse207.streams.file_signature` of the log, so a
+    cached call is invalidated when the file is rewritten.
+    """
+    summary = summarize_file(signature[0], columns, block, sample_rate, dtype=dtype,
+                             n_columns=n_columns)
+    return summary, detect_arrests(summary, rate_fraction=rate_fraction), decimate(summary, max_points)
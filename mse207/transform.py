@@ -0,0 +1,142 @@
+"""Austenite decomposition along cooling paths (Scheil additivity + JMAK).
+
+Isothermal start times ``tau_s(T)`` of ferrite/pearlite and bainite follow
+C-curves
+
+    tau_s(T) = A / [(T_u - T)^m exp(-Q / R T)]
+
+below their upper temperatures ``T_u`` (Ae3 and Bs), scaled so the nose lies
+at the given time.  Along a cooling path each product
+
+1. incubates until Scheil's sum ``Σ dt / tau_s(T)`` reaches 1, and then
+2. grows by JMAK kinetics ``X = 1 - exp(-k t^n)``, with ``k(T)`` set so that
+   ``X`` reaches 1 % at ``tau_s(T)``, stepped with the additivity
+   (fictitious-time) rule.
+
+Both steps run in :func:`mse207.kernels.scheil_jmak`, compiled when numba
+is installed.
+
+Ferrite/pearlite forms between Ae3 and Bs, and bainite forms in the remaining
+austenite between Bs and Ms.  What is left transforms to martensite below Ms
+by the Koistinen–Marburger relation; the rest stays as retained austenite.
+
+Paths are the rows of a 2-D array and are stepped together, so one call
+handles thousands of them.  Kinetics start at each path's peak temperature.
+The ``tau_s`` tables are built once per steel on a 1 °C grid and looked up
+by index.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from mse207 import haz, kernels, weld
+
+R_GAS = 8.314   # J/(mol·K)
+
+Steel = namedtuple(
+    "Steel", "Ae3 Bs Ms fp_nose_s fp_Q fp_n bainite_nose_s bainite_Q bainite_n km_alpha",
+)
+# Illustrative low-alloy C-Mn steel (≈0.2 C, 1.2 Mn)
+C_MN_STEEL = Steel(
+    Ae3=830.0, Bs=560.0, Ms=400.0,
+    fp_nose_s=1.0, fp_Q=100e3, fp_n=1.5,
+    bainite_nose_s=0.7, bainite_Q=80e3, bainite_n=2.0,
+    km_alpha=0.011,
+)
+
+Phases = namedtuple("Phases", "ferrite_pearlite bainite martensite retained")
+
+_FP_M = 3.0         # undercooling exponents of the C-curves
+_BAINITE_M = 2.0
+_START = 0.01       # fraction that defines tau_s
+
+
+# ============================================================
+# INCUBATION TABLES
+# ============================================================
+def _c_curve(T, T_upper, m, Q, nose_s):
+    """C-curve start times on ``T`` (°C), infinite at and above ``T_upper``."""
+    undercooling = np.maximum(T_upper - T, 0.0)
+    with np.errstate(divide="ignore", over="ignore"):
+        raw = 1.0 / (undercooling ** m * np.exp(-Q / (R_GAS * (T + 273.15))))
+    raw[undercooling <= 0] = np.inf
+    return raw * (nose_s / raw.min())
+
+
+@lru_cache(maxsize=16)
+def incubation_table(steel):
+    """``tau_s`` of ferrite/pearlite and bainite at every whole °C from 0 to Ae3.
+
+    Cached per steel (``Steel`` is hashable); the arrays are read-only.
+    """
+    T = np.arange(0.0, np.ceil(steel.Ae3) + 1.0)
+    tau_fp = _c_curve(T, steel.Ae3, _FP_M, steel.fp_Q, steel.fp_nose_s)
+    tau_fp[T < steel.Bs] = np.inf
+    tau_b = _c_curve(T, steel.Bs, _BAINITE_M, steel.bainite_Q, steel.bainite_nose_s)
+    tau_b[T < steel.Ms] = np.inf
+    for table in (tau_fp, tau_b):
+        table.flags.writeable = False
+    return tau_fp, tau_b
+
+
+# ============================================================
+# PATH INTEGRATION
+# ============================================================
+def transform_paths(t, T, steel=C_MN_STEEL):
+    """Final phase fractions for cooling paths ``T`` (°C, one path per row).
+
+    ``t`` is either shared (1-D) or one row per path.  Paths whose peak does
+    not reach Ae3 are not austenitised and return NaN.
+    """
+    T = np.atleast_2d(np.asarray(T, dtype=np.float64))
+    t = np.asarray(t, dtype=np.float64)
+    dt = np.broadcast_to(np.diff(t, axis=-1), (T.shape[0], T.shape[1] - 1))
+    T_mid = 0.5 * (T[:, 1:] + T[:, :-1])
+    index = np.clip(T_mid, 0, steel.Ae3).astype(np.intp)
+    tau_fp_table, tau_b_table = incubation_table(steel)
+
+    start = np.argmax(T, axis=1)
+    austenitised = T.max(axis=1) >= steel.Ae3
+    X_fp, X_b = kernels.scheil_jmak(dt, index, start, tau_fp_table, tau_b_table,
+                                    steel.fp_n, steel.bainite_n, _START)
+
+    ferrite_pearlite = X_fp
+    bainite = X_b * (1.0 - X_fp)
+    left = 1.0 - ferrite_pearlite - bainite
+    martensite = left * (1.0 - np.exp(-steel.km_alpha * np.maximum(steel.Ms - T[:, -1], 0.0)))
+    fractions = (ferrite_pearlite, bainite, martensite, left - martensite)
+    return Phases(*(np.where(austenitised, f, np.nan) for f in fractions))
+
+
+# ============================================================
+# COOLING PATHS
+# ============================================================
+def quench_phases(diameter_mm, h, T_start=880.0, T_env=25.0, rho=7850.0, cp=600.0,
+                  steel=C_MN_STEEL, n_steps=600):
+    """Phase fractions of long round bars cooled by Newton's law.
+
+    ``diameter_mm`` may be an array; each bar (``V/A = D/4``) is one path,
+    sampled on its own time axis out to six time constants.  Returns the
+    time constants (s) and the :class:`Phases`.
+    """
+    diameter_m = np.atleast_1d(np.asarray(diameter_mm, dtype=np.float64)) / 1000.0
+    tau = rho * cp * (diameter_m / 4.0) / h
+    u = np.linspace(0.0, 6.0, n_steps)
+    t = tau[:, None] * u[None, :]
+    T = np.broadcast_to(T_env + (T_start - T_env) * np.exp(-u), t.shape)
+    return tau, transform_paths(t, T, steel)
+
+
+def haz_phases(Q_kJ_per_mm, thickness, T0=25.0, T_peak=1350.0, steel=C_MN_STEEL, n_steps=800):
+    """Coarse-grain HAZ phase fractions for an array of heat inputs.
+
+    Each heat input gives one path: the surface cycle at the distance where
+    the peak temperature is ``T_peak``.  Returns ``(t85, Phases)``.
+    """
+    Q = np.atleast_1d(np.asarray(Q_kJ_per_mm, dtype=np.float64))
+    y = haz.zone_boundaries(Q, T0, thickness, levels=(T_peak,)).boundary[:, 0]
+    t = np.geomspace(1e-3, 2e3, n_steps)
+    T = haz.surface_cycle(y[:, None], t[None, :], Q[:, None], thickness, T0)
+    return weld.cooling_time(t, T), transform_paths(t, T, steel)
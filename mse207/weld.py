@@ -0,0 +1,361 @@
+"""Weld thermal cycles from superposed line-source solutions.
+
+Seen in a fixed cross-section, a fast-moving arc deposits its net heat input
+``Q`` (J/mm) almost instantly along the weld line.  The temperature rise
+``tau`` seconds after a pass at ``(y_i, z_i)`` in a plate of thickness ``d``
+with insulated faces is the 2-D heat kernel
+
+    dT = Q / (rho c) · g_y(y - y_i, tau) · g_z(z, z_i, tau)
+
+with ``g_y`` the free-space Gaussian and ``g_z`` its Neumann (reflected)
+form across the thickness.  For short times ``g_z`` is summed over image
+sources (thick-plate limit, ``Q / (2 pi k tau)`` at the surface); for long
+times over a cosine series (thin-plate limit, ``Q / (rho c d sqrt(4 pi a tau))``),
+switching where both converge in a handful of terms.  ``tau`` is offset by
+``r0² / 4a`` so the source has a finite Gaussian radius ``r0`` instead of a
+singular point, and surface losses from both faces damp every pass by
+``exp(-2 h tau / (rho c d))`` as in Rykalin's thin-plate solution.
+
+Because the kernel separates in y and z, a whole pass sequence on a
+monitoring grid is one batched matrix product over time:
+``dT[y, z, t] = Σ_i Q_i/ρc · g_y[i, y, t] · g_z[i, z, t]``.  The product is
+formed in blocks of :data:`TIME_BLOCK` times, so the per-pass kernels never
+exist for the whole history at once.  Multi-pass histories are kept in
+float32 on at most about :data:`MAX_TIMES` samples: a 100-pass joint is
+about 27 MB, where its kernels took 0.5 GB when formed in one piece.
+
+The plan view of a thin plate under a moving Gaussian source is solved
+numerically by :func:`moving_source_field` (explicit finite differences, for
+background runs through :mod:`mse207.jobs`) and checked against Rosenthal's
+quasi-steady thin-plate solution :func:`rosenthal_thin`.  Halving the grid
+spacing costs about eight times the work, so :data:`REFINE_LEVELS` starts at
+2 mm (milliseconds) for :func:`mse207.jobs.progressive`, which compares
+levels by :func:`field_change`.
+"""
+
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# Low-alloy steel, averaged over the weld thermal cycle
+CONDUCTIVITY = 0.030            # W/(mm·K)
+RHO_C = 4.8e-3                  # J/(mm³·K)
+DIFFUSIVITY = CONDUCTIVITY / RHO_C   # mm²/s
+T_MELT = 1500.0                 # °C
+H_LOSS = 2.0e-5                 # W/(mm²·K), convection + radiation averaged
+
+REFINE_LEVELS = ({"dx": 2.0}, {"dx": 1.0}, {"dx": 0.5}, {"dx": 0.25})
+
+TIME_BLOCK = 256        # times per block in temperature_rise
+MAX_TIMES = 4000        # target length of a multi-pass time grid
+
+# Fourier number a·tau/d² above which the cosine series is used for g_z
+_SERIES_SWITCH = 0.1
+_IMAGE_SHIFTS = np.arange(-1, 3)      # k in z ± z_i - 2kd; enough for Fo < 0.1
+_SERIES_TERMS = np.arange(1, 6)       # exp(-25 π² · 0.1) ≈ 2e-11
+
+PlateField = namedtuple("PlateField", "x y T peak source_x elapsed_s")
+MultipassHistory = namedtuple(
+    "MultipassHistory", "y z t T peak t_peak t85 interpass pass_y pass_z pass_t",
+)
+
+
+# ============================================================
+# LINE-SOURCE KERNEL
+# ============================================================
+def _gaussian_y(y, pass_y, s, a):
+    """Free-space 1-D kernel, shape (passes, ny, nt); ``s`` is (passes, nt)."""
+    dy = y[None, :, None] - pass_y[:, None, None]
+    s = s[:, None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g = np.exp(-dy ** 2 / (4.0 * a * s)) / np.sqrt(4.0 * np.pi * a * s)
+    return np.where(s > 0, g, 0.0)
+
+
+def _neumann_z(z, pass_z, s, a, thickness):
+    """1-D kernel on [0, d] with insulated faces, shape (passes, nz, nt)."""
+    zz = z[None, :, None]
+    zi = pass_z[:, None, None]
+    s3 = s[:, None, :]
+    fo = a * s3 / thickness ** 2
+    out = np.zeros((pass_z.size, z.size, s.shape[1]))
+
+    short = (fo > 0) & (fo < _SERIES_SWITCH)
+    if short.any():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            denom = 4.0 * a * s3
+            images = sum(
+                np.exp(-(zz - zi - 2 * k * thickness) ** 2 / denom)
+                + np.exp(-(zz + zi - 2 * k * thickness) ** 2 / denom)
+                for k in _IMAGE_SHIFTS
+            ) / np.sqrt(np.pi * denom)
+        out = np.where(short, images, out)
+
+    long = fo >= _SERIES_SWITCH
+    if long.any():
+        series = np.ones_like(out)
+        for n in _SERIES_TERMS:
+            w = n * np.pi / thickness
+            series = series + 2.0 * np.cos(w * zz) * np.cos(w * zi) * np.exp(-(w ** 2) * a * s3)
+        out = np.where(long, series / thickness, out)
+    return out
+
+
+def temperature_rise(y, z, t, pass_y, pass_z, pass_t, pass_Q, thickness,
+                     a=DIFFUSIVITY, rho_c=RHO_C, r0=3.0, h_loss=H_LOSS, dtype=np.float64, job=None):
+    """Superposed temperature rise on the ``y × z`` grid at times ``t``.
+
+    ``pass_Q`` is the net heat input per pass in J/mm, ``r0`` the source
+    radius in mm.  Returns an array of shape ``(len(y), len(z), len(t))``
+    and type ``dtype``; the sum itself is always formed in float64.
+    """
+    y, z, t = (np.atleast_1d(np.asarray(v, dtype=np.float64)) for v in (y, z, t))
+    pass_y, pass_z, pass_t = (np.atleast_1d(np.asarray(v, dtype=np.float64))
+                              for v in (pass_y, pass_z, pass_t))
+    pass_Q = np.broadcast_to(np.asarray(pass_Q, dtype=np.float64), pass_t.shape)
+
+    out = np.empty((y.size, z.size, t.size), dtype=dtype)
+    for start in range(0, t.size, TIME_BLOCK):
+        block = slice(start, start + TIME_BLOCK)
+        # Passes that have not started by the end of the block add nothing
+        active = pass_t < t[block][-1]
+        if not active.any():
+            out[..., block] = 0.0
+            continue
+        tau = t[None, block] - pass_t[active, None]
+        s = np.where(tau > 0, tau + r0 ** 2 / (4.0 * a), 0.0)
+        loss = np.exp(-2.0 * h_loss * np.maximum(tau, 0.0) / (rho_c * thickness))
+        weight = (pass_Q[active] / rho_c)[:, None] * loss
+        gy = _gaussian_y(y, pass_y[active], s, a) * weight[:, None, :]
+        gz = _neumann_z(z, pass_z[active], s, a, thickness)
+        # Σ over passes as a batched (ny × passes) @ (passes × nz) product per time
+        out[..., block] = np.matmul(gy.transpose(2, 1, 0), gz.transpose(2, 0, 1)).transpose(1, 2, 0)
+        if job is not None:
+            job.progress(min(1.0, (start + TIME_BLOCK) / t.size), f"{min(start + TIME_BLOCK, t.size)} of {t.size} times")
+    return out
+
+
+# ============================================================
+# PASS SEQUENCES
+# ============================================================
+def bead_layout(n_passes, thickness, groove_angle_deg=60.0, root_gap=2.0, max_beads=4):
+    """Bead centres ``(y, z)`` for a single-V butt weld, filled root to cap.
+
+    ``z`` is measured down from the top face, so the root sits near ``z = d``.
+    Layers hold one more bead every second layer, up to ``max_beads``.
+    """
+    beads = []
+    layer = 0
+    while sum(beads) < n_passes:
+        beads.append(min(1 + layer // 2, max_beads))
+        layer += 1
+    beads[-1] -= sum(beads) - n_passes
+    layer_height = thickness / len(beads)
+    half_angle = np.radians(groove_angle_deg / 2.0)
+
+    ys, zs = [], []
+    for j, count in enumerate(beads):
+        z = thickness - (j + 0.5) * layer_height
+        width = root_gap + 2.0 * (thickness - z) * np.tan(half_angle)
+        ys.extend(np.linspace(-width / 2, width / 2, count + 2)[1:-1] if count > 1 else [0.0])
+        zs.extend([z] * count)
+    return np.array(ys), np.array(zs)
+
+
+def schedule_passes(pass_y, pass_z, pass_Q, thickness, T0, control=(0.0, 0.0),
+                    interpass_max=None, interval=120.0, min_interval=30.0, **kernel):
+    """Start times of each pass.
+
+    With ``interpass_max`` set, each pass starts as soon as the ``control``
+    point ``(y, z)`` has cooled below that temperature (but no sooner than
+    ``min_interval`` after the previous pass); otherwise passes are
+    ``interval`` seconds apart.  ``kernel`` is passed to :func:`temperature_rise`.
+    """
+    n = len(pass_y)
+    if interpass_max is None:
+        return np.arange(n) * float(interval)
+
+    pass_Q = np.broadcast_to(np.asarray(pass_Q, dtype=np.float64), (n,))
+    start = np.zeros(n)
+    probe = np.geomspace(1.0, 1e5, 400)
+    for i in range(1, n):
+        t = start[i - 1] + min_interval + probe - 1.0
+        rise = temperature_rise([control[0]], [control[1]], t, pass_y[:i], pass_z[:i],
+                                start[:i], pass_Q[:i], thickness, **kernel)[0, 0]
+        cool = np.flatnonzero(T0 + rise <= interpass_max)
+        start[i] = t[cool[0]] if cool.size else t[-1]
+    return start
+
+
+def time_grid(pass_t, t_end, per_pass=30, cooling=120, first=0.05):
+    """Time samples clustered after every pass start, where cycles are steep."""
+    pass_t = np.sort(np.asarray(pass_t, dtype=np.float64))
+    ends = np.append(pass_t[1:], t_end)
+    pieces = [pass_t]
+    for start, stop, m in zip(pass_t, ends, [per_pass] * (len(pass_t) - 1) + [cooling]):
+        if stop - start > first:
+            # endpoint excluded: rounding must not put a sample just after the next start
+            pieces.append(start + np.geomspace(first, stop - start, m, endpoint=False))
+    return np.unique(np.concatenate(pieces))
+
+
+# ============================================================
+# CYCLE METRICS
+# ============================================================
+def cooling_time(t, T, upper=800.0, lower=500.0):
+    """Time to cool from ``upper`` to ``lower`` on the last cooling branch.
+
+    ``T`` has time on its last axis; entries whose last cycle never reaches
+    ``upper`` are NaN.
+    """
+    above = T >= upper
+    n = T.shape[-1]
+    # Last sample at or above `upper`
+    last_hot = n - 1 - np.argmax(above[..., ::-1], axis=-1)
+    ok = above.any(axis=-1) & (last_hot < n - 1)
+    i8 = np.clip(last_hot, 0, n - 2)
+    t8 = _crossing(t, T, i8, upper)
+
+    idx = np.arange(n)
+    below = (T < lower) & (idx > last_hot[..., None])
+    i5 = np.argmax(below, axis=-1) - 1
+    ok &= below.any(axis=-1)
+    t5 = _crossing(t, T, np.clip(i5, 0, n - 2), lower)
+    return np.where(ok, t5 - t8, np.nan)
+
+
+def _crossing(t, T, i, level):
+    """Linear-interpolated time where T passes ``level`` between i and i+1."""
+    Ta = np.take_along_axis(T, i[..., None], -1)[..., 0]
+    Tb = np.take_along_axis(T, (i + 1)[..., None], -1)[..., 0]
+    ta, tb = t[i], t[i + 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frac = np.where(Tb != Ta, (level - Ta) / (Tb - Ta), 0.0)
+    return ta + np.clip(frac, 0.0, 1.0) * (tb - ta)
+
+
+def multipass_history(y, z, pass_y, pass_z, pass_t, pass_Q, thickness, T0=25.0,
+                      t_end=None, dtype=np.float32, job=None, **kernel):
+    """Thermal cycles, peak/interpass temperatures and t8/5 on a ``y × z`` grid.
+
+    Temperatures are capped at :data:`T_MELT`; points that reach it lie in
+    the fusion zone, where the conduction solution no longer applies.  The
+    samples per pass shrink with the number of passes (from 30 to at least
+    8) to keep the history near :data:`MAX_TIMES` times, stored as ``dtype``.
+    """
+    y, z = np.asarray(y, dtype=np.float64), np.asarray(z, dtype=np.float64)
+    pass_t = np.asarray(pass_t, dtype=np.float64)
+    if t_end is None:
+        a = kernel.get("a", DIFFUSIVITY)
+        t_end = pass_t[-1] + max(600.0, 20.0 * thickness ** 2 / a)
+    t = time_grid(pass_t, t_end, per_pass=int(np.clip(MAX_TIMES // max(pass_t.size, 1), 8, 30)))
+    T = temperature_rise(y, z, t, pass_y, pass_z, pass_t, pass_Q, thickness, dtype=dtype, job=job, **kernel)
+    T += T0
+    np.minimum(T, T_MELT, out=T)
+
+    i_peak = np.argmax(T, axis=-1)
+    at_pass = np.searchsorted(t, pass_t)
+    return MultipassHistory(
+        y=y,
+        z=z,
+        t=t,
+        T=T,
+        peak=np.take_along_axis(T, i_peak[..., None], -1)[..., 0],
+        t_peak=t[i_peak],
+        t85=cooling_time(t, T),
+        interpass=T[..., at_pass],
+        pass_y=np.asarray(pass_y, dtype=np.float64),
+        pass_z=np.asarray(pass_z, dtype=np.float64),
+        pass_t=pass_t,
+    )
+
+
+def simulate(n_passes, Q_kJ_per_mm, thickness, T0=25.0, interpass_max=None, interval=120.0,
+             half_width=40.0, ny=81, nz=26, job=None, **kernel):
+    """Single-V joint filled with ``n_passes`` beads, monitored over the cross-section.
+
+    Interpass temperature is controlled at the top of the weld centreline.
+    ``job`` (see :mod:`mse207.jobs`) receives progress while the history is
+    superposed.
+    """
+    pass_y, pass_z = bead_layout(n_passes, thickness)
+    pass_Q = 1000.0 * Q_kJ_per_mm
+    pass_t = schedule_passes(pass_y, pass_z, pass_Q, thickness, T0, control=(0.0, 0.0),
+                             interpass_max=interpass_max, interval=interval, **kernel)
+    y = np.linspace(-half_width, half_width, ny)
+    z = np.linspace(0.0, thickness, nz)
+    return multipass_history(y, z, pass_y, pass_z, pass_t, pass_Q, thickness, T0, job=job, **kernel)
+
+
+# ============================================================
+# MOVING SOURCE ON A THIN PLATE
+# ============================================================
+def rosenthal_thin(xi, y, Q_kJ_per_mm, speed, thickness, T0=25.0,
+                   k=CONDUCTIVITY, a=DIFFUSIVITY, rho_c=RHO_C, h_loss=H_LOSS):
+    """Rosenthal's quasi-steady thin-plate field, ``xi`` measured from the arc (mm).
+
+    ``T - T0 = q / (2 pi k d) exp(-v xi / 2a) K0(r sqrt((v/2a)² + b/a))`` with
+    ``q = Q v`` and surface losses ``b = 2 h / (rho c d)``.
+    """
+    from scipy.special import k0
+
+    q = 1000.0 * Q_kJ_per_mm * speed
+    b = 2.0 * h_loss / (rho_c * thickness)
+    r = np.hypot(xi, y)
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        rise = (q / (2.0 * np.pi * k * thickness) * np.exp(-speed * xi / (2.0 * a))
+                * k0(r * np.sqrt((speed / (2.0 * a)) ** 2 + b / a)))
+    return T0 + rise
+
+
+def moving_source_field(Q_kJ_per_mm, speed, thickness, T0=25.0, length=120.0, width=60.0,
+                        dx=0.5, r0=3.0, a=DIFFUSIVITY, rho_c=RHO_C, h_loss=H_LOSS, job=None):
+    """Plan-view temperature field of a thin plate under a moving Gaussian arc.
+
+    The arc travels along ``y = 0`` from 10 mm in to 10 mm short of the far
+    edge; edges are insulated and both faces lose heat at ``h_loss``.
+    Explicit finite differences with ``dt = 0.2 dx²/a``, 80 % of the 2-D
+    stability limit ``dx²/(4a)``.  Returns :class:`PlateField` with the field
+    when the arc stops and the peak temperature reached at every node.
+    """
+    started = time.perf_counter()
+    x = np.arange(0.0, length + dx / 2, dx)
+    y = np.arange(-width / 2, width / 2 + dx / 2, dx)
+    X, Y = np.meshgrid(x, y, indexing="ij")
+    T = np.full(X.shape, float(T0))
+    peak = T.copy()
+
+    dt = 0.2 * dx ** 2 / a
+    x_start, x_stop = 10.0, length - 10.0
+    n_steps = int(np.ceil((x_stop - x_start) / speed / dt))
+    power_density = 1000.0 * Q_kJ_per_mm * speed / (np.pi * r0 ** 2 * thickness)   # W/mm³ at the centre
+    loss = 2.0 * h_loss / (rho_c * thickness)
+    fo = a * dt / dx ** 2
+
+    report_every = max(1, n_steps // 100)
+    source_x = x_start
+    for step in range(n_steps):
+        source_x = x_start + speed * (step + 0.5) * dt
+        Tp = np.pad(T, 1, mode="edge")
+        laplacian = Tp[2:, 1:-1] + Tp[:-2, 1:-1] + Tp[1:-1, 2:] + Tp[1:-1, :-2] - 4.0 * T
+        source = power_density * np.exp(-((X - source_x) ** 2 + Y ** 2) / r0 ** 2) / rho_c
+        T += fo * laplacian + dt * (source - loss * (T - T0))
+        np.maximum(peak, T, out=peak)
+        if job is not None and (step + 1) % report_every == 0:
+            job.progress((step + 1) / n_steps, f"arc at x = {source_x:.0f} mm")
+
+    return PlateField(x=x, y=y, T=T, peak=peak, source_x=source_x,
+                      elapsed_s=time.perf_counter() - started)
+
+
+def field_change(coarse, fine):
+    """Largest difference in peak temperature between two :class:`PlateField` runs.
+
+    Compared on the coarse nodes, which the finer grid contains, with peaks
+    capped at :data:`T_MELT` (the weld pool is not resolved).
+    """
+    ix = np.rint((coarse.x - fine.x[0]) / (fine.x[1] - fine.x[0])).astype(np.intp)
+    iy = np.rint((coarse.y - fine.y[0]) / (fine.y[1] - fine.y[0])).astype(np.intp)
+    fine_peak = np.minimum(fine.peak[np.ix_(ix, iy)], T_MELT)
+    return float(np.max(np.abs(np.minimum(coarse.peak, T_MELT) - fine_peak)))
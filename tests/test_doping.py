@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from scipy.integrate import trapezoid
+
+from mse207 import doping
+
+CS = 1e20       # atoms/cm³
+A = 1e-10       # cm², D1 t1 of the predeposition
+C_B = 1e16      # background, atoms/cm³
+
+
+@pytest.mark.parametrize("b", [0.0, 1e-8 * A, 1e-6 * A])
+def test_no_drive_in_leaves_the_erfc_profile(b):
+    x = np.linspace(0.0, 20.0 * np.sqrt(A), 2001)
+    error = np.abs(doping.two_step(x, CS, A, b) - doping.predeposition(x, CS, A))
+    # 24-node quadrature of Craig's integral
+    assert error.max() < 1e-3 * CS
+
+
+@pytest.mark.parametrize("ratio, rtol", [(1e2, 5e-3), (1e3, 5e-4), (1e4, 5e-5)])
+def test_long_drive_in_approaches_the_gaussian(ratio, rtol):
+    b = ratio * A
+    x = np.linspace(0.0, 10.0 * np.sqrt(b), 2001)
+    gaussian = doping.gaussian(x, doping.dose(CS, A), b)
+    assert np.max(np.abs(doping.two_step(x, CS, A, b) - gaussian)) < rtol * gaussian[0]
+
+
+@pytest.mark.parametrize("b", [1e-2 * A, A, 1e2 * A])
+def test_drive_in_conserves_the_dose(b):
+    x = np.linspace(0.0, 20.0 * np.sqrt(A + b), 20001)
+    assert trapezoid(doping.two_step(x, CS, A, b), x) == pytest.approx(doping.dose(CS, A), rel=1e-6)
+
+
+def test_junction_depth_matches_the_closed_forms_in_both_limits():
+    assert doping.junction_two_step(CS, A, 1e-8 * A, C_B) == pytest.approx(
+        doping.junction_predep(CS, A, C_B), rel=1e-4)
+    b = 1e4 * A
+    assert doping.junction_two_step(CS, A, b, C_B) == pytest.approx(
+        doping.junction_gaussian(doping.dose(CS, A), b, C_B), rel=1e-4)
+
+
+def test_junction_depth_is_nan_without_a_junction():
+    assert np.isnan(doping.junction_two_step(CS, A, A, 2.0 * CS))
+    assert np.isnan(doping.junction_predep(CS, A, 2.0 * CS))
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from mse207 import kernels
+
+numba_only = pytest.mark.skipif(kernels._numba is None, reason="numba is not installed")
+
+
+def _run(backend, index):
+    # Fresh inputs per backend, in case a kernel works in place
+    with kernels.use(backend):
+        return np.asarray(kernels._cases()[index][1]())
+
+
+@numba_only
+@pytest.mark.parametrize("index", range(len(kernels._cases())), ids=[name for name, _ in kernels._cases()])
+def test_numba_matches_numpy(index):
+    np.testing.assert_allclose(_run("numba", index), _run("numpy", index), rtol=1e-9, atol=1e-12)
+
+
+def test_thomas_solves_the_system():
+    rng = np.random.default_rng(1)
+    n = 50
+    lower, upper = -rng.random((3, n)), -rng.random((3, n))
+    diag, rhs = 2.5 + rng.random((3, n)), rng.random((3, n))
+    with kernels.use("numpy"):
+        x = kernels.thomas(lower, diag, upper, rhs)
+    for k in range(3):
+        A = np.diag(diag[k]) + np.diag(lower[k, 1:], -1) + np.diag(upper[k, :-1], 1)
+        np.testing.assert_allclose(A @ x[k], rhs[k], atol=1e-12)
+
+
+def test_numba_backend_is_refused_without_numba():
+    if kernels._numba is not None:
+        pytest.skip("numba is installed")
+    with pytest.raises(RuntimeError):
+        with kernels.use("numba"):
+            pass
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from scipy.special import erfc
+
+from mse207 import curves
+
+C0, CS = 0.2, 1.0           # wt.%
+D, T = 1e-11, 4.0 * 3600.0  # m²/s, s
+X = np.linspace(0.0, 2e-3, 401)
+
+
+def test_fast_transfer_approaches_the_fixed_surface_profile():
+    fixed = C0 + (CS - C0) * erfc(X / (2.0 * np.sqrt(D * T)))
+    errors = [np.max(np.abs(curves.robin_concentration(X, T, C0, CS, D, beta) - fixed))
+              for beta in (1e-6, 1e-4, 1e-2, 1e2)]
+    assert errors == sorted(errors, reverse=True)
+    assert errors[-1] < 1e-9
+
+
+def test_no_transfer_leaves_the_initial_carbon():
+    np.testing.assert_allclose(curves.robin_concentration(X, T, C0, CS, D, 1e-20), C0, atol=1e-12)
+
+
+@pytest.mark.parametrize("beta", [1e-8, 1e-7, 1e-6])
+def test_surface_flux_follows_the_mass_transfer_condition(beta):
+    dx = 1e-9
+    C = curves.robin_concentration(np.array([0.0, dx, 2.0 * dx]), T, C0, CS, D, beta)
+    gradient = (-3.0 * C[0] + 4.0 * C[1] - C[2]) / (2.0 * dx)
+    assert -D * gradient == pytest.approx(beta * (CS - C[0]), rel=1e-4)
+
+
+def test_large_transfer_coefficients_do_not_overflow():
+    C = curves.robin_concentration(X[:, None], np.array([1.0, T, 1e7])[None, :], C0, CS, D, 1e6)
+    assert np.all(np.isfinite(C))
+    assert np.all((C >= C0) & (C <= CS))
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from scipy.special import erf
+
+from mse207 import sampling
+
+CURVES = [
+    # f, a, b, support, log
+    (lambda x: erf(x / 0.3), 0.0, 5.0, None, False),
+    (lambda x: np.exp(-x ** 2), -5.0, 5.0, (-4.0, 4.0), False),
+    (lambda T: 1e-5 * np.exp(-2e5 / (8.314 * T)), 800.0, 1400.0, None, True),
+    (np.sin, 0.0, 20.0, None, False),
+]
+
+
+@pytest.mark.parametrize("tol", [1e-2, 1e-3, 1e-4])
+@pytest.mark.parametrize("f, a, b, support, log", CURVES)
+def test_polyline_stays_within_tolerance(f, a, b, support, log, tol):
+    x, y = sampling.adaptive(f, a, b, tol, support=support, log=log)
+    g = np.log10 if log else np.asarray
+    lo, hi = support if support is not None else (a, b)
+    span = np.ptp(g(f(np.linspace(lo, hi, sampling.N_START))))
+
+    dense = np.linspace(a, b, 100001)
+    error = np.max(np.abs(g(f(dense)) - np.interp(dense, x, g(y))))
+    # The midpoint test bounds the error only approximately between vertices
+    assert error <= 1.5 * tol * span
+    assert x[0] == a and x[-1] == b
+    assert np.all(np.diff(x) > 0)
+
+
+def test_tighter_tolerance_adds_points():
+    f = lambda x: erf(x / 0.3)
+    sizes = [sampling.adaptive(f, 0.0, 5.0, tol)[0].size for tol in (1e-2, 1e-3, 1e-4)]
+    assert sizes == sorted(sizes) and sizes[0] < sizes[-1]
+
+
+def test_flat_curve_keeps_the_starting_grid():
+    x, y = sampling.adaptive(lambda x: np.full_like(x, 3.0), 0.0, 1.0)
+    assert x.size == sampling.N_START
+    assert np.all(y == 3.0)
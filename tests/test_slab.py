@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from mse207 import curves
+
+C0, CS = 0.8, 0.1       # wt.%, decarburizing
+D = 1e-11               # m²/s
+L = 1e-3                # strip thickness, m
+HALF = L / 2.0
+
+
+@pytest.mark.parametrize("Dt_over_l2", [1e-3, 1e-2, 0.1, 1.0, 3.0])
+def test_image_and_fourier_series_agree(Dt_over_l2):
+    xc = np.linspace(-HALF, HALF, 101)
+    Dt = np.full(xc.size, Dt_over_l2 * HALF ** 2)
+    image = curves._slab_image(xc, Dt, HALF, 200)
+    fourier = curves._slab_fourier(xc, Dt, HALF, 2000)
+    np.testing.assert_allclose(image, fourier, atol=1e-6)
+
+
+@pytest.mark.parametrize("tol", [1e-4, 1e-6, 1e-8])
+def test_term_counts_meet_the_tolerance(tol):
+    t = np.geomspace(1.0, 1e6, 40)
+    image_terms, fourier_terms = curves.slab_terms(t, D, HALF, tol)
+    xc = np.linspace(-HALF, HALF, 51)
+    for ti, n_image, n_fourier in zip(t, image_terms, fourier_terms):
+        Dt = np.full(xc.size, D * ti)
+        exact = curves._slab_image(xc, Dt, HALF, int(n_image) + 50)
+        assert np.max(np.abs(curves._slab_image(xc, Dt, HALF, int(n_image)) - exact)) <= tol
+        if n_fourier < 10000:
+            assert np.max(np.abs(curves._slab_fourier(xc, Dt, HALF, int(n_fourier)) - exact)) <= tol
+
+
+def test_profile_is_symmetric_and_held_at_the_surfaces():
+    x = np.linspace(0.0, L, 201)
+    C = curves.slab_concentration(x[:, None], np.array([0.0, 600.0, 3600.0, 36000.0])[None, :], C0, CS, D, L)
+    np.testing.assert_allclose(C[:, 0], C0)
+    np.testing.assert_allclose(C, C[::-1], atol=1e-12)
+    np.testing.assert_allclose(C[0, 1:], CS, atol=1e-6)
+    assert abs(C[100, -1] - CS) < abs(C[100, 1] - CS)
+
+
+def test_sealed_face_is_half_of_a_strip_twice_as_thick():
+    x = np.linspace(0.0, L, 101)
+    t = np.array([60.0, 3600.0, 36000.0])
+    one_face = curves.slab_concentration(x[:, None], t[None, :], C0, CS, D, L, faces=1)
+    doubled = curves.slab_concentration(x[:, None], t[None, :], C0, CS, D, 2.0 * L, faces=2)
+    np.testing.assert_allclose(one_face, doubled, atol=1e-12)
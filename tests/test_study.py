@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from mse207 import study
+
+
+def _direct(result):
+    model = study.MODELS[result.model]
+    out = model.evaluate({f.name: result.design[:, i] for i, f in enumerate(result.factors)})
+    return np.column_stack([out[name] for name in model.outputs])
+
+
+@pytest.mark.parametrize("model_name, kind, points", [
+    ("week10_case_depth", "lhs", 500),
+    ("week8_cooling", "cartesian", 243),
+])
+def test_pool_results_match_direct_evaluation(model_name, kind, points):
+    result = study.run(model_name, kind, points)
+    assert result.done.all()
+    assert result.values.shape == (result.design.shape[0], len(study.MODELS[model_name].outputs))
+    np.testing.assert_allclose(result.values, _direct(result), rtol=1e-12, equal_nan=True)
+
+
+def test_every_chunk_lands_in_its_own_rows():
+    # More chunks than workers, so rows are written by several processes
+    result = study.run("week10_case_depth_fd", "lhs", 24)
+    assert result.done.all()
+    np.testing.assert_allclose(result.values, _direct(result), rtol=1e-12, equal_nan=True)
+
+
+def test_designs_span_the_factor_ranges():
+    factors = study.MODELS["week8_cooling"].factors
+    lhs = study.latin_hypercube(factors, 100, seed=1)
+    grid = study.cartesian(factors, 3)
+    assert grid.shape == (3 ** len(factors), len(factors))
+    for i, f in enumerate(factors):
+        assert f.low <= lhs[:, i].min() and lhs[:, i].max() <= f.high
+        # One point in each of the 100 slices
+        if f.log:
+            u = np.log(lhs[:, i] / f.low) / np.log(f.high / f.low)
+        else:
+            u = (lhs[:, i] - f.low) / (f.high - f.low)
+        assert np.array_equal(np.sort(np.floor(u * 100).astype(int)), np.arange(100))